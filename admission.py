@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+التحكم في قبول الاتصالات: حدود معدل لكل IP ولكل شبكة /24 (token bucket)،
+حد أقصى للجلسات المتزامنة، ومصيدة إبطاء (tarpit) للاتصالات الزائدة
+"""
+
+import collections
+import queue
+import selectors
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+ADMIT = "admit"
+REJECT = "reject"
+TARPIT = "tarpit"
+
+class TokenBucket:
+    """
+    دلو رموز واحد (tokens تمتلئ بمعدل rate حتى burst)
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+def subnet_key(ip: str) -> str:
+    """
+    مفتاح الشبكة: /24 لـ IPv4 و /64 تقريباً لـ IPv6 (أول أربع مجموعات)
+    """
+    if ":" in ip:
+        return ":".join(ip.split(":", 4)[:4])
+    return ip[:ip.rfind(".")]
+
+class AdmissionController:
+    """
+    طبقة قبول أمام handle_client
+
+    كل قرار O(1): بحث في قاموس مرتب وإعادة ملء كسولة للدلو، والدلاء الخاملة
+    تُحذف من بداية القاموس (الأقدم استخداماً أولاً) عند كل قرار.
+    الاتصالات المرفوضة أو المُبطأة لا تُسجَّل فردياً بل تُجمع عدّاداتها لكل
+    (IP، القرار، السبب) وتُمرَّر إلى on_report كل report_interval ثانية.
+    """
+
+    def __init__(self, ip_rate: float = 1.0, ip_burst: float = 10.0,
+                 subnet_rate: float = 5.0, subnet_burst: float = 50.0,
+                 max_sessions: int = 10000, tarpit: bool = False,
+                 idle_ttl: float = 300.0, report_interval: float = 60.0,
+                 on_report: Optional[Callable[[str, str, str, int], None]] = None):
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.subnet_rate = subnet_rate
+        self.subnet_burst = subnet_burst
+        self.max_sessions = max_sessions
+        self.tarpit = tarpit
+        # الدلو الخامل أطول من زمن امتلائه يكون ممتلئاً، فحذفه لا يغيّر أي قرار
+        self.idle_ttl = max(idle_ttl, ip_burst / ip_rate, subnet_burst / subnet_rate)
+        self.report_interval = report_interval
+        self.on_report = on_report
+
+        self.active_sessions = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.tarpitted = 0
+
+        self._ip_buckets: "collections.OrderedDict[str, TokenBucket]" = collections.OrderedDict()
+        self._subnet_buckets: "collections.OrderedDict[str, TokenBucket]" = collections.OrderedDict()
+        self._aggregates: Dict[Tuple[str, str, str], int] = collections.Counter()
+        self._next_report = time.monotonic() + report_interval
+        self._lock = threading.Lock()
+
+    def _bucket(self, buckets, key: str, rate: float, burst: float, now: float) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(burst, now)
+            buckets[key] = bucket
+        else:
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+            buckets.move_to_end(key)
+        return bucket
+
+    def _evict_idle(self, buckets, now: float):
+        cutoff = now - self.idle_ttl
+        # عدد ثابت من العناصر في كل قرار حتى لا يتحمل اتصال واحد كلفة تنظيف كبيرة
+        for _ in range(4):
+            if not buckets:
+                return
+            key, bucket = next(iter(buckets.items()))  # الأقدم استخداماً
+            if bucket.updated >= cutoff:
+                return
+            buckets.popitem(last=False)
+
+    @property
+    def tracked_buckets(self) -> int:
+        return len(self._ip_buckets) + len(self._subnet_buckets)
+
+    def admit(self, ip: str) -> str:
+        """
+        قرار قبول اتصال جديد: ADMIT أو REJECT أو TARPIT
+        عند ADMIT يجب استدعاء release() بعد انتهاء الجلسة
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(self._ip_buckets, now)
+            self._evict_idle(self._subnet_buckets, now)
+
+            ip_bucket = self._bucket(self._ip_buckets, ip, self.ip_rate, self.ip_burst, now)
+            subnet_bucket = self._bucket(self._subnet_buckets, subnet_key(ip),
+                                         self.subnet_rate, self.subnet_burst, now)
+
+            if self.active_sessions >= self.max_sessions:
+                reason = "global_cap"
+            elif ip_bucket.tokens < 1.0:
+                reason = "ip_rate"
+            elif subnet_bucket.tokens < 1.0:
+                reason = "subnet_rate"
+            else:
+                ip_bucket.tokens -= 1.0
+                subnet_bucket.tokens -= 1.0
+                self.active_sessions += 1
+                self.admitted += 1
+                return ADMIT
+
+            decision = TARPIT if self.tarpit else REJECT
+            if decision == TARPIT:
+                self.tarpitted += 1
+            else:
+                self.rejected += 1
+            self._aggregates[(ip, decision, reason)] += 1
+            report_due = now >= self._next_report
+
+        if report_due:
+            self.flush_report()
+        return decision
+
+    def release(self):
+        with self._lock:
+            self.active_sessions -= 1
+
+    def maybe_report(self):
+        """
+        استدعاء دوري من حلقة الخادم: تمرير التجميعات إن حان وقتها
+        """
+        if time.monotonic() >= self._next_report:
+            self.flush_report()
+
+    def flush_report(self):
+        """
+        تمرير عدّادات الاتصالات المرفوضة/المُبطأة المتراكمة إلى on_report ثم تصفيرها
+        """
+        with self._lock:
+            aggregates = self._aggregates
+            self._aggregates = collections.Counter()
+            self._next_report = time.monotonic() + self.report_interval
+        if self.on_report is None:
+            return
+        for (ip, decision, reason), count in aggregates.items():
+            self.on_report(ip, decision, reason, count)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'active_sessions': self.active_sessions,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'tarpitted': self.tarpitted,
+            'tracked_buckets': self.tracked_buckets
+        }
+
+class Tarpit:
+    """
+    مصيدة إبطاء لوضع الخيوط: خيط واحد يحتفظ بكل الاتصالات الزائدة مفتوحة
+    ويرسل بايتاً واحداً من الشعار كل drip_interval ثانية حتى انقضاء hold_time
+    """
+
+    def __init__(self, banner: bytes, drip_interval: float = 10.0, hold_time: float = 600.0,
+                 max_connections: int = 10000):
+        self.banner = banner or b"\r\n"
+        self.drip_interval = drip_interval
+        self.hold_time = hold_time
+        self.max_connections = max_connections
+        self._pending = queue.SimpleQueue()
+        # socket -> [وقت الإضافة، موضع الشعار]؛ ترتيب الإدراج = ترتيب الانتهاء
+        self._held: Dict[socket.socket, list] = {}
+        self._selector = selectors.DefaultSelector()
+        self._thread = None
+        self._running = False
+
+    @property
+    def held(self) -> int:
+        return len(self._held)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="tarpit", daemon=True)
+        self._thread.start()
+
+    def add(self, client_socket: socket.socket):
+        if self._thread is None:
+            self.start()
+        self._pending.put(client_socket)
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _drop(self, client_socket: socket.socket):
+        self._held.pop(client_socket, None)
+        try:
+            self._selector.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
+        client_socket.close()
+
+    def _run(self):
+        next_drip = time.monotonic() + self.drip_interval
+        while self._running:
+            now = time.monotonic()
+            while True:
+                try:
+                    client_socket = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if len(self._held) >= self.max_connections:
+                    client_socket.close()
+                    continue
+                client_socket.setblocking(False)
+                self._held[client_socket] = [now, 0]
+                self._selector.register(client_socket, selectors.EVENT_READ)
+
+            if self._held:
+                events = self._selector.select(timeout=0.5)
+            else:
+                time.sleep(0.5)
+                events = []
+
+            # قراءة وتجاهل كل ما يرسله المهاجم
+            for key, _ in events:
+                try:
+                    if not key.fileobj.recv(4096):
+                        self._drop(key.fileobj)
+                except (BlockingIOError, InterruptedError):
+                    pass
+                except OSError:
+                    self._drop(key.fileobj)
+
+            now = time.monotonic()
+            if now >= next_drip:
+                next_drip = now + self.drip_interval
+                for client_socket, state in list(self._held.items()):
+                    position = state[1] % len(self.banner)
+                    try:
+                        client_socket.send(self.banner[position:position + 1])
+                        state[1] += 1
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    except OSError:
+                        self._drop(client_socket)
+
+            # الأقدم في بداية القاموس
+            while self._held:
+                client_socket, state = next(iter(self._held.items()))
+                if now - state[0] < self.hold_time:
+                    break
+                self._drop(client_socket)
+
+        for client_socket in list(self._held):
+            self._drop(client_socket)
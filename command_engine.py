@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+محرك أوامر الصدفة الوهمية: جداول أوامر تُحمَّل من ملف بيانات (fake_commands.json)
+ونظام ملفات وهمي بمجلد حالي لكل جلسة
+
+كل الردود الثابتة تُرمَّز إلى bytes مرة واحدة عند التحميل، وتنفيذ الأمر بحث
+في قاموس (الأمر الكامل ثم الكلمة الأولى) فزمنه لا يتغير مع حجم الجدول.
+"""
+
+import json
+import os
+import posixpath
+from typing import Dict, Any, Callable, Optional, Tuple
+
+DEFAULT_COMMANDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_commands.json")
+
+CRLF = b"\r\n"
+
+class FakeFilesystem:
+    """
+    شجرة ملفات ثابتة مع قوائم ls ومحتويات cat مُرمَّزة مسبقاً
+    في ملف البيانات: القاموس مجلد، النص محتوى ملف، و null ملف ممنوع القراءة
+    """
+
+    def __init__(self, tree: Dict[str, Any]):
+        self.dirs: Dict[str, Dict[str, bytes]] = {}
+        self.files: Dict[str, bytes] = {}
+        self.protected = set()
+        self._walk("/", tree)
+
+    def _walk(self, path: str, node: Dict[str, Any]):
+        names = sorted(node)
+        for name in names:
+            child = posixpath.join(path, name)
+            value = node[name]
+            if isinstance(value, dict):
+                self._walk(child, value)
+            elif value is None:
+                self.protected.add(child)
+            else:
+                self.files[child] = value.encode('utf-8') + CRLF if value else b""
+
+        subdirs = {name for name in names if isinstance(node[name], dict)}
+        visible = [name for name in names if not name.startswith(".")]
+
+        def long_line(name: str) -> str:
+            if name in (".", "..") or name in subdirs:
+                return f"drwxr-xr-x 2 root root 4096 Jan 20 10:30 {name}"
+            size = len(self.files.get(posixpath.join(path, name), b""))
+            mode = "-rw-------" if posixpath.join(path, name) in self.protected else "-rw-r--r--"
+            return f"{mode} 1 root root {size:>4} Jan 20 10:30 {name}"
+
+        # أربعة أشكال لكل مجلد: ls و ls -a و ls -l و ls -la
+        everything = [".", ".."] + names
+        self.dirs[path] = {
+            "": ("  ".join(visible) + "\r\n" if visible else "").encode('utf-8'),
+            "a": ("  ".join(everything) + "\r\n").encode('utf-8'),
+            "l": "\r\n".join([f"total {4 * len(visible)}"] + [long_line(n) for n in visible]).encode('utf-8') + CRLF,
+            "la": "\r\n".join([f"total {4 * len(everything)}"] + [long_line(n) for n in everything]).encode('utf-8') + CRLF
+        }
+
+    def resolve(self, cwd: str, path: str, home: str) -> str:
+        if path == "~" or path.startswith("~/"):
+            path = home + path[1:]
+        return posixpath.normpath(posixpath.join(cwd, path)).replace("//", "/")
+
+class CommandEngine:
+    """
+    تنفيذ أوامر المهاجم بعد تسجيل الدخول
+
+    execute(session, command) تُعيد (الرد كـ bytes مع المحث، هل يجب إغلاق الاتصال)
+    والمجلد الحالي يُحفظ في session.cwd
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.prompt = spec.get("prompt", "$ ").encode('utf-8')
+        self.home = spec.get("home", "/root")
+        self.filesystem = FakeFilesystem(spec.get("filesystem", {}))
+        self.goodbye = b"Goodbye!\r\n"
+
+        # الأمر الكامل -> الرد النهائي
+        self.exact: Dict[str, bytes] = {
+            command: self._render(text) for command, text in spec.get("exact", {}).items()
+        }
+        # الكلمة الأولى -> الرد النهائي (أي وسائط)
+        self.prefix: Dict[str, bytes] = {
+            word: self._render(text) for word, text in spec.get("prefix", {}).items()
+        }
+        self.exit_commands = frozenset(spec.get("exit", ["exit", "quit", "logout"]))
+
+        # أوامر نظام الملفات تعتمد على المجلد الحالي للجلسة
+        self.builtins: Dict[str, Callable[[Any, list], bytes]] = {
+            "ls": self._ls,
+            "cd": self._cd,
+            "pwd": self._pwd,
+            "cat": self._cat,
+            "echo": self._echo
+        }
+        self._not_found = (b"bash: ", b": command not found\r\n" + self.prompt)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "CommandEngine":
+        """
+        تحميل جداول الأوامر من ملف JSON
+        """
+        with open(path or DEFAULT_COMMANDS_FILE, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _render(self, text: str) -> bytes:
+        if not text:
+            return self.prompt
+        return text.encode('utf-8') + CRLF + self.prompt
+
+    def _error(self, *parts: str) -> bytes:
+        return "".join(parts).encode('utf-8') + CRLF + self.prompt
+
+    def execute(self, session, command: str) -> Tuple[bytes, bool]:
+        response = self.exact.get(command)
+        if response is not None:
+            return response, False
+
+        argv = command.split()
+        name = argv[0] if argv else ""
+        if name in self.exit_commands:
+            return self.goodbye, True
+
+        builtin = self.builtins.get(name)
+        if builtin is not None:
+            return builtin(session, argv[1:]), False
+
+        response = self.prefix.get(name)
+        if response is not None:
+            return response, False
+
+        prefix, suffix = self._not_found
+        return prefix + name.encode('utf-8') + suffix, False
+
+    def _ls(self, session, args: list) -> bytes:
+        flags = ""
+        target = None
+        for arg in args:
+            if arg.startswith("-"):
+                flags += arg[1:]
+            elif target is None:
+                target = arg
+
+        cwd = getattr(session, "cwd", self.home)
+        path = self.filesystem.resolve(cwd, target, self.home) if target else cwd
+        listings = self.filesystem.dirs.get(path)
+        if listings is None:
+            if path in self.filesystem.files or path in self.filesystem.protected:
+                return target.encode('utf-8') + CRLF + self.prompt
+            return self._error(f"ls: cannot access '{target}': No such file or directory")
+
+        variant = ("l" if "l" in flags else "") + ("a" if "a" in flags else "")
+        return listings[variant] + self.prompt
+
+    def _cd(self, session, args: list) -> bytes:
+        target = args[0] if args else self.home
+        path = self.filesystem.resolve(getattr(session, "cwd", self.home), target, self.home)
+        if path in self.filesystem.dirs:
+            session.cwd = path
+            return self.prompt
+        if path in self.filesystem.files or path in self.filesystem.protected:
+            return self._error(f"bash: cd: {target}: Not a directory")
+        return self._error(f"bash: cd: {target}: No such file or directory")
+
+    def _pwd(self, session, args: list) -> bytes:
+        return getattr(session, "cwd", self.home).encode('utf-8') + CRLF + self.prompt
+
+    def _cat(self, session, args: list) -> bytes:
+        files = [arg for arg in args if not arg.startswith("-")]
+        if not files:
+            return self.prompt
+        cwd = getattr(session, "cwd", self.home)
+        output = []
+        for target in files:
+            path = self.filesystem.resolve(cwd, target, self.home)
+            content = self.filesystem.files.get(path)
+            if content is not None:
+                output.append(content)
+            elif path in self.filesystem.protected:
+                output.append(f"cat: {target}: Permission denied\r\n".encode('utf-8'))
+            elif path in self.filesystem.dirs:
+                output.append(f"cat: {target}: Is a directory\r\n".encode('utf-8'))
+            else:
+                output.append(f"cat: {target}: No such file or directory\r\n".encode('utf-8'))
+        output.append(self.prompt)
+        return b"".join(output)
+
+    def _echo(self, session, args: list) -> bytes:
+        return " ".join(args).encode('utf-8') + CRLF + self.prompt
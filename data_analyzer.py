@@ -9,16 +9,29 @@ Interactive Honeypot Data Analyzer
 
 import json
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
-from collections import Counter, defaultdict
+from pandas.api.types import union_categoricals
+from collections import Counter, OrderedDict
 import datetime
 import os
+import pickle
 import re
-from typing import Dict, List, Any
-import requests
+from typing import Dict, List, Any, Callable, Tuple
+import sqlite3
 import time
 
+from aggregation import aggregate, country_timeseries, geographic, top_values
+import event_format
+from event_stream import subscribe
+import geo_remote
+from geoip import GeoDatabase
+import log_cache
+import log_tail
+from log_segments import log_sources, open_segment, is_binary_segment, TimeBound
+import subnets
+
 # إعداد matplotlib للنصوص العربية
 plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial Unicode MS', 'Tahoma']
 plt.rcParams['axes.unicode_minus'] = False
@@ -28,10 +41,44 @@ class HoneypotAnalyzer:
     محلل بيانات مصيدة التسلل مع إمكانيات التصور المرئي
     """
     
-    def __init__(self, log_file: str = "honeypot_logs.json"):
+    # ملفات JSONL غير المضغوطة الأكبر من هذا الحجم تُحلَّل على عدة عمليات
+    parallel_threshold = 64 * 1024 * 1024
+    # الحد الأقصى لحجم الذاكرة المؤقتة العمودية (log_cache) قبل إخلاء الأقدم استخداماً
+    cache_max_bytes = log_cache.DEFAULT_MAX_BYTES
+    # عدد نتائج الاستعلامات ذات المعاملات (top-N، نافذة زمنية) المحفوظة قبل إخلاء الأقدم استخداماً
+    results_cache_size = 128
+    # خدمة المواقع عند غياب القاعدة المحلية (geo_remote)، وصلاحية وسعة ذاكرتها المؤقتة
+    geo_service_url = geo_remote.DEFAULT_URL
+    geo_cache_ttl = geo_remote.DEFAULT_TTL
+    geo_cache_max_entries = geo_remote.DEFAULT_MAX_ENTRIES
+    # دون قاعدة محلية: عدد العناوين (الأكثر هجوماً) التي تُرسل إلى الخدمة في كل تحليل
+    geo_remote_limit = 1000
+    
+    def __init__(self, log_file: str = "honeypot_logs.json", incremental: bool = False,
+                 cache: bool = True, geo_database: str = "geo_ranges.csv",
+                 geo_cache: str = "geo_cache.sqlite"):
         self.log_file = log_file
-        self.data = []
-        self.df = None
+        # قاعدة نطاقات محلية (geoip.py): إن وُجد الملف يُحدَّد الموقع دون أي طلب شبكة
+        self.geo_database = geo_database
+        self._geo = None
+        # جداول لكل فئة في client_ip (العناوين كأعداد، المواقع) تبقى بعد إلحاق سجلات جديدة (_per_ip)
+        self._ip_tables: Dict[str, pd.DataFrame] = {}
+        # وإلا فالخدمة مع ذاكرة SQLite دائمة (None: دون ذاكرة، كل تشغيل يعيد الطلبات)
+        self.geo_cache = geo_cache
+        self._locator = None
+        self._df = None
+        # يزيد مع كل إطار جديد (تحميل أو إلحاق سجلات)؛ نتائج التحليل المحفوظة تخصه وحده
+        self.data_version = 0
+        self._results: Dict[Tuple, Any] = {}
+        self._queries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        # حفظ الإطار المُحلَّل لكل ملف في log_cache وقراءته منها في التحميلات التالية
+        self.cache = cache
+        # الوضع التزايدي: load_data يحلل فقط ما أُضيف إلى الملف النشط منذ آخر تحميل
+        self.incremental = incremental
+        # نقطة الاستئناف المطابقة لـ self.df (None بعد تحميل بنافذة زمنية)
+        self.checkpoint = None
+        # إحصائيات وضع البث المباشر (consume_stream) دون قراءة ملف السجل
+        self.live = None
         
         # قوائم كلمات المرور والمستخدمين الشائعة للتحليل
         self.common_passwords = [
@@ -44,30 +91,103 @@ class HoneypotAnalyzer:
             'pi', 'ubuntu', 'oracle', 'postgres', 'mysql'
         ]
     
-    def load_data(self) -> bool:
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+    
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        # نفس الإطار (إلحاق تزايدي دون سجلات جديدة) لا يُبطل النتائج
+        if value is not self._df:
+            self._df = value
+            self.data_version += 1
+            self._results.clear()
+            self._queries.clear()
+    
+    def _cached(self, analysis: str, compute: Callable[[], Any], *params) -> Any:
+        """
+        نتيجة analysis للإطار الحالي: تُحسب مرة واحدة حتى يتغير data_version أو تُبطَل
+        النتائج ذات المعاملات في LRU محدود بـ results_cache_size
+        """
+        key = (analysis,) + params
+        if not params:
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+        if key in self._queries:
+            self._queries.move_to_end(key)
+            return self._queries[key]
+        result = self._queries[key] = compute()
+        while len(self._queries) > self.results_cache_size:
+            self._queries.popitem(last=False)
+        return result
+    
+    def invalidate(self, *analyses: str):
         """
-        تحميل البيانات من ملف السجل
+        إبطال نتائج تحليلات بعينها (مثلاً 'ip_locations' و'geographic' بعد تحديث قاعدة المواقع)،
+        أو الكل دون معاملات
         """
-        if not os.path.exists(self.log_file):
+        if not analyses or 'ip_locations' in analyses:
+            self._ip_tables.pop('ip_locations', None)
+        for results in (self._results, self._queries):
+            for key in [key for key in results if not analyses or key[0] in analyses]:
+                del results[key]
+    
+    def load_data(self, start: TimeBound = None, end: TimeBound = None,
+                  workers: int = None) -> bool:
+        """
+        تحميل البيانات من ملف السجل ومقاطعه المُدوَّرة (المضغوطة)
+        start/end: نافذة زمنية اختيارية؛ المقاطع الواقعة خارجها لا تُفتح إطلاقاً
+        workers: عدد عمليات التحليل للملفات الكبيرة (None = عدد الأنوية، 1 = بدون توازٍ)
+        
+        في الوضع التزايدي (ودون نافذة زمنية) يُستأنف من نقطة الاستئناف إن كانت صالحة،
+        وإلا (تدوير، اقتطاع، تغيّر المحتوى) يُعاد التحميل الكامل وتُحفظ نقطة جديدة
+        """
+        if workers is None:
+            workers = event_format.available_cpus()
+        tail = self.incremental and start is None and end is None
+        if tail:
+            loaded = self._load_tail()
+            if loaded is not None:
+                return loaded
+        sources = log_sources(self.log_file, start, end)
+        if not sources:
             print(f"[ERROR] ملف السجل غير موجود: {self.log_file}")
             return False
         
         try:
-            self.data = []
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            entry = json.loads(line)
-                            self.data.append(entry)
-                        except json.JSONDecodeError as e:
-                            print(f"[WARNING] خطأ في قراءة السطر: {line[:50]}...")
+            # تحرير الإطار السابق قبل التحميل حتى لا يجتمع الإطاران في الذاكرة
+            self.df = None
+            self.checkpoint = None
+            reader = None
+            frames = []
+            for source in sources:
+                source = self._resolve_source(source)
+                if tail and source == self.log_file and not event_format.is_binary_log(source):
+                    columns, reader = self._read_active(workers)
+                    frames.append(self._frame_from_columns(columns))
+                    del columns
+                else:
+                    frames.append(self._load_source(source, workers))
             
-            if self.data:
-                self.df = pd.DataFrame(self.data)
-                self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-                print(f"[SUCCESS] تم تحميل {len(self.data)} سجل")
+            frames = [frame for frame in frames if len(frame)]
+            if frames:
+                self.df = self._concat_frames(frames)
+                del frames
+                if start is not None or end is not None:
+                    mask = pd.Series(True, index=self.df.index)
+                    if start is not None:
+                        mask &= self.df['timestamp'] >= pd.Timestamp(start)
+                    if end is not None:
+                        mask &= self.df['timestamp'] <= pd.Timestamp(end)
+                    self.df = self.df[mask].reset_index(drop=True)
+                    # فئات خارج النافذة لا تظهر بعدد صفري في value_counts
+                    for column in event_format.STRING_COLUMNS:
+                        self.df[column] = self.df[column].cat.remove_unused_categories()
+                if reader is not None:
+                    segments = log_tail.segment_names(sources[:-1])
+                    self._save_tail(reader.checkpoint(segments, len(self.df)), snapshot=True)
+                print(f"[SUCCESS] تم تحميل {len(self.df)} سجل")
                 return True
             else:
                 print("[WARNING] لا توجد بيانات في ملف السجل")
@@ -77,156 +197,461 @@ class HoneypotAnalyzer:
             print(f"[ERROR] فشل في تحميل البيانات: {e}")
             return False
     
+    def _load_source(self, source: str, workers: int) -> pd.DataFrame:
+        """
+        إطار ملف واحد: من الذاكرة المؤقتة إن طابقت بصمته، وإلا بالتحليل ثم الحفظ فيها
+        """
+        if not self.cache:
+            return self._frame_from_columns(self._parse_source(source, workers))
+        fp = log_cache.fingerprint(source)
+        frame = log_cache.load(self.log_file, source, fp)
+        if frame is not None:
+            print(f"[LOG] {source}: {len(frame)} سجل من الذاكرة المؤقتة")
+            return frame
+        frame = self._frame_from_columns(self._parse_source(source, workers))
+        log_cache.store(self.log_file, source, frame, fp, self.cache_max_bytes)
+        return frame
+    
+    def _parse_source(self, source: str, workers: int) -> Dict[str, Any]:
+        # كلتا الصيغتين تُقرآن عمودياً مباشرة دون قاموس لكل سجل
+        if is_binary_segment(source):
+            with open_segment(source, binary=True) as f:
+                return event_format.read_columns(f.read())
+        if workers > 1 and self._parallel_candidate(source):
+            columns = event_format.read_jsonl_columns_parallel(source, workers)
+            for (range_start, range_end), malformed, samples in columns['parts']:
+                self._report_malformed(f"{source} [{range_start}:{range_end}]",
+                                       {'malformed': malformed, 'malformed_samples': samples})
+            return columns
+        with open_segment(source) as f:
+            columns = event_format.read_jsonl_columns(f)
+        self._report_malformed(source, columns)
+        return columns
+    
+    def _read_active(self, workers: int):
+        """
+        قراءة الملف النشط حتى آخر سطر كامل، مع القارئ الذي يحمل نقطة الاستئناف
+        """
+        if workers > 1 and self._parallel_candidate(self.log_file):
+            size = event_format.last_line_end(self.log_file)
+            columns = event_format.read_jsonl_columns_parallel(self.log_file, workers, size)
+            for (range_start, range_end), malformed, samples in columns['parts']:
+                self._report_malformed(f"{self.log_file} [{range_start}:{range_end}]",
+                                       {'malformed': malformed, 'malformed_samples': samples})
+            return columns, log_tail.TailReader(self.log_file, size)
+        reader = log_tail.TailReader(self.log_file)
+        columns = event_format.read_jsonl_columns(reader.lines())
+        self._report_malformed(self.log_file, columns)
+        return columns, reader
+    
+    def _load_tail(self):
+        """
+        إلحاق ما أُضيف إلى الملف النشط بالإطار الحالي (أو بالإطار المحفوظ من تشغيل سابق)
+        تُعيد None إن لزم التحميل الكامل
+        """
+        if not os.path.exists(self.log_file) or event_format.is_binary_log(self.log_file):
+            # الصيغة الثنائية تعتمد على قواميس من بداية الملف فلا تُقرأ من المنتصف
+            return None
+        checkpoint, df = self.checkpoint, self.df
+        if checkpoint is None or df is None:
+            checkpoint, df = log_tail.load_checkpoint(self.log_file), None
+            if checkpoint is None:
+                return None
+        
+        segments = log_tail.segment_names(log_sources(self.log_file)[:-1])
+        reason = log_tail.check(checkpoint, self.log_file, segments)
+        if reason:
+            print(f"[LOG] {reason}، إعادة التحميل الكامل")
+            return None
+        
+        try:
+            if df is None:
+                df = self._read_snapshot(checkpoint)
+                if df is None:
+                    return None
+            reader = log_tail.TailReader.from_checkpoint(self.log_file, checkpoint)
+            columns = event_format.read_jsonl_columns(reader.lines())
+            self._report_malformed(f"{self.log_file} [{reader.start}:{reader.offset}]", columns)
+            frame = self._frame_from_columns(columns)
+            del columns
+            if len(frame):
+                df = self._concat_frames([df, frame]) if len(df) else frame
+        except Exception as e:
+            print(f"[WARNING] فشل التحميل التزايدي، إعادة التحميل الكامل: {e}")
+            return None
+        
+        self.df = df
+        self._save_tail(reader.checkpoint(segments, len(df)), snapshot=len(frame) > 0)
+        if df.empty:
+            print("[WARNING] لا توجد بيانات في ملف السجل")
+            return False
+        print(f"[SUCCESS] تم تحميل {len(frame)} سجل جديد (الإجمالي {len(df)})")
+        return True
+    
+    def _read_snapshot(self, checkpoint: Dict[str, Any]):
+        path = log_tail.snapshot_path(self.log_file)
+        try:
+            df = pd.read_pickle(path)
+        except Exception:
+            return None
+        # لقطة من تشغيل توقف بين حفظ اللقطة ونقطة الاستئناف
+        if len(df) != checkpoint['rows']:
+            return None
+        return df
+    
+    def _save_tail(self, checkpoint: Dict[str, Any], snapshot: bool):
+        """
+        حفظ اللقطة أولاً ثم نقطة الاستئناف، فلا تشير نقطة استئناف إلى لقطة ناقصة
+        """
+        self.checkpoint = checkpoint
+        try:
+            if snapshot:
+                path = log_tail.snapshot_path(self.log_file)
+                self.df.to_pickle(path + ".tmp")
+                os.replace(path + ".tmp", path)
+            log_tail.save_checkpoint(self.log_file, checkpoint)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"[WARNING] تعذر حفظ نقطة الاستئناف: {e}")
+    
+    @staticmethod
+    def _resolve_source(path: str) -> str:
+        """
+        إن ضُغط المقطع بعد قراءة الفهرس يُستخدم الملف المضغوط بدلاً منه
+        """
+        if not os.path.exists(path):
+            for suffix in ('.zst', '.gz'):
+                if os.path.exists(path + suffix):
+                    return path + suffix
+        return path
+    
+    def _parallel_candidate(self, source: str) -> bool:
+        # المقاطع المضغوطة لا يمكن تقسيمها عبر mmap
+        if source.endswith(('.gz', '.zst')):
+            return False
+        return os.path.getsize(source) >= self.parallel_threshold
+    
+    @staticmethod
+    def _report_malformed(source: str, columns: Dict[str, Any]):
+        # تحذير واحد لكل ملف بدلاً من سطر لكل سجل تالف
+        if not columns['malformed']:
+            return
+        for line in columns['malformed_samples']:
+            print(f"[WARNING] خطأ في قراءة السطر: {line}...")
+        print(f"[WARNING] {columns['malformed']} سطر تالف في {source}")
+    
+    @staticmethod
+    def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        دمج الإطارات مع توحيد فئات الأعمدة النصية (pd.concat يحوّلها إلى object
+        إن اختلفت فئاتها فتتضاعف الذاكرة)
+        """
+        if len(frames) == 1:
+            return frames[0]
+        combined = {}
+        for column in frames[0].columns:
+            if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+                combined[column] = union_categoricals([frame[column] for frame in frames])
+            else:
+                combined[column] = np.concatenate([frame[column].to_numpy() for frame in frames])
+        return pd.DataFrame(combined)
+    
+    @staticmethod
+    def _frame_from_columns(columns: Dict[str, Any]) -> pd.DataFrame:
+        """
+        بناء DataFrame من الأعمدة (الحقول النصية كـ categorical)
+        """
+        frame = {
+            'timestamp': pd.to_datetime(columns['timestamp_us'], unit='us'),
+            'client_ip': None,
+            'client_port': columns['client_port'].astype('int64')
+        }
+        for column in event_format.STRING_COLUMNS:
+            codes, categories = columns[column]
+            frame[column] = pd.Categorical.from_codes(codes, categories=categories)
+        return pd.DataFrame(frame)[[
+            'timestamp', 'client_ip', 'client_port', 'session_id',
+            'interaction_type', 'content', 'response_sent'
+        ]]
+    
+    def get_summary(self, start: TimeBound = None, end: TimeBound = None) -> Dict[str, Any]:
+        """
+        كل إحصائيات التقرير والمخططات (aggregation.aggregate) للإطار المحمَّل،
+        أو لنافذة زمنية منه دون إعادة التحميل
+        """
+        if start is None and end is None:
+            return self._cached('summary', lambda: aggregate(self.df, self.common_passwords, self.common_usernames))
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        return self._cached('summary', lambda: aggregate(self._window(start, end), self.common_passwords,
+                                                         self.common_usernames), start, end)
+    
+    def _window(self, start, end) -> pd.DataFrame:
+        if self.df is None:
+            return None
+        mask = np.ones(len(self.df), dtype=bool)
+        if start is not None:
+            mask &= (self.df['timestamp'] >= start).to_numpy()
+        if end is not None:
+            mask &= (self.df['timestamp'] <= end).to_numpy()
+        return self.df[mask]
+    
+    def get_top(self, column: str, n: int = 10, interaction_type: str = None) -> List[Tuple[str, int]]:
+        """
+        أكثر n قيمة تكراراً في عمود نصي، اختيارياً لنوع تفاعل واحد
+        مثال: get_top('content', 5, 'command_execution')
+        """
+        if self.df is None or self.df.empty:
+            return []
+        return self._cached('top', lambda: top_values(self.df, column, n, interaction_type),
+                            column, n, interaction_type)
+    
     def get_basic_stats(self) -> Dict[str, Any]:
         """
         الحصول على الإحصائيات الأساسية
         """
-        if self.df is None or self.df.empty:
+        return self.get_summary().get('basic', {})
+    
+    def _reset_live(self):
+        self.live = {
+            'total_interactions': 0,
+            'ips': Counter(),
+            'interaction_types': Counter(),
+            'usernames': Counter(),
+            'passwords': Counter(),
+            'commands': Counter(),
+            'start': None,
+            'end': None
+        }
+    
+    def _update_live(self, record: Dict[str, Any]):
+        """
+        تحديث الإحصائيات بسجل واحد من البث
+        """
+        live = self.live
+        live['total_interactions'] += 1
+        live['ips'][record.get('client_ip')] += 1
+        interaction_type = record.get('interaction_type')
+        live['interaction_types'][interaction_type] += 1
+        timestamp = record.get('timestamp')
+        if live['start'] is None:
+            live['start'] = timestamp
+        live['end'] = timestamp
+        content = record.get('content') or ''
+        if interaction_type == 'password_attempt' and ':' in content:
+            username, password = content.split(':', 1)
+            live['usernames'][username.lower()] += 1
+            live['passwords'][password] += 1
+        elif interaction_type == 'command_execution':
+            live['commands'][content] += 1
+    
+    def get_live_stats(self) -> Dict[str, Any]:
+        """
+        الإحصائيات الحالية لوضع البث (نفس مفاتيح get_basic_stats إضافة إلى الأكثر تكراراً)
+        """
+        if not self.live:
             return {}
-        
-        stats = {
-            'total_interactions': len(self.df),
-            'unique_ips': self.df['client_ip'].nunique(),
-            'date_range': {
-                'start': self.df['timestamp'].min(),
-                'end': self.df['timestamp'].max()
-            },
-            'interaction_types': self.df['interaction_type'].value_counts().to_dict(),
-            'most_active_ips': self.df['client_ip'].value_counts().head(10).to_dict()
+        live = self.live
+        return {
+            'total_interactions': live['total_interactions'],
+            'unique_ips': len(live['ips']),
+            'date_range': {'start': live['start'], 'end': live['end']},
+            'interaction_types': dict(live['interaction_types']),
+            'most_active_ips': dict(live['ips'].most_common(10)),
+            'top_usernames': live['usernames'].most_common(10),
+            'top_passwords': live['passwords'].most_common(10),
+            'top_commands': live['commands'].most_common(10)
         }
-        
-        return stats
+    
+    def consume_stream(self, socket_path: str = "honeypot_events.sock", duration: float = None,
+                       print_interval: float = 1.0, quiet: bool = False) -> Dict[str, Any]:
+        """
+        وضع البث المباشر: الاشتراك في بث المصيدة (--event-socket) وتحديث الإحصائيات مع
+        كل سجل، وطباعة ملخص كل print_interval ثانية حتى انتهاء duration أو Ctrl+C
+        """
+        self._reset_live()
+        started = last_print = time.monotonic()
+        try:
+            for record in subscribe(socket_path, timeout=print_interval):
+                if record is not None:
+                    self._update_live(record)
+                now = time.monotonic()
+                if not quiet and now - last_print >= print_interval:
+                    last_print = now
+                    self._print_live()
+                if duration is not None and now - started >= duration:
+                    break
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"[ERROR] لا يوجد بث على {socket_path} (شغّل المصيدة مع --event-socket)")
+        except KeyboardInterrupt:
+            pass
+        return self.get_live_stats()
+    
+    def _print_live(self):
+        stats = self.get_live_stats()
+        types = stats['interaction_types']
+        print(f"[LIVE] تفاعلات: {stats['total_interactions']} | IP فريدة: {stats['unique_ips']} | "
+              f"محاولات دخول: {types.get('password_attempt', 0)} | أوامر: {types.get('command_execution', 0)}")
     
     def analyze_credentials(self) -> Dict[str, Any]:
         """
         تحليل محاولات الدخول وكلمات المرور
         """
-        if self.df is None:
-            return {}
-        
-        # استخراج محاولات كلمات المرور
-        password_attempts = self.df[
-            self.df['interaction_type'] == 'password_attempt'
-        ]['content'].tolist()
-        
-        usernames = []
-        passwords = []
-        
-        for attempt in password_attempts:
-            if ':' in attempt:
-                username, password = attempt.split(':', 1)
-                usernames.append(username.lower())
-                passwords.append(password)
-        
-        analysis = {
-            'total_login_attempts': len(password_attempts),
-            'unique_usernames': len(set(usernames)),
-            'unique_passwords': len(set(passwords)),
-            'top_usernames': Counter(usernames).most_common(10),
-            'top_passwords': Counter(passwords).most_common(10),
-            'common_combinations': Counter(password_attempts).most_common(10)
-        }
-        
-        return analysis
+        return self.get_summary().get('credentials', {})
     
     def analyze_commands(self) -> Dict[str, Any]:
         """
         تحليل الأوامر المُنفذة
         """
-        if self.df is None:
-            return {}
-        
-        commands_df = self.df[self.df['interaction_type'] == 'command_execution']
-        
-        if commands_df.empty:
-            return {'message': 'لا توجد أوامر مُنفذة في السجلات'}
-        
-        commands = commands_df['content'].tolist()
-        
-        # تصنيف الأوامر
-        categories = {
-            'reconnaissance': ['ls', 'pwd', 'whoami', 'ps', 'netstat', 'ifconfig'],
-            'file_operations': ['cat', 'vi', 'nano', 'touch', 'rm', 'cp', 'mv'],
-            'network': ['wget', 'curl', 'ping', 'nslookup', 'dig'],
-            'system': ['uname', 'uptime', 'df', 'free', 'top', 'kill'],
-            'malicious': ['rm -rf', 'chmod 777', '/tmp/', 'nc ', 'bash -i']
-        }
-        
-        categorized_commands = defaultdict(list)
-        
-        for cmd in commands:
-            cmd_lower = cmd.lower()
-            categorized = False
-            
-            for category, keywords in categories.items():
-                for keyword in keywords:
-                    if keyword in cmd_lower:
-                        categorized_commands[category].append(cmd)
-                        categorized = True
-                        break
-                if categorized:
-                    break
-            
-            if not categorized:
-                categorized_commands['other'].append(cmd)
-        
-        analysis = {
-            'total_commands': len(commands),
-            'unique_commands': len(set(commands)),
-            'command_frequency': Counter(commands).most_common(15),
-            'categorized_commands': dict(categorized_commands),
-            'category_counts': {cat: len(cmds) for cat, cmds in categorized_commands.items()}
-        }
-        
-        return analysis
+        return self.get_summary().get('commands', {})
     
     def get_ip_geolocation(self, ip: str) -> Dict[str, str]:
         """
         الحصول على الموقع الجغرافي لعنوان IP (باستخدام خدمة مجانية)
         """
-        try:
-            # استخدام خدمة ipapi المجانية
-            response = requests.get(f"http://ip-api.com/json/{ip}", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'success':
-                    return {
-                        'country': data.get('country', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'region': data.get('regionName', 'Unknown'),
-                        'isp': data.get('isp', 'Unknown')
-                    }
-        except Exception as e:
-            print(f"[WARNING] فشل في الحصول على موقع {ip}: {e}")
-        
-        return {'country': 'Unknown', 'city': 'Unknown', 'region': 'Unknown', 'isp': 'Unknown'}
+        return self.get_geo_locator().locate([ip])[ip]
+    
+    def get_geo_locator(self) -> geo_remote.RemoteGeolocator:
+        """
+        عميل خدمة المواقع (جلسة HTTP واحدة وذاكرة SQLite) لكل المحلل
+        """
+        if self._locator is None:
+            cache = None
+            if self.geo_cache:
+                try:
+                    cache = geo_remote.GeoCache(self.geo_cache, self.geo_cache_ttl, self.geo_cache_max_entries)
+                except sqlite3.Error as e:
+                    print(f"[WARNING] تعذر فتح ذاكرة المواقع {self.geo_cache}: {e}")
+            self._locator = geo_remote.RemoteGeolocator(self.geo_service_url, cache)
+        return self._locator
+    
+    def get_geo_database(self):
+        """
+        قاعدة المواقع المحلية (تُحمَّل مرة واحدة)، أو None إن لم يوجد الملف
+        """
+        if self._geo is None and self.geo_database and os.path.exists(self.geo_database):
+            try:
+                self._geo = GeoDatabase.load(self.geo_database)
+            except (OSError, ValueError) as e:
+                print(f"[ERROR] فشل في تحميل قاعدة المواقع {self.geo_database}: {e}")
+                self.geo_database = None
+        return self._geo
     
     def analyze_geographic_distribution(self) -> Dict[str, Any]:
         """
-        تحليل التوزيع الجغرافي للهجمات
+        تحليل التوزيع الجغرافي للهجمات (كل العناوين، انظر aggregation.geographic)
         """
-        if self.df is None:
+        if self.df is None or self.df.empty:
             return {}
+        return self._cached('geographic', lambda: geographic(self.df, self._ip_locations()))
+    
+    def get_country_timeseries(self, freq: str = 'D', countries: int = 10) -> pd.DataFrame:
+        """
+        التفاعلات لكل فترة لأكثر الدول هجوماً (صف لكل فترة وعمود لكل دولة)
+        مثال: get_country_timeseries('h', 5)
+        """
+        if self.df is None or self.df.empty:
+            return pd.DataFrame()
+        return self._cached('country_timeseries',
+                            lambda: country_timeseries(self.df, self._ip_locations(), freq, countries),
+                            freq, countries)
+    
+    def _ip_locations(self) -> pd.DataFrame:
+        """
+        جدول المواقع: صف لكل فئة في client_ip بنفس ترتيبها
+        """
+        return self._cached('ip_locations', self._resolve_ip_locations)
+    
+    def _resolve_ip_locations(self) -> pd.DataFrame:
+        geo = self.get_geo_database()
+        if geo is None:
+            return self._remote_locations(self.df['client_ip'].cat.categories)
+        addresses = self.get_ip_addresses()
         
-        unique_ips = self.df['client_ip'].unique()[:20]  # أول 20 IP لتجنب تجاوز حدود API
-        
-        geo_data = []
-        for ip in unique_ips:
-            geo_info = self.get_ip_geolocation(ip)
-            geo_info['ip'] = ip
-            geo_info['attack_count'] = len(self.df[self.df['client_ip'] == ip])
-            geo_data.append(geo_info)
-            time.sleep(0.1)  # تجنب تجاوز حدود المعدل
-        
-        countries = [item['country'] for item in geo_data if item['country'] != 'Unknown']
-        
-        analysis = {
-            'total_analyzed_ips': len(geo_data),
-            'countries': Counter(countries).most_common(10),
-            'detailed_data': geo_data
-        }
+        def resolve(ips: np.ndarray, start: int) -> pd.DataFrame:
+            # العناوين محللة مسبقاً في get_ip_addresses
+            part = addresses.iloc[start:start + len(ips)]
+            located = geo.resolve(ips, part['v4'].to_numpy(), (part['version'] == 4).to_numpy())
+            located['resolved'] = located['range'].to_numpy() >= 0
+            return located
+        return self._per_ip('ip_locations', resolve)
+    
+    def _per_ip(self, name: str, resolve: Callable[[np.ndarray, int], pd.DataFrame]) -> pd.DataFrame:
+        """
+        جدول بصف لكل فئة في client_ip بنفس ترتيبها (عمود 'ip' وما تحسبه resolve(العناوين، موضع أولها))
+        يبقى بين إصدارات الإطار: الإلحاق (union_categoricals) يضيف الفئات الجديدة في النهاية،
+        فلا يُحسب إلا للعناوين الجديدة
+        """
+        categories = self.df['client_ip'].cat.categories
+        known = self._ip_tables.get(name)
+        if known is not None and (len(known) > len(categories)
+                                  or not categories[:len(known)].equals(pd.Index(known['ip']))):
+            known = None
+        start = len(known) if known is not None else 0
+        if start < len(categories):
+            added = resolve(categories[start:].to_numpy(dtype=object), start)
+            known = added if known is None else self._concat_frames([known, added])
+            self._ip_tables[name] = known
+        return known
+    
+    def get_ip_addresses(self) -> pd.DataFrame:
+        """
+        عناوين client_ip كأعداد صحيحة (subnets.encode)، صف لكل فئة في client_ip
+        لكل صف في الإطار: get_ip_addresses().iloc[df['client_ip'].cat.codes]
+        """
+        return self._per_ip('ip_addresses', lambda ips, start: subnets.encode(ips))
+    
+    def _ip_attacks(self) -> np.ndarray:
+        codes = self.df['client_ip'].cat.codes.to_numpy()
+        return np.bincount(codes[codes >= 0], minlength=len(self.df['client_ip'].cat.categories))
+    
+    def analyze_subnets(self) -> Dict[str, Any]:
+        """
+        أكثر الشبكات هجوماً على مستويات /8 و/16 و/24 (انظر subnets.summarize)
+        """
+        if self.df is None or self.df.empty:
+            return {}
+        return self._cached('subnets', lambda: subnets.summarize(self.get_ip_addresses(), self._ip_attacks()))
+    
+    def get_subnet_stats(self, prefix: int = 24, n: int = 10, version: int = 4) -> List[Tuple[str, int, int]]:
+        """
+        أكثر n شبكة /prefix هجوماً: (الشبكة، التفاعلات، عدد العناوين)
+        مثال: get_subnet_stats(20) أو get_subnet_stats(48, version=6)
+        """
+        if self.df is None or self.df.empty:
+            return []
+        return self._cached('subnet_stats', lambda: subnets.subnet_counts(
+            self.get_ip_addresses(), self._ip_attacks(), prefix, version, n), prefix, n, version)
+    
+    def filter_networks(self, *cidrs: str) -> pd.DataFrame:
+        """
+        سجلات العناوين الواقعة في أي من الشبكات، مثال: filter_networks('45.0.0.0/8', '2001:db8::/32')
+        """
+        if self.df is None:
+            return None
+        addresses = self.get_ip_addresses()
+        matched = np.zeros(len(addresses), dtype=bool)
+        for cidr in cidrs:
+            matched |= subnets.in_network(addresses, cidr)
+        codes = self.df['client_ip'].cat.codes.to_numpy()
+        return self.df[(codes >= 0) & matched[codes]]
+    
+    def _remote_locations(self, categories: pd.Index) -> pd.DataFrame:
+        """
+        المواقع من الخدمة (geo_remote) لأكثر geo_remote_limit عنوان هجوماً؛ البقية دون موقع
+        """
+        attacks = self._ip_attacks()
+        top = np.argsort(-attacks, kind='stable')[:self.geo_remote_limit]
+        top = top[attacks[top] > 0]
+        located = self.get_geo_locator().locate(categories[top])
         
-        return analysis
+        columns = {field: np.full(len(categories), None, dtype=object) for field in geo_remote.LOCATION_FIELDS}
+        for i in top:
+            for field, value in located[categories[i]].items():
+                columns[field][i] = None if value == 'Unknown' else value
+        locations = pd.DataFrame({'ip': categories.to_numpy(dtype=object),
+                                  **{field: pd.Categorical(values) for field, values in columns.items()}})
+        locations['resolved'] = locations['country'].notna().to_numpy()
+        return locations
     
     def create_visualizations(self):
         """
@@ -236,29 +661,36 @@ class HoneypotAnalyzer:
             print("[ERROR] لا توجد بيانات لإنشاء المخططات")
             return
         
+        summary = self.get_summary()
+        
         # إعداد الشكل
         fig = plt.figure(figsize=(20, 15))
         fig.suptitle('تحليل بيانات مصيدة التسلل - Honeypot Analysis Dashboard', fontsize=16, y=0.95)
         
         # 1. توزيع أنواع التفاعل
         plt.subplot(2, 3, 1)
-        interaction_counts = self.df['interaction_type'].value_counts()
-        plt.pie(interaction_counts.values, labels=interaction_counts.index, autopct='%1.1f%%')
+        interaction_counts = summary['basic']['interaction_types']
+        plt.pie(list(interaction_counts.values()), labels=list(interaction_counts.keys()), autopct='%1.1f%%')
         plt.title('توزيع أنواع التفاعل')
         
-        # 2. أكثر عناوين IP نشاطاً
+        # 2. أكثر عناوين IP نشاطاً وأكثر شبكات /24 نشاطاً
         plt.subplot(2, 3, 2)
-        top_ips = self.df['client_ip'].value_counts().head(10)
-        plt.barh(range(len(top_ips)), top_ips.values)
-        plt.yticks(range(len(top_ips)), top_ips.index)
+        top_ips = summary['basic']['most_active_ips']
+        top_subnets = self.get_subnet_stats(24, 5)
+        plt.barh(range(len(top_ips)), list(top_ips.values()), label='IP')
+        plt.barh(range(len(top_ips), len(top_ips) + len(top_subnets)),
+                 [count for _, count, _ in top_subnets], color='tab:red', label='/24')
+        plt.yticks(range(len(top_ips) + len(top_subnets)),
+                   list(top_ips.keys()) + [f"{network} ({ips})" for network, _, ips in top_subnets])
+        plt.gca().invert_yaxis()
         plt.xlabel('عدد التفاعلات')
-        plt.title('أكثر 10 عناوين IP نشاطاً')
+        plt.legend()
+        plt.title('أكثر 10 عناوين IP وأكثر 5 شبكات /24 نشاطاً')
         
         # 3. التوزيع الزمني للهجمات
         plt.subplot(2, 3, 3)
-        self.df['hour'] = self.df['timestamp'].dt.hour
-        hourly_attacks = self.df['hour'].value_counts().sort_index()
-        plt.plot(hourly_attacks.index, hourly_attacks.values, marker='o')
+        hourly_attacks = summary['temporal']['hourly']
+        plt.plot(list(hourly_attacks.keys()), list(hourly_attacks.values()), marker='o')
         plt.xlabel('الساعة من اليوم')
         plt.ylabel('عدد التفاعلات')
         plt.title('التوزيع الزمني للتفاعلات (24 ساعة)')
@@ -267,35 +699,25 @@ class HoneypotAnalyzer:
         
         # 4. تحليل محاولات كلمات المرور
         plt.subplot(2, 3, 4)
-        password_attempts = self.df[self.df['interaction_type'] == 'password_attempt']
-        if not password_attempts.empty:
-            passwords = []
-            for attempt in password_attempts['content']:
-                if ':' in attempt:
-                    _, password = attempt.split(':', 1)
-                    passwords.append(password)
-            
-            if passwords:
-                top_passwords = Counter(passwords).most_common(8)
-                plt.bar(range(len(top_passwords)), [count for _, count in top_passwords])
-                plt.xticks(range(len(top_passwords)), [pwd for pwd, _ in top_passwords], rotation=45)
-                plt.ylabel('عدد المحاولات')
-                plt.title('أكثر كلمات المرور المُجربة')
+        top_passwords = summary['credentials']['top_passwords'][:8]
+        if top_passwords:
+            plt.bar(range(len(top_passwords)), [count for _, count in top_passwords])
+            plt.xticks(range(len(top_passwords)), [pwd for pwd, _ in top_passwords], rotation=45)
+            plt.ylabel('عدد المحاولات')
+            plt.title('أكثر كلمات المرور المُجربة')
         
         # 5. تحليل الأوامر المُنفذة
         plt.subplot(2, 3, 5)
-        commands = self.df[self.df['interaction_type'] == 'command_execution']
-        if not commands.empty:
-            top_commands = commands['content'].value_counts().head(8)
-            plt.bar(range(len(top_commands)), top_commands.values)
-            plt.xticks(range(len(top_commands)), top_commands.index, rotation=45)
+        top_commands = summary['commands'].get('command_frequency', [])[:8]
+        if top_commands:
+            plt.bar(range(len(top_commands)), [count for _, count in top_commands])
+            plt.xticks(range(len(top_commands)), [command for command, _ in top_commands], rotation=45)
             plt.ylabel('عدد التنفيذات')
             plt.title('أكثر الأوامر تنفيذاً')
         
         # 6. إحصائيات الجلسات
         plt.subplot(2, 3, 6)
-        session_stats = self.df.groupby('session_id').size()
-        plt.hist(session_stats.values, bins=20, alpha=0.7)
+        plt.hist(summary['sessions']['lengths'], bins=20, alpha=0.7)
         plt.xlabel('عدد التفاعلات لكل جلسة')
         plt.ylabel('عدد الجلسات')
         plt.title('توزيع طول الجلسات')
@@ -311,9 +733,10 @@ class HoneypotAnalyzer:
         if not self.load_data():
             return "فشل في تحميل البيانات"
         
-        basic_stats = self.get_basic_stats()
-        credentials_analysis = self.analyze_credentials()
-        commands_analysis = self.analyze_commands()
+        summary = self.get_summary()
+        basic_stats = summary.get('basic', {})
+        credentials_analysis = summary.get('credentials', {})
+        commands_analysis = summary.get('commands', {})
         
         report = []
         report.append("=" * 80)
@@ -356,6 +779,17 @@ class HoneypotAnalyzer:
             for password, count in credentials_analysis['top_passwords'][:5]:
                 report.append(f"   {password}: {count} محاولة")
             report.append("")
+            
+            # خصائص كل كلمات المرور المُجربة (وليس الأكثر تكراراً فقط)
+            strength = credentials_analysis['password_strength']
+            report.append("💪 قوة كلمات المرور المُجربة:")
+            report.append(f"• متوسط الطول: {credentials_analysis['mean_password_length']:.1f} حرف، "
+                          f"متوسط الإنتروبيا: {credentials_analysis['mean_password_entropy']:.1f} بت")
+            report.append(f"• ضعيفة جداً (< 28 بت): {strength['very_weak']}، ضعيفة: {strength['weak']}، "
+                          f"مقبولة: {strength['reasonable']}، قوية (>= 60 بت): {strength['strong']}")
+            report.append(f"• من قائمة كلمات المرور الشائعة: {credentials_analysis['common_password_attempts']}، "
+                          f"أقصر من 6 أحرف: {credentials_analysis['short_password_attempts']}")
+            report.append("")
         
         # تحليل الأوامر
         if commands_analysis and commands_analysis.get('total_commands', 0) > 0:
@@ -386,45 +820,69 @@ class HoneypotAnalyzer:
                 report.append("")
         
         # تحليل الأنماط الزمنية
-        if self.df is not None:
+        if summary:
             report.append("⏰ التحليل الزمني:")
             report.append("-" * 40)
             
             # أكثر الأيام نشاطاً
-            daily_activity = self.df.groupby(self.df['timestamp'].dt.date).size()
-            if not daily_activity.empty:
-                busiest_day = daily_activity.idxmax()
-                busiest_count = daily_activity.max()
+            if summary['temporal']['busiest_day']:
+                busiest_day, busiest_count = summary['temporal']['busiest_day']
                 report.append(f"• أكثر الأيام نشاطاً: {busiest_day} ({busiest_count} تفاعل)")
             
             # أكثر الساعات نشاطاً
-            hourly_activity = self.df.groupby(self.df['timestamp'].dt.hour).size()
-            if not hourly_activity.empty:
-                busiest_hour = hourly_activity.idxmax()
-                busiest_hour_count = hourly_activity.max()
+            if summary['temporal']['busiest_hour']:
+                busiest_hour, busiest_hour_count = summary['temporal']['busiest_hour']
                 report.append(f"• أكثر الساعات نشاطاً: {busiest_hour}:00 ({busiest_hour_count} تفاعل)")
             report.append("")
         
+        # الشبكات الفرعية: عناوين متعددة من نفس الشبكة غالباً نفس المهاجم
+        if summary:
+            subnet_analysis = self.analyze_subnets()
+            report.append("🌐 الشبكات الفرعية:")
+            report.append("-" * 40)
+            report.append(f"• عناوين IPv4: {subnet_analysis['ipv4_ips']}، IPv6: {subnet_analysis['ipv6_ips']}"
+                          + (f"، غير صالحة: {subnet_analysis['invalid_ips']}" if subnet_analysis['invalid_ips'] else ""))
+            for level in ('/24', '/16', 'v6 /64'):
+                if subnet_analysis.get(level):
+                    report.append(f"• أكثر شبكات {level} هجوماً:")
+                    for network, count, ips in subnet_analysis[level][:5]:
+                        report.append(f"   {network}: {count} تفاعل من {ips} عنوان")
+            report.append("")
+        
+        # التوزيع الجغرافي (من القاعدة المحلية فقط: التقرير لا يرسل طلبات شبكة)
+        if summary and self.get_geo_database() is not None:
+            geographic = self.analyze_geographic_distribution()
+            report.append("🌍 التوزيع الجغرافي:")
+            report.append("-" * 40)
+            report.append(f"• عناوين IP محللة: {geographic['total_analyzed_ips']} "
+                          f"(غير معروفة: {geographic['unresolved_ips']})")
+            if geographic['country_attacks']:
+                report.append("• أكثر الدول هجوماً:")
+                for country, count, ips in geographic['country_attacks'][:5]:
+                    report.append(f"   {country}: {count} تفاعل من {ips} عنوان")
+                    top_ips = geographic['top_ips_by_country'][country][:3]
+                    report.append("      " + "، ".join(f"{ip} ({attacks})" for ip, attacks in top_ips))
+            if geographic['asns']:
+                report.append("• أكثر الشبكات (ASN) هجوماً:")
+                for asn in geographic['asns'][:5]:
+                    name = f"AS{asn[0]} {asn[1]}" if len(asn) == 4 else f"AS{asn[0]}"
+                    report.append(f"   {name}: {asn[-1]} تفاعل من {asn[-2]} عنوان")
+            report.append("")
+        
         # توصيات أمنية
         report.append("🛡️ التوصيات الأمنية:")
         report.append("-" * 40)
         
         if credentials_analysis.get('total_login_attempts', 0) > 0:
-            # فحص كلمات المرور الضعيفة
-            weak_passwords = 0
-            for password, count in credentials_analysis.get('top_passwords', []):
-                if password.lower() in self.common_passwords or len(password) < 6:
-                    weak_passwords += count
+            # فحص كلمات المرور الضعيفة (شائعة أو أقصر من 6 أحرف) في كل المحاولات
+            weak_passwords = credentials_analysis['weak_password_attempts']
             
             if weak_passwords > 0:
                 report.append(f"• تم رصد {weak_passwords} محاولة باستخدام كلمات مرور ضعيفة")
                 report.append("• يُنصح باستخدام كلمات مرور قوية ومعقدة")
             
             # فحص أسماء المستخدمين الشائعة
-            common_usernames_found = 0
-            for username, count in credentials_analysis.get('top_usernames', []):
-                if username in self.common_usernames:
-                    common_usernames_found += count
+            common_usernames_found = credentials_analysis['common_username_attempts']
             
             if common_usernames_found > 0:
                 report.append(f"• تم رصد {common_usernames_found} محاولة باستخدام أسماء مستخدمين شائعة")
@@ -543,7 +1001,7 @@ def main():
     print("=" * 80)
     print()
     
-    analyzer = HoneypotAnalyzer()
+    analyzer = HoneypotAnalyzer(incremental=True)
     
     while True:
         print("\nاختر العملية المطلوبة:")
@@ -552,9 +1010,11 @@ def main():
         print("3. تصدير البيانات إلى CSV")
         print("4. إنشاء بيانات تجريبية (للاختبار)")
         print("5. عرض الإحصائيات السريعة")
+        print("6. البث المباشر من المصيدة (--event-socket)")
+        print("7. مسح الذاكرة المؤقتة للسجلات المُحلَّلة")
         print("0. خروج")
         
-        choice = input("\nأدخل اختيارك (0-5): ").strip()
+        choice = input("\nأدخل اختيارك (0-7): ").strip()
         
         if choice == "1":
             print("\n" + "="*50)
@@ -603,6 +1063,22 @@ def main():
             else:
                 print("فشل في تحميل البيانات")
         
+        elif choice == "6":
+            socket_path = input("مسار البث [honeypot_events.sock]: ").strip() or "honeypot_events.sock"
+            print("\nالإحصائيات المباشرة (Ctrl+C للعودة):")
+            stats = analyzer.consume_stream(socket_path)
+            if stats:
+                print(f"إجمالي التفاعلات: {stats['total_interactions']}")
+                print(f"عناوين IP فريدة: {stats['unique_ips']}")
+                for command, count in stats['top_commands'][:5]:
+                    print(f"  - {command}: {count}")
+        
+        elif choice == "7":
+            removed = log_cache.clear(analyzer.log_file)
+            log_tail.remove_checkpoint(analyzer.log_file)
+            analyzer.df = analyzer.checkpoint = None
+            print(f"[SUCCESS] تم حذف {removed} مدخل ونقطة الاستئناف، التحميل التالي كامل")
+        
         elif choice == "0":
             print("شكراً لاستخدام محلل بيانات مصيدة التسلل!")
             break
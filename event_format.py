@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+صيغ تسلسل السجلات: JSONL (الافتراضية) وصيغة ثنائية مضغوطة، مع أدوات التحويل بينهما
+
+الصيغة الثنائية (.hpev):
+    الترويسة: b'HPEV' + رقم الإصدار (1 بايت) + 3 بايتات محجوزة
+    ثم كتل متتالية، كل كتلة: النوع (1 بايت) + طول المحتوى (4 بايتات) + المحتوى
+      STRINGS - تعريف نصوص جديدة في أحد القواميس: رقم القاموس + العدد + (طول، نص UTF-8)...
+      EVENTS  - مصفوفة أحداث ثابتة الحجم (30 بايت لكل حدث، انظر EVENT_STRUCT)
+      RESET   - تفريغ القواميس (عند استئناف ملف موجود أو امتلاء قاموس)
+
+    الحدث يخزّن الطابع الزمني كعدد صحيح (ميكروثانية منذ 1970 لوقت الساعة المحلي كما هو،
+    أي دون تحويل المنطقة الزمنية) وبقية الحقول كأرقام في القواميس المُعرَّفة قبله في الملف،
+    فلا تتكرر أسماء المفاتيح ولا النصوص المتكررة (نوع التفاعل، IP، الجلسة، المحتوى).
+
+الاستخدام:
+    python event_format.py to-binary honeypot_logs.json honeypot_logs.hpev
+    python event_format.py to-jsonl honeypot_logs.hpev honeypot_logs.json
+"""
+
+import argparse
+import datetime
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import warnings
+from typing import Dict, Any, Iterable, List, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # القراءة العمودية فقط تحتاج numpy
+    np = None
+
+MAGIC = b'HPEV'
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+
+KIND_STRINGS = 1
+KIND_EVENTS = 2
+KIND_RESET = 3
+
+CHUNK_HEADER = struct.Struct('<BI')
+STRINGS_HEADER = struct.Struct('<BI')
+STRING_LENGTH = struct.Struct('<I')
+# timestamp_us, interaction_type, client_ip, session_id, client_port, content, response_sent
+EVENT_STRUCT = struct.Struct('<qIIIHII')
+
+TABLE_TYPE, TABLE_IP, TABLE_SESSION, TABLE_CONTENT, TABLE_RESPONSE = range(5)
+TABLE_COUNT = 5
+NONE_ID = 0xFFFFFFFF
+
+EPOCH = datetime.datetime(1970, 1, 1)
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+def timestamp_to_us(timestamp: str) -> int:
+    """
+    تحويل طابع ISO إلى عدد صحيح (ميكروثانية) دون تحويل المنطقة الزمنية
+    """
+    value = datetime.datetime.fromisoformat(timestamp)
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // ONE_MICROSECOND
+
+def us_to_timestamp(value: int) -> str:
+    return (EPOCH + datetime.timedelta(microseconds=value)).isoformat()
+
+def is_binary_log(path: str) -> bool:
+    """
+    هل الملف بالصيغة الثنائية؟ (يُكشف من الترويسة وليس من الامتداد)
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+class JsonlEncoder:
+    """
+    سطر JSON لكل سجل (الصيغة الأصلية)
+    """
+
+    binary = False
+
+    def header(self) -> bytes:
+        return b''
+
+    def reset(self, fresh: bool = True):
+        pass
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def frame(self, encoded: List[bytes]) -> bytes:
+        return b''.join(encoded)
+
+class BinaryEventEncoder:
+    """
+    مُرمِّز الصيغة الثنائية
+
+    encode() يُعيد 30 بايت للحدث ويجمع النصوص الجديدة، و frame() يكتب تعريفات
+    النصوص أولاً ثم كتلة الأحداث بأكملها، فتصبح كل دفعة من كاتب السجلات كتلتين أو ثلاثاً.
+    """
+
+    binary = True
+
+    def __init__(self, max_table_entries: int = 1000000):
+        self.max_table_entries = max_table_entries
+        self.reset()
+
+    def header(self) -> bytes:
+        return HEADER
+
+    def reset(self, fresh: bool = True):
+        """
+        fresh=False عند متابعة ملف موجود: القواميس السابقة غير معروفة، فتُكتب كتلة RESET
+        """
+        self.tables = [{} for _ in range(TABLE_COUNT)]
+        self.pending = [[] for _ in range(TABLE_COUNT)]
+        self.needs_reset = not fresh
+
+    def _intern(self, table: int, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_ID
+        ids = self.tables[table]
+        string_id = ids.get(value)
+        if string_id is None:
+            string_id = len(ids)
+            ids[value] = string_id
+            self.pending[table].append(value)
+        return string_id
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        timestamp = record.get("timestamp")
+        content = record.get("content")
+        response = record.get("response_sent")
+        return EVENT_STRUCT.pack(
+            timestamp_to_us(timestamp) if timestamp else 0,
+            self._intern(TABLE_TYPE, record.get("interaction_type")),
+            self._intern(TABLE_IP, record.get("client_ip")),
+            self._intern(TABLE_SESSION, record.get("session_id")),
+            record.get("client_port") or 0,
+            self._intern(TABLE_CONTENT, None if content is None else str(content)),
+            self._intern(TABLE_RESPONSE, None if response is None else str(response))
+        )
+
+    def frame(self, encoded: List[bytes]) -> bytes:
+        parts = []
+        if self.needs_reset:
+            parts.append(CHUNK_HEADER.pack(KIND_RESET, 0))
+            self.needs_reset = False
+
+        for table, values in enumerate(self.pending):
+            if not values:
+                continue
+            body = [STRINGS_HEADER.pack(table, len(values))]
+            for value in values:
+                data = value.encode('utf-8', errors='replace')
+                body.append(STRING_LENGTH.pack(len(data)))
+                body.append(data)
+            body = b''.join(body)
+            parts.append(CHUNK_HEADER.pack(KIND_STRINGS, len(body)))
+            parts.append(body)
+            self.pending[table] = []
+
+        events = b''.join(encoded)
+        parts.append(CHUNK_HEADER.pack(KIND_EVENTS, len(events)))
+        parts.append(events)
+
+        # حدّ لذاكرة القواميس: عند الامتلاء تبدأ قواميس جديدة بعد هذه الدفعة
+        if any(len(ids) >= self.max_table_entries for ids in self.tables):
+            self.reset(fresh=False)
+
+        return b''.join(parts)
+
+def make_encoder(log_format: str):
+    if log_format == "binary":
+        return BinaryEventEncoder()
+    if log_format == "jsonl":
+        return JsonlEncoder()
+    raise ValueError(f"صيغة سجل غير معروفة: {log_format}")
+
+def _iter_chunks(buffer) -> Iterator[tuple]:
+    """
+    المرور على كتل الملف الثنائي: (النوع، memoryview للمحتوى)
+    """
+    view = memoryview(buffer)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError("ليس ملف سجل ثنائي (HPEV)")
+    if view[len(MAGIC)] != VERSION:
+        raise ValueError(f"إصدار غير مدعوم: {view[len(MAGIC)]}")
+
+    pos = len(HEADER)
+    end = len(view)
+    while pos + CHUNK_HEADER.size <= end:
+        kind, length = CHUNK_HEADER.unpack_from(view, pos)
+        pos += CHUNK_HEADER.size
+        if pos + length > end:
+            # كتلة ناقصة في نهاية الملف (توقف مفاجئ أثناء الكتابة)
+            print(f"[WARNING] كتلة ناقصة في نهاية السجل الثنائي ({end - pos}/{length} بايت)")
+            return
+        yield kind, view[pos:pos + length]
+        pos += length
+
+def _decode_strings(body: memoryview):
+    table, count = STRINGS_HEADER.unpack_from(body, 0)
+    pos = STRINGS_HEADER.size
+    values = []
+    for _ in range(count):
+        (length,) = STRING_LENGTH.unpack_from(body, pos)
+        pos += STRING_LENGTH.size
+        values.append(str(body[pos:pos + length], 'utf-8', 'replace'))
+        pos += length
+    return table, values
+
+def iter_records(buffer) -> Iterator[Dict[str, Any]]:
+    """
+    فك ترميز الملف الثنائي إلى سجلات (قواميس) بنفس شكل JSONL - للتحويل فقط
+    """
+    tables = [[] for _ in range(TABLE_COUNT)]
+
+    def lookup(table, string_id):
+        return None if string_id == NONE_ID else tables[table][string_id]
+
+    for kind, body in _iter_chunks(buffer):
+        if kind == KIND_STRINGS:
+            table, values = _decode_strings(body)
+            tables[table].extend(values)
+        elif kind == KIND_RESET:
+            tables = [[] for _ in range(TABLE_COUNT)]
+        elif kind == KIND_EVENTS:
+            for ts, type_id, ip_id, session_id, port, content_id, response_id in EVENT_STRUCT.iter_unpack(body):
+                yield {
+                    "timestamp": us_to_timestamp(ts),
+                    "client_ip": lookup(TABLE_IP, ip_id),
+                    "client_port": port,
+                    "session_id": lookup(TABLE_SESSION, session_id),
+                    "interaction_type": lookup(TABLE_TYPE, type_id),
+                    "content": lookup(TABLE_CONTENT, content_id),
+                    "response_sent": lookup(TABLE_RESPONSE, response_id)
+                }
+
+def scan(buffer) -> Dict[str, Any]:
+    """
+    عدد السجلات والمدى الزمني دون فك ترميز النصوص
+    """
+    records = 0
+    first = last = None
+    for kind, body in _iter_chunks(buffer):
+        if kind != KIND_EVENTS:
+            continue
+        for (ts, *_rest) in EVENT_STRUCT.iter_unpack(body):
+            records += 1
+            if first is None or ts < first:
+                first = ts
+            if last is None or ts > last:
+                last = ts
+    return {
+        "records": records,
+        "start": us_to_timestamp(first) if first is not None else None,
+        "end": us_to_timestamp(last) if last is not None else None
+    }
+
+# الحقول المُرمَّزة بالقواميس وأرقام قواميسها
+STRING_COLUMNS = {
+    "interaction_type": TABLE_TYPE,
+    "client_ip": TABLE_IP,
+    "session_id": TABLE_SESSION,
+    "content": TABLE_CONTENT,
+    "response_sent": TABLE_RESPONSE
+}
+
+_EVENT_FIELDS = {
+    "interaction_type": "type",
+    "client_ip": "ip",
+    "session_id": "session",
+    "content": "content",
+    "response_sent": "response"
+}
+
+def read_columns(buffer) -> Dict[str, Any]:
+    """
+    قراءة عمودية للملف الثنائي دون إنشاء قاموس لكل سجل
+
+    كتل الأحداث تُقرأ مباشرة عبر np.frombuffer، وأرقام القواميس المحلية تُحوَّل إلى
+    أرقام موحدة عبر جدول تحويل (عملية متجهة واحدة لكل كتلة).
+
+    تُعيد:
+        timestamp_us, client_port: مصفوفات numpy
+        لكل حقل نصي: (codes, categories) حيث -1 تعني None
+    """
+    if np is None:
+        raise RuntimeError("مكتبة numpy مطلوبة للقراءة العمودية")
+
+    event_dtype = np.dtype([
+        ('ts', '<i8'), ('type', '<u4'), ('ip', '<u4'), ('session', '<u4'),
+        ('port', '<u2'), ('content', '<u4'), ('response', '<u4')
+    ])
+    assert event_dtype.itemsize == EVENT_STRUCT.size
+
+    categories = [[] for _ in range(TABLE_COUNT)]
+    global_ids = [{} for _ in range(TABLE_COUNT)]
+    local_to_global = [[] for _ in range(TABLE_COUNT)]
+    lookup_tables = [None] * TABLE_COUNT
+
+    timestamps = []
+    ports = []
+    codes = {column: [] for column in STRING_COLUMNS}
+
+    for kind, body in _iter_chunks(buffer):
+        if kind == KIND_STRINGS:
+            table, values = _decode_strings(body)
+            ids = global_ids[table]
+            for value in values:
+                string_id = ids.get(value)
+                if string_id is None:
+                    string_id = len(categories[table])
+                    ids[value] = string_id
+                    categories[table].append(value)
+                local_to_global[table].append(string_id)
+            lookup_tables[table] = None
+        elif kind == KIND_RESET:
+            local_to_global = [[] for _ in range(TABLE_COUNT)]
+            lookup_tables = [None] * TABLE_COUNT
+        elif kind == KIND_EVENTS:
+            events = np.frombuffer(body, dtype=event_dtype)
+            timestamps.append(events['ts'].copy())
+            ports.append(events['port'].copy())
+            for column, table in STRING_COLUMNS.items():
+                if lookup_tables[table] is None:
+                    # الخانة الأخيرة تقابل NONE_ID بعد القص
+                    lookup_tables[table] = np.array(local_to_global[table] + [-1], dtype=np.int32)
+                lut = lookup_tables[table]
+                local_ids = events[_EVENT_FIELDS[column]]
+                local_ids = np.minimum(local_ids, len(lut) - 1)
+                codes[column].append(lut[local_ids])
+
+    def concat(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    result = {
+        "timestamp_us": concat(timestamps, np.int64),
+        "client_port": concat(ports, np.uint16)
+    }
+    for column, table in STRING_COLUMNS.items():
+        result[column] = (concat(codes[column], np.int32), categories[table])
+    return result
+
+def _parse_timestamps(values: List[Optional[str]]):
+    """
+    المسار السريع: numpy يحلّل طوابع ISO دون منطقة زمنية (ما تكتبه المصيدة) دفعة واحدة في C؛
+    ما عدا ذلك (منطقة زمنية أو صيغة أخرى) يُحلَّل قيمة بقيمة كما في الصيغة الثنائية
+    """
+    try:
+        with warnings.catch_warnings():
+            # numpy يحذّر فقط (ولا يرفض) عند وجود منطقة زمنية
+            warnings.simplefilter("error")
+            return np.array(values, dtype='datetime64[us]').astype(np.int64)
+    except (ValueError, TypeError, UserWarning, DeprecationWarning):
+        pass
+
+    nat = np.iinfo(np.int64).min
+    parsed = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        try:
+            parsed[i] = timestamp_to_us(value) if value else nat
+        except (ValueError, TypeError):
+            parsed[i] = nat
+    return parsed
+
+def read_jsonl_columns(lines: Iterable, chunk_lines: int = 65536,
+                       max_samples: int = 5) -> Dict[str, Any]:
+    """
+    قراءة عمودية لسطور JSONL بنفس شكل read_columns
+
+    كل سطر يُفك ثم تُضاف حقوله مباشرة إلى أعمدة الكتلة الحالية (النصوص كأرقام في قواميس
+    مشتركة)، وكل chunk_lines سطراً تتحول الكتلة إلى مصفوفات numpy. لا يبقى قاموس لأي سجل،
+    فالذاكرة ~30 بايت لكل سجل إضافة إلى النصوص الفريدة فقط.
+
+    تُعيد إضافة إلى أعمدة read_columns:
+        malformed: عدد الأسطر التالفة، malformed_samples: أول max_samples منها
+    """
+    if np is None:
+        raise RuntimeError("مكتبة numpy مطلوبة للقراءة العمودية")
+
+    columns = tuple(STRING_COLUMNS)
+    ids = {column: {} for column in columns}
+    categories = {column: [] for column in columns}
+    timestamps: List[Any] = []
+    ports: List[Any] = []
+    codes: Dict[str, List[Any]] = {column: [] for column in columns}
+
+    chunk_timestamps: List[Optional[str]] = []
+    chunk_ports: List[int] = []
+    chunk_codes: Dict[str, List[int]] = {column: [] for column in columns}
+    malformed = 0
+    samples: List[str] = []
+
+    def flush():
+        timestamps.append(_parse_timestamps(chunk_timestamps))
+        ports.append(np.array(chunk_ports, dtype=np.int32))
+        for column in columns:
+            codes[column].append(np.array(chunk_codes[column], dtype=np.int32))
+            chunk_codes[column].clear()
+        chunk_timestamps.clear()
+        chunk_ports.clear()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            chunk_ports.append(int(record.get("client_port") or 0))
+        except (ValueError, TypeError, AttributeError):
+            malformed += 1
+            if len(samples) < max_samples:
+                sample = line[:50]
+                samples.append(sample.decode('utf-8', 'replace') if isinstance(sample, bytes) else sample)
+            continue
+        chunk_timestamps.append(record.get("timestamp"))
+        for column in columns:
+            value = record.get(column)
+            if value is None:
+                chunk_codes[column].append(-1)
+                continue
+            if not isinstance(value, str):
+                value = str(value)
+            table = ids[column]
+            string_id = table.get(value)
+            if string_id is None:
+                string_id = table[value] = len(categories[column])
+                categories[column].append(value)
+            chunk_codes[column].append(string_id)
+        if len(chunk_ports) >= chunk_lines:
+            flush()
+    if chunk_ports:
+        flush()
+
+    def concat(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    result = {
+        "timestamp_us": concat(timestamps, np.int64),
+        "client_port": concat(ports, np.int32),
+        "malformed": malformed,
+        "malformed_samples": samples
+    }
+    for column in columns:
+        result[column] = (concat(codes[column], np.int32), categories[column])
+    return result
+
+def split_ranges(path: str, parts: int, size: int = None) -> List[tuple]:
+    """
+    تقسيم أول size بايت من الملف (كله افتراضياً) إلى parts مدى بايتات (start, end)
+    تبدأ كلها بعد سطر جديد
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        for i in range(1, parts):
+            newline = buffer.find(b"\n", max(bounds[-1], size * i // parts), size)
+            if newline < 0:
+                break
+            if newline + 1 < size:
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+def _iter_lines(buffer, start: int, end: int) -> Iterator[bytes]:
+    # نسخ سطر واحد في كل مرة بدلاً من نسخ المدى بأكمله
+    pos = start
+    while pos < end:
+        newline = buffer.find(b"\n", pos, end)
+        if newline < 0:
+            newline = end
+        yield buffer[pos:newline]
+        pos = newline + 1
+
+def read_jsonl_range(path: str, start: int, end: int) -> Dict[str, Any]:
+    """
+    read_jsonl_columns لمدى بايتات من الملف عبر mmap (تُنفَّذ في العمليات العاملة)
+    """
+    if end <= start:
+        columns = read_jsonl_columns(())  # mmap لا يقبل ملفاً فارغاً
+    else:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            columns = read_jsonl_columns(_iter_lines(buffer, start, end))
+    columns["range"] = (start, end)
+    return columns
+
+def merge_columns(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    دمج أعمدة عدة أجزاء بالترتيب: قواميس النصوص تُوحَّد وتُعاد ترقيم الأكواد بجدول تحويل
+    """
+    if len(parts) == 1:
+        return parts[0]
+    result = {
+        "timestamp_us": np.concatenate([part["timestamp_us"] for part in parts]),
+        "client_port": np.concatenate([part["client_port"] for part in parts]),
+        "malformed": sum(part["malformed"] for part in parts),
+        "malformed_samples": [sample for part in parts for sample in part["malformed_samples"]]
+    }
+    for column in STRING_COLUMNS:
+        ids: Dict[str, int] = {}
+        categories: List[str] = []
+        merged = []
+        for part in parts:
+            codes, part_categories = part[column]
+            lut = np.empty(len(part_categories) + 1, dtype=np.int32)
+            for i, value in enumerate(part_categories):
+                string_id = ids.get(value)
+                if string_id is None:
+                    string_id = ids[value] = len(categories)
+                    categories.append(value)
+                lut[i] = string_id
+            # الخانة الأخيرة تقابل -1 (None)
+            lut[-1] = -1
+            merged.append(lut[codes])
+        result[column] = (np.concatenate(merged), categories)
+    return result
+
+def last_line_end(path: str, size: int = None) -> int:
+    """
+    الموضع بعد آخر '\n' ضمن أول size بايت (0 إن لم يوجد سطر كامل)
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return buffer.rfind(b"\n", 0, size) + 1
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # غير متوفر على macOS و Windows
+        return os.cpu_count() or 1
+
+def read_jsonl_columns_parallel(path: str, workers: int, size: int = None) -> Dict[str, Any]:
+    """
+    قراءة ملف JSONL غير مضغوط على workers عملية: كل عملية تحلل مدى بايتات
+    منتهياً بسطر كامل عبر mmap، ثم تُدمج الأعمدة بالترتيب
+    size: قراءة أول size بايت فقط (الملف النشط ما زال يُكتب)
+
+    إضافة إلى أعمدة read_jsonl_columns تُعيد parts: (المدى، عدد الأسطر التالفة، العينات)
+    لكل عملية، لطباعة تحذير مُجمَّع لكل منها
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    ranges = split_ranges(path, workers, size)
+    if len(ranges) <= 1:
+        columns = read_jsonl_range(path, 0, size)
+        parts = [columns]
+    else:
+        with multiprocessing.get_context().Pool(len(ranges)) as pool:
+            parts = pool.starmap(read_jsonl_range, [(path, start, end) for start, end in ranges])
+        columns = merge_columns(parts)
+    columns["parts"] = [(part["range"], part["malformed"], part["malformed_samples"]) for part in parts]
+    return columns
+
+def jsonl_to_binary(src: str, dst: str) -> int:
+    """
+    تحويل ملف JSONL إلى الصيغة الثنائية، تُعيد عدد السجلات
+    """
+    encoder = BinaryEventEncoder()
+    count = 0
+    with open(src, 'r', encoding='utf-8') as fin, open(dst, 'wb') as fout:
+        fout.write(encoder.header())
+        batch = []
+        for line in fin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                batch.append(encoder.encode(json.loads(line)))
+            except (ValueError, TypeError):
+                print(f"[WARNING] خطأ في قراءة السطر: {line[:50]}...")
+                continue
+            if len(batch) >= 4096:
+                fout.write(encoder.frame(batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            fout.write(encoder.frame(batch))
+            count += len(batch)
+    return count
+
+def binary_to_jsonl(src: str, dst: str) -> int:
+    """
+    تحويل ملف ثنائي إلى JSONL، تُعيد عدد السجلات
+    """
+    encoder = JsonlEncoder()
+    count = 0
+    with open(src, 'rb') as fin:
+        data = fin.read()
+    with open(dst, 'wb') as fout:
+        for record in iter_records(data):
+            fout.write(encoder.encode(record))
+            count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="تحويل سجلات المصيدة بين JSONL والصيغة الثنائية")
+    parser.add_argument("direction", choices=["to-binary", "to-jsonl"])
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args(argv)
+
+    if args.direction == "to-binary":
+        count = jsonl_to_binary(args.src, args.dst)
+    else:
+        count = binary_to_jsonl(args.src, args.dst)
+    print(f"[SUCCESS] تم تحويل {count} سجل إلى: {args.dst}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+بث سجلات المصيدة لحظياً عبر UNIX socket محلي لعدة مشتركين (لوحات، المحلل...)
+
+كل إطار: الطول '<I' ثم السجل بصيغة JSON (نفس حقول سطر JSONL)
+المشترك البطيء لا يبطئ المصيدة: ما يتجاوز مخزنه (max_buffer) من الإطارات يُسقط له
+وحده، والإطارات لا تُقطع أبداً فيبقى البث قابلاً للتحليل
+"""
+
+import json
+import os
+import selectors
+import socket
+import struct
+import threading
+from typing import Dict, Any, Iterator, Optional
+
+FRAME_HEADER = struct.Struct('<I')
+
+def encode_frame(record: Dict[str, Any]) -> bytes:
+    payload = json.dumps(record, ensure_ascii=False).encode('utf-8')
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+class _Subscriber:
+
+    __slots__ = ("sock", "buffer", "sent", "dropped")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.sent = 0
+        self.dropped = 0
+
+class EventPublisher:
+    """
+    خادم البث: publish() يُستدعى من خيوط المعالجة (أو حلقة asyncio) ولا ينتظر الشبكة أبداً،
+    والإرسال الفعلي في خيط مستقل
+    """
+
+    def __init__(self, path: str, max_buffer: int = 1024 * 1024):
+        self.path = path
+        self.max_buffer = max_buffer
+        self.published = 0
+        self.dropped = 0
+        self._subscribers: Dict[int, _Subscriber] = {}
+        self._lock = threading.Lock()
+        self._selector = None
+        self._server = None
+        self._wakeup_r = self._wakeup_w = None
+        self._thread = None
+        self._running = False
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # ملف socket متبقٍ من تشغيل سابق توقف فجأة
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(16)
+        self._server.setblocking(False)
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="event-stream", daemon=True)
+        self._thread.start()
+        print(f"[EVENTS] البث المباشر على: {self.path}")
+
+    def publish(self, record: Dict[str, Any]):
+        if not self._subscribers:
+            return
+        frame = encode_frame(record)
+        wake = False
+        with self._lock:
+            self.published += 1
+            for subscriber in self._subscribers.values():
+                if len(subscriber.buffer) + len(frame) > self.max_buffer:
+                    subscriber.dropped += 1
+                    self.dropped += 1
+                    continue
+                if not subscriber.buffer:
+                    wake = True
+                subscriber.buffer += frame
+        if wake:
+            self._wakeup()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'dropped': self.dropped,
+                'buffered_bytes': sum(len(s.buffer) for s in self._subscribers.values())
+            }
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._running = False
+        self._wakeup()
+        self._thread.join()
+        self._thread = None
+        for subscriber in list(self._subscribers.values()):
+            self._remove(subscriber)
+        self._selector.close()
+        self._server.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # المخزن ممتلئ: خيط الإرسال مستيقظ أصلاً
+
+    def _accept(self):
+        try:
+            sock, _ = self._server.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        subscriber = _Subscriber(sock)
+        with self._lock:
+            self._subscribers[sock.fileno()] = subscriber
+        self._selector.register(sock, selectors.EVENT_READ, subscriber)
+
+    def _remove(self, subscriber: _Subscriber):
+        with self._lock:
+            self._subscribers.pop(subscriber.sock.fileno(), None)
+        try:
+            self._selector.unregister(subscriber.sock)
+        except (KeyError, ValueError):
+            pass
+        subscriber.sock.close()
+
+    def _flush(self, subscriber: _Subscriber) -> bool:
+        with self._lock:
+            if not subscriber.buffer:
+                return True
+            try:
+                sent = subscriber.sock.send(subscriber.buffer)
+            except BlockingIOError:
+                return True
+            except OSError:
+                return False
+            del subscriber.buffer[:sent]
+            subscriber.sent += sent
+            return True
+
+    def _run(self):
+        while self._running:
+            for key, events in self._selector.select(timeout=1.0):
+                if key.fileobj is self._server:
+                    self._accept()
+                elif key.fileobj is self._wakeup_r:
+                    try:
+                        while self._wakeup_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    subscriber = key.data
+                    if events & selectors.EVENT_READ:
+                        # المشترك لا يرسل شيئاً؛ القراءة هنا لاكتشاف الإغلاق فقط
+                        try:
+                            if not subscriber.sock.recv(4096):
+                                self._remove(subscriber)
+                                continue
+                        except BlockingIOError:
+                            pass
+                        except OSError:
+                            self._remove(subscriber)
+                            continue
+                    if events & selectors.EVENT_WRITE and not self._flush(subscriber):
+                        self._remove(subscriber)
+
+            # المشتركون الذين لديهم بيانات معلّقة فقط يُراقَبون للكتابة
+            for subscriber in list(self._subscribers.values()):
+                if subscriber.buffer and not self._flush(subscriber):
+                    self._remove(subscriber)
+                    continue
+                wanted = selectors.EVENT_READ | (selectors.EVENT_WRITE if subscriber.buffer else 0)
+                try:
+                    if self._selector.get_key(subscriber.sock).events != wanted:
+                        self._selector.modify(subscriber.sock, wanted, subscriber)
+                except (KeyError, ValueError):
+                    pass
+
+def subscribe(path: str, timeout: Optional[float] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    الاشتراك في البث: يُعيد السجلات بالترتيب حتى يُغلق الخادم الاتصال
+    مع timeout تُعاد None عند مرور timeout ثانية دون سجلات (لتحديث العرض مثلاً)
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    sock.settimeout(timeout)
+    buffer = bytearray()
+    try:
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                yield None
+                continue
+            if not chunk:
+                return
+            buffer += chunk
+            offset = 0
+            while len(buffer) - offset >= FRAME_HEADER.size:
+                (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+                end = offset + FRAME_HEADER.size + length
+                if end > len(buffer):
+                    break
+                yield json.loads(bytes(buffer[offset + FRAME_HEADER.size:end]).decode('utf-8'))
+                offset = end
+            del buffer[:offset]
+    finally:
+        sock.close()
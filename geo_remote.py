@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+تحديد الموقع عبر خدمة ip-api عندما لا تتوفر قاعدة النطاقات المحلية (geoip.py):
+    - ذاكرة مؤقتة دائمة في SQLite لكل عنوان، بمدة صلاحية وحد أقصى لعدد العناوين
+      (الأقدم استخداماً يُحذف أولاً)؛ التشغيل الثاني لنفس العناوين لا يرسل أي طلب
+    - العناوين غير الموجودة فيها تُرسل 100 في كل طلب POST /batch عبر جلسة requests واحدة
+      (اتصالات معاد استخدامها)، بعدد محدود من الطلبات المتزامنة
+    - المعدل يتكيف مع ترويسات الخدمة: X-Rl (الطلبات المتبقية في النافذة) و X-Ttl (ثوانٍ حتى بدايتها
+      من جديد)؛ عند النفاد أو الرد 429 تتوقف كل الطلبات حتى انتهاء النافذة
+
+الاستخدام:
+    python geo_remote.py lookup 8.8.8.8 1.1.1.1 [--cache geo_cache.sqlite] [--url http://ip-api.com]
+    python geo_remote.py stats [--cache geo_cache.sqlite]
+    python geo_remote.py clear [--cache geo_cache.sqlite]
+"""
+
+import argparse
+import datetime
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_URL = "http://ip-api.com"
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100000
+BATCH_SIZE = 100
+DEFAULT_WORKERS = 4
+# انتظار الرد 429 إن لم تُرسل الخدمة X-Ttl
+DEFAULT_BACKOFF = 60.0
+FIELDS = "status,message,country,city,regionName,isp,query"
+LOCATION_FIELDS = ('country', 'city', 'region', 'isp')
+# حد SQLite لعدد المعاملات في الاستعلام الواحد
+SQL_CHUNK = 900
+
+def unknown_location() -> Dict[str, str]:
+    return {field: 'Unknown' for field in LOCATION_FIELDS}
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _stamp(seconds: Optional[float]) -> Optional[str]:
+    return datetime.datetime.fromtimestamp(seconds).isoformat(timespec='seconds') if seconds else None
+
+class GeoCache:
+    """
+    موقع كل عنوان في جدول SQLite مع وقت جلبه (للصلاحية) ووقت آخر استخدام (للإخلاء)
+    """
+
+    def __init__(self, path: str = "geo_cache.sqlite", ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS locations (ip TEXT PRIMARY KEY, country TEXT, city TEXT, "
+                          "region TEXT, isp TEXT, fetched REAL NOT NULL, used REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS locations_used ON locations (used)")
+        self.conn.commit()
+
+    def get_many(self, ips: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        المواقع الصالحة (ضمن مدة الصلاحية) المحفوظة من ips؛ ما لا يوجد منها لا يظهر في النتيجة
+        """
+        now = time.time()
+        found = {}
+        for chunk in _chunks(ips, SQL_CHUNK):
+            rows = self.conn.execute(
+                f"SELECT ip, country, city, region, isp FROM locations "
+                f"WHERE fetched >= ? AND ip IN ({','.join('?' * len(chunk))})", [now - self.ttl] + chunk)
+            for ip, *values in rows:
+                found[ip] = dict(zip(LOCATION_FIELDS, values))
+        if found:
+            self.conn.executemany("UPDATE locations SET used = ? WHERE ip = ?", [(now, ip) for ip in found])
+            self.conn.commit()
+        return found
+
+    def put_many(self, locations: Dict[str, Dict[str, str]]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO locations VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(ip,) + tuple(location[field] for field in LOCATION_FIELDS) + (now, now)
+             for ip, location in locations.items()])
+        self.conn.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        حذف المنتهية صلاحيتها ثم الأقدم استخداماً حتى يصبح العدد ضمن max_entries
+        """
+        removed = self.conn.execute("DELETE FROM locations WHERE fetched < ?", (time.time() - self.ttl,)).rowcount
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            removed += self.conn.execute("DELETE FROM locations WHERE ip IN "
+                                         "(SELECT ip FROM locations ORDER BY used LIMIT ?)", (excess,)).rowcount
+        self.conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        removed = self.conn.execute("DELETE FROM locations").rowcount
+        self.conn.commit()
+        return removed
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM locations").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        oldest, newest = self.conn.execute("SELECT MIN(fetched), MAX(fetched) FROM locations").fetchone()
+        return {'path': self.path, 'entries': len(self), 'max_entries': self.max_entries,
+                'ttl_days': self.ttl / 86400, 'oldest': _stamp(oldest), 'newest': _stamp(newest)}
+
+    def close(self):
+        self.conn.close()
+
+class RateLimiter:
+    """
+    حصة الطلبات المشتركة بين العمليات المتزامنة حسب آخر ترويسات X-Rl/X-Ttl من الخدمة
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # المتبقي في النافذة الحالية (None = غير معروف بعد، أو انتهت النافذة)
+        self._remaining = None
+        self._reset_at = 0.0
+        self._in_flight = 0
+        # عدد الطلبات المرسلة (0 في التشغيل الذي تجد فيه كل العناوين في الذاكرة المؤقتة) ومجموع الانتظار
+        self.sent = 0
+        self.waited = 0.0
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self._remaining is not None and now >= self._reset_at:
+                    self._remaining = None
+                if self._remaining is None or self._remaining > 0:
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    self._in_flight += 1
+                    self.sent += 1
+                    return
+                delay = self._reset_at - now
+                self.waited += delay
+            time.sleep(delay)
+
+    def release(self, response: Optional[requests.Response]):
+        with self._lock:
+            self._in_flight -= 1
+            if response is None:
+                return
+            try:
+                remaining = int(response.headers['X-Rl'])
+                ttl = float(response.headers['X-Ttl'])
+            except (KeyError, ValueError):
+                if response.status_code != 429:
+                    return
+                remaining, ttl = 0, DEFAULT_BACKOFF
+            if response.status_code == 429:
+                remaining = 0
+            # الطلبات الجارية الآن قد لا تكون محسوبة بعد في X-Rl
+            self._remaining = max(0, remaining - self._in_flight)
+            self._reset_at = time.monotonic() + ttl
+
+class RemoteGeolocator:
+    """
+    مواقع قائمة عناوين: من الذاكرة المؤقتة أولاً، ثم دفعات متزامنة من الخدمة للباقي
+    """
+
+    def __init__(self, base_url: str = DEFAULT_URL, cache: GeoCache = None,
+                 workers: int = DEFAULT_WORKERS, timeout: float = 5, retries: int = 3):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.retries = retries
+        self.limiter = RateLimiter()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def locate(self, ips: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        موقع كل عنوان ({'country','city','region','isp'})؛ ما تعذر جلبه 'Unknown' ولا يُحفظ
+        """
+        ips = list(dict.fromkeys(str(ip) for ip in ips))
+        locations = self.cache.get_many(ips) if self.cache is not None else {}
+        missing = [ip for ip in ips if ip not in locations]
+        if missing:
+            fetched = {}
+            with ThreadPoolExecutor(max_workers=min(self.workers, -(-len(missing) // BATCH_SIZE))) as pool:
+                for batch in pool.map(self._fetch_batch, _chunks(missing, BATCH_SIZE)):
+                    fetched.update(batch)
+            if self.cache is not None and fetched:
+                self.cache.put_many(fetched)
+            if len(fetched) < len(missing):
+                print(f"[WARNING] تعذر تحديد موقع {len(missing) - len(fetched)} عنوان من {len(missing)}")
+            locations.update(fetched)
+        return {ip: locations.get(ip) or unknown_location() for ip in ips}
+
+    def _fetch_batch(self, ips: List[str]) -> Dict[str, Dict[str, str]]:
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.post(f"{self.base_url}/batch", params={'fields': FIELDS},
+                                             json=ips, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"[WARNING] فشل طلب المواقع ({len(ips)} عنوان، محاولة {attempt + 1}): {e}")
+            finally:
+                self.limiter.release(response)
+            if response is not None and response.status_code == 200:
+                return self._parse(response.json())
+            if response is not None and response.status_code != 429:
+                print(f"[WARNING] رد غير متوقع من خدمة المواقع: {response.status_code}")
+            if response is None or response.status_code != 429:
+                time.sleep(min(2 ** attempt, 10))
+        return {}
+
+    @staticmethod
+    def _parse(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+        locations = {}
+        for item in results:
+            if 'query' not in item:
+                continue
+            if item.get('status') == 'success':
+                locations[item['query']] = {
+                    'country': item.get('country') or 'Unknown',
+                    'city': item.get('city') or 'Unknown',
+                    'region': item.get('regionName') or 'Unknown',
+                    'isp': item.get('isp') or 'Unknown'
+                }
+            else:
+                # private range / reserved range: نتيجة نهائية تُحفظ أيضاً حتى لا تُطلب مجدداً
+                locations[item['query']] = unknown_location()
+        return locations
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="تحديد الموقع عبر الخدمة مع ذاكرة مؤقتة دائمة")
+    parser.add_argument("command", choices=["lookup", "stats", "clear"])
+    parser.add_argument("ips", nargs="*")
+    parser.add_argument("--cache", default="geo_cache.sqlite")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_intermixed_args(argv)
+
+    cache = GeoCache(args.cache)
+    if args.command == "stats":
+        for key, value in cache.stats().items():
+            print(f"{key}: {value}")
+    elif args.command == "clear":
+        print(f"[SUCCESS] تم حذف {cache.clear()} عنوان من {args.cache}")
+    else:
+        locator = RemoteGeolocator(args.url, cache, workers=args.workers)
+        for ip, location in locator.locate(args.ips).items():
+            print(f"{ip:<16} {location['country']:<20} {location['city']:<20} {location['isp']}")
+        print(f"[LOG] طلبات HTTP: {locator.limiter.sent}")
+        locator.close()
+        return
+    cache.close()
+
+if __name__ == "__main__":
+    main()
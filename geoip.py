@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+تحديد الموقع الجغرافي دون اتصال: قاعدة نطاقات IPv4 محلية في مصفوفات أعداد صحيحة مرتبة،
+وكل عناوين الإطار تُحل باستدعاء np.searchsorted واحد (لا طلبات شبكة ولا انتظار)
+
+صيغ الملف المدعومة (CSV أو TSV):
+    مع ترويسة: start,end (أو ip_start/ip_end، range_start/range_end، ip_from/ip_to) أو network (CIDR)،
+               ومن الأعمدة الاختيارية: country أو country_code، country_name، asn، as_org (أو org/isp)، city
+    دون ترويسة: 3 أعمدة  start,end,country            (DB-IP IP-to-Country Lite)
+                5 أعمدة  start end asn country as_org  (iptoasn.com ip2asn-v4.tsv)
+    العناوين بصيغة a.b.c.d أو أعداد صحيحة؛ نطاقات IPv6 تُتجاهل
+
+الاستخدام:
+    python geoip.py lookup --db geo_ranges.csv 8.8.8.8 1.1.1.1
+    python geoip.py stats --db geo_ranges.csv
+"""
+
+import argparse
+import ipaddress
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+START_COLUMNS = ('start', 'ip_start', 'range_start', 'ip_from', 'start_ip', 'first_ip')
+END_COLUMNS = ('end', 'ip_end', 'range_end', 'ip_to', 'end_ip', 'last_ip')
+ATTRIBUTE_COLUMNS = {
+    'country': ('country', 'country_code', 'country_iso_code', 'cc'),
+    'country_name': ('country_name',),
+    'asn': ('asn', 'as_number', 'autonomous_system_number'),
+    'as_org': ('as_org', 'as_description', 'org', 'isp', 'autonomous_system_organization'),
+    'city': ('city', 'city_name')
+}
+HEADERLESS_LAYOUTS = {
+    3: ('start', 'end', 'country'),
+    5: ('start', 'end', 'asn', 'country', 'as_org')
+}
+
+def _pack_octets(parts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    octets = np.array(parts, dtype=np.int64).reshape(-1, 4)
+    valid = ((octets >= 0) & (octets <= 255)).all(axis=1)
+    packed = (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+    return packed, valid
+
+def ipv4_to_uint32(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    تحويل نصوص a.b.c.d (أو أعداد صحيحة كنص) إلى uint32 دفعة واحدة
+    تُعيد (القيم، قناع الصالح منها)؛ غير الصالح (IPv6، نص فارغ...) قيمته 0
+    """
+    strings = [value if isinstance(value, str) else str(value) for value in values]
+    result = np.zeros(len(strings), dtype=np.uint32)
+    valid = np.zeros(len(strings), dtype=bool)
+
+    dotted = np.fromiter((value.count('.') == 3 for value in strings), dtype=bool, count=len(strings))
+    positions = np.flatnonzero(dotted)
+    if len(positions):
+        candidates = [strings[i] for i in positions]
+        try:
+            # كل العناوين في split واحد وتحويل numpy واحد بدلاً من ipaddress لكل عنوان
+            packed, ok = _pack_octets('.'.join(candidates).split('.'))
+        except ValueError:
+            # نص غير رقمي بين النقاط: فحص كل عنوان بتعبير نمطي ثم تحويل الصالح منها فقط
+            clean = pd.Series(candidates, dtype=object).str.fullmatch(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}').to_numpy()
+            positions = positions[clean]
+            packed, ok = _pack_octets('.'.join(candidates[i] for i in np.flatnonzero(clean)).split('.')
+                                      if clean.any() else [])
+        result[positions[ok]] = packed[ok]
+        valid[positions[ok]] = True
+
+    others = np.flatnonzero(~dotted)
+    if len(others):
+        series = pd.Series([strings[i] for i in others], dtype=object).str.strip()
+        numeric = series.str.fullmatch(r'\d{1,10}').to_numpy()
+        if numeric.any():
+            numbers = series[numeric].astype(np.int64).to_numpy()
+            ok = numbers <= 0xFFFFFFFF
+            positions = others[numeric]
+            result[positions[ok]] = numbers[ok]
+            valid[positions[ok]] = True
+    return result, valid
+
+def uint32_to_ipv4(value: int) -> str:
+    return str(ipaddress.IPv4Address(int(value)))
+
+class GeoDatabase:
+    """
+    نطاقات مرتبة غير متداخلة: starts/ends (uint32) وسمات كل نطاق
+    (الحقول النصية كأكواد في قوائم فئات كما في الأعمدة المحمَّلة من السجل)
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, attributes: Dict[str, Any], path: str = None):
+        self.starts = starts
+        self.ends = ends
+        # asn: مصفوفة أعداد (0 = غير معروف)؛ البقية: (أكواد int32، الفئات)
+        self.attributes = attributes
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def load(cls, path: str) -> "GeoDatabase":
+        sep = '\t' if path.endswith(('.tsv', '.tsv.gz')) else ','
+        raw = pd.read_csv(path, sep=sep, header=None, dtype=str, keep_default_na=False)
+        first = [str(value).strip().lower() for value in raw.iloc[0]] if len(raw) else []
+        if set(first) & set(START_COLUMNS + ('network',)):
+            raw.columns = first
+            raw = raw.iloc[1:]
+        elif raw.shape[1] in HEADERLESS_LAYOUTS:
+            raw.columns = HEADERLESS_LAYOUTS[raw.shape[1]]
+        else:
+            raise ValueError(f"صيغة غير معروفة لقاعدة المواقع {path} ({raw.shape[1]} أعمدة دون ترويسة)")
+
+        columns = set(raw.columns)
+        if 'network' in columns:
+            starts, ends, valid = cls._parse_networks(raw['network'])
+        else:
+            start_column = next((c for c in START_COLUMNS if c in columns), None)
+            end_column = next((c for c in END_COLUMNS if c in columns), None)
+            if start_column is None or end_column is None:
+                raise ValueError(f"لا توجد أعمدة بداية/نهاية النطاق في {path}")
+            starts, valid_starts = ipv4_to_uint32(raw[start_column].to_numpy())
+            ends, valid_ends = ipv4_to_uint32(raw[end_column].to_numpy())
+            valid = valid_starts & valid_ends & (starts <= ends)
+
+        order = np.flatnonzero(valid)
+        order = order[np.argsort(starts[order], kind='stable')]
+        attributes = {}
+        for name, aliases in ATTRIBUTE_COLUMNS.items():
+            column = next((alias for alias in aliases if alias in columns), None)
+            if column is None:
+                continue
+            values = raw[column].to_numpy()[order]
+            if name == 'asn':
+                asn = pd.Series(values).str.upper().str.replace('AS', '', regex=False)
+                attributes[name] = pd.to_numeric(asn, errors='coerce').fillna(0).astype(np.uint32).to_numpy()
+            else:
+                # '-' و'None' و'ZZ' تعني غير معروف في قواعد البيانات المجانية الشائعة
+                values = pd.Series(values).replace({'': None, '-': None, 'None': None, 'ZZ': None,
+                                                    'Not routed': None})
+                categorical = pd.Categorical(values)
+                attributes[name] = (categorical.codes.astype(np.int32), list(categorical.categories))
+        print(f"[SUCCESS] تم تحميل {len(order)} نطاق من {path}"
+              + (f" (تجاهل {len(valid) - len(order)} سطر غير IPv4)" if len(order) < len(valid) else ""))
+        return cls(starts[order], ends[order], attributes, path)
+
+    @staticmethod
+    def _parse_networks(networks: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        parts = networks.str.split('/', n=1, expand=True)
+        if parts.shape[1] < 2:
+            parts[1] = '32'
+        starts, valid = ipv4_to_uint32(parts[0].to_numpy())
+        prefix = pd.to_numeric(parts[1], errors='coerce').fillna(-1).astype(np.int64).to_numpy()
+        valid &= (prefix >= 0) & (prefix <= 32)
+        size = np.left_shift(np.int64(1), 32 - np.clip(prefix, 0, 32))
+        ends = (starts.astype(np.int64) + size - 1).clip(0, 0xFFFFFFFF).astype(np.uint32)
+        return starts, ends, valid
+
+    def lookup(self, ips: np.ndarray) -> np.ndarray:
+        """
+        رقم النطاق لكل عنوان uint32 (أو -1 إن لم يقع في أي نطاق)
+        """
+        index = np.searchsorted(self.starts, ips, side='right') - 1
+        found = index >= 0
+        found[found] &= ips[found] <= self.ends[index[found]]
+        return np.where(found, index, -1)
+
+    def resolve(self, ips, values: np.ndarray = None, valid: np.ndarray = None) -> pd.DataFrame:
+        """
+        جدول السمات لقائمة عناوين نصية (نفس الترتيب)، السمات غير المعروفة NaN/0
+        values/valid: العناوين محللة مسبقاً إلى uint32 (subnets.encode) فلا تُحلل النصوص مجدداً
+        """
+        if values is None:
+            values, valid = ipv4_to_uint32(ips)
+        index = np.where(valid, self.lookup(values), -1)
+        found = index >= 0
+        result = {'ip': ips, 'range': index}
+        for name, attribute in self.attributes.items():
+            if name == 'asn':
+                asn = np.zeros(len(index), dtype=np.uint32)
+                asn[found] = attribute[index[found]]
+                result[name] = asn
+            else:
+                codes, categories = attribute
+                mapped = np.full(len(index), -1, dtype=np.int32)
+                mapped[found] = codes[index[found]]
+                result[name] = pd.Categorical.from_codes(mapped, categories=categories)
+        return pd.DataFrame(result)
+
+    def stats(self) -> Dict[str, Any]:
+        covered = int((self.ends.astype(np.int64) - self.starts.astype(np.int64) + 1).sum())
+        return {
+            'path': self.path,
+            'ranges': len(self),
+            'covered_addresses': covered,
+            'attributes': list(self.attributes),
+            'countries': len(self.attributes['country'][1]) if 'country' in self.attributes else 0,
+            'asns': int(np.count_nonzero(np.unique(self.attributes['asn']))) if 'asn' in self.attributes else 0
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="تحديد الموقع الجغرافي دون اتصال")
+    parser.add_argument("command", choices=["lookup", "stats"])
+    parser.add_argument("ips", nargs="*")
+    parser.add_argument("--db", default="geo_ranges.csv", help="ملف نطاقات CSV/TSV")
+    args = parser.parse_intermixed_args(argv)
+
+    db = GeoDatabase.load(args.db)
+    if args.command == "stats":
+        for key, value in db.stats().items():
+            print(f"{key}: {value}")
+        return
+    table = db.resolve(args.ips)
+    print(table.drop(columns=['range']).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
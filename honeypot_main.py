@@ -7,45 +7,271 @@ Interactive Honeypot Data Analyzer
 الجزء الأول: مصيدة التسلل (Honeypot)
 """
 
+import argparse
+import asyncio
 import socket
 import threading
 import datetime
-import json
 import time
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from admission import AdmissionController, Tarpit, ADMIT, REJECT, TARPIT
+from command_engine import CommandEngine
+from event_stream import EventPublisher
+from log_writer import LogWriter, DURABILITY_MODES
+from metrics import HoneypotMetrics, MetricsServer
+from session_capture import CaptureWriter
+from session_reaper import SessionReaper
+from telnet_protocol import TelnetParser
+
+try:
+    import resource
+except ImportError:  # غير متوفر على Windows
+    resource = None
+
+class TelnetSession:
+    """
+    آلة حالات جلسة Telnet واحدة (مشتركة بين وضع الخيوط ووضع asyncio)
+    """
+    
+    max_login_attempts = 3
+    
+    # آلاف الجلسات الحية في سجل SessionReaper: بدون __dict__ لكل جلسة
+    __slots__ = ("honeypot", "client_ip", "client_port", "session_id", "username",
+                 "login_attempts", "logged_in", "cwd", "opened_at", "last_activity",
+                 "bytes_in", "commands", "close_reason", "capture_id")
+    
+    def __init__(self, honeypot: "TelnetHoneypot", client_ip: str, client_port: int):
+        self.honeypot = honeypot
+        self.client_ip = client_ip
+        self.client_port = client_port
+        self.session_id = f"session_{int(time.time())}_{client_port}"
+        self.username = None
+        self.login_attempts = 0
+        self.logged_in = False
+        # المجلد الحالي في نظام الملفات الوهمي (cd / pwd / ls)
+        self.cwd = honeypot.command_engine.home
+        # دورة الحياة والحدود (يحدّثها SessionReaper)
+        self.opened_at = self.last_activity = time.monotonic()
+        self.bytes_in = 0
+        self.commands = 0
+        self.close_reason = None
+        # رقم الجلسة في ملف الالتقاط (إن كان --capture مفعلاً)
+        self.capture_id = None
+    
+    def log(self, interaction_type: str, content: str, response: Optional[str] = None):
+        """
+        تسجيل تفاعل ضمن هذه الجلسة
+        """
+        data = {
+            "session_id": self.session_id,
+            "type": interaction_type,
+            "content": content
+        }
+        if response is not None:
+            data["response"] = response
+        self.honeypot.log_interaction(self.client_ip, self.client_port, data)
+    
+    def open(self):
+        self.log("connection_established", "New connection established")
+    
+    def close(self):
+        if self.close_reason:
+            self.log("connection_closed", f"Connection closed ({self.close_reason})")
+        else:
+            self.log("connection_closed", "Connection closed")
+    
+    def handle_input(self, data: str) -> Tuple[Optional[bytes], bool]:
+        """
+        معالجة سطر واحد من المهاجم
+        تُعيد (الرد المُرسل أو None، هل يجب إغلاق الاتصال)
+        """
+        encoded_responses = self.honeypot.encoded_responses
+        
+        # إذا لم يسجل الدخول بعد
+        if not self.logged_in:
+            if self.username is None:
+                # أول إدخال هو اسم المستخدم
+                self.username = data
+                self.log("username_attempt", self.username)
+                return b"Password: ", False
+            
+            # ثاني إدخال هو كلمة المرور
+            username = self.username
+            password = data
+            self.login_attempts += 1
+            
+            self.log("password_attempt", f"{username}:{password}")
+            
+            # محاكاة نجح الدخول أحياناً لجذب المهاجم
+            if self.login_attempts <= self.max_login_attempts and (
+                username.lower() in ['admin', 'root', 'user'] or 
+                password.lower() in ['123456', 'password', 'admin']
+            ):
+                self.logged_in = True
+                self.honeypot.metrics.observe_login(True)
+                response = encoded_responses["login_success"]
+                self.log("login_success", f"{username}:{password}", "Login successful")
+                return response, False
+            
+            self.honeypot.metrics.observe_login(False)
+            if self.login_attempts >= self.max_login_attempts:
+                return b"Too many login attempts. Connection closed.\r\n", True
+            
+            self.username = None  # إعادة تعيين لمحاولة جديدة
+            return encoded_responses["login_failed"], False
+        
+        # بعد تسجيل الدخول - محاكاة الأوامر
+        command = data.lower().strip()
+        
+        self.log("command_execution", command)
+        self.honeypot.metrics.observe_command(command)
+        
+        # الاستجابة من جداول محرك الأوامر (ردود مُرمَّزة مسبقاً)
+        return self.honeypot.command_engine.execute(self, command)
+    
+    def handle_lines(self, lines: List[str]) -> Tuple[bytes, bool]:
+        """
+        معالجة كل الأسطر الواصلة في دفعة واحدة (أوامر متتالية من البوتات)
+        تُعيد الردود مجمّعة لإرسالها مرة واحدة، وتتوقف عند أول أمر يغلق الاتصال
+        """
+        responses = []
+        for data in lines:
+            self.honeypot.console(f"[DATA] {self.client_ip}: {repr(data)}")
+            response, close = self.handle_input(data)
+            if response:
+                responses.append(response)
+            if close:
+                return b"".join(responses), True
+        return b"".join(responses), False
 
 class TelnetHoneypot:
     """
     مصيدة تسلل تحاكي خدمة Telnet لاصطياد المهاجمين
     """
     
-    def __init__(self, host: str = "0.0.0.0", port: int = 2323, log_file: str = "honeypot_logs.json"):
+    def __init__(self, host: str = "0.0.0.0", port: int = 2323, log_file: str = "honeypot_logs.json",
+                 backlog: int = 128, log_queue_size: int = 100000,
+                 durability: str = "none", fsync_interval: float = 1.0,
+                 rotate_bytes: Optional[int] = None, rotate_interval: Optional[int] = None,
+                 compression: str = "auto", log_format: str = "jsonl",
+                 reuse_port: bool = False, log_writer=None, connection_counter=None,
+                 admission: Optional[AdmissionController] = None,
+                 commands_file: Optional[str] = None, max_line: int = 4096,
+                 reaper: Optional[SessionReaper] = None, console: str = "all",
+                 console_sample: int = 100, metrics_port: Optional[int] = None,
+                 capture_file: Optional[str] = None, event_socket: Optional[str] = None):
         self.host = host
         self.port = port
+        self.backlog = backlog
         self.log_file = log_file
+        # SO_REUSEPORT: عدة عمليات تستمع على نفس المنفذ (انظر honeypot_workers)
+        self.reuse_port = reuse_port
+        # الحد الأقصى لطول سطر المدخلات قبل اقتطاعه (انظر TelnetParser)
+        self.max_line = max_line
+        # طباعة الأحداث على الطرفية: all / sampled (حدث من كل console_sample) / off
+        # رسائل الأخطاء والتحذيرات تُطبع دائماً
+        self.console_mode = console
+        self.console_sample = max(1, console_sample)
+        self._console_events = 0
+        # مقاييس Prometheus؛ الخادم HTTP يعمل فقط إذا حُدد metrics_port (على 127.0.0.1)
+        self.metrics = HoneypotMetrics()
+        self.metrics_port = metrics_port
+        self._metrics_server = None
+        # سجل الجلسات الحية: مهلات الخمول/تسجيل الدخول/المدة الكلية وحدود البايتات والأوامر
+        self.reaper = reaper or SessionReaper()
+        # التقاط البايتات الخام لكل جلسة مع توقيتها لإعادة تشغيلها (انظر session_replay.py)
+        self.capture = CaptureWriter(capture_file) if capture_file else None
+        # بث كل سجل لحظياً عبر UNIX socket للمشتركين (انظر event_stream و HoneypotAnalyzer.consume_stream)
+        self.publisher = EventPublisher(event_socket) if event_socket else None
+        # الكتابة على القرص تتم في خيط مستقل، المعالجات تضع السجلات في طابور فقط
+        # durability: none / interval / batch، التدوير حسب الحجم أو الوقت،
+        # وصيغة السجل jsonl أو binary (انظر LogWriter و event_format)
+        # يمكن تمرير log_writer بديل بنفس الواجهة (مثل موجّه السجلات في العمليات العاملة)
+        self.log_writer = log_writer or LogWriter(log_file, max_queue=log_queue_size,
+                                                  durability=durability, fsync_interval=fsync_interval,
+                                                  rotate_bytes=rotate_bytes, rotate_interval=rotate_interval,
+                                                  compression=compression, log_format=log_format)
+        if log_writer is None:
+            self.log_writer.flush_histogram = self.metrics.flush_latency
         self.is_running = False
-        self.connection_count = 0
+        # سبب فشل بدء الخادم (ربط المنفذ مثلاً)؛ العمليات العاملة تخرج برمز غير صفري عندها
+        self.start_error = None
+        # عدّاد مشترك بين العمليات (multiprocessing.Value) أو عدّاد محلي
+        self.connection_counter = connection_counter
+        self._local_connection_count = 0
         
         # رسائل المحاكاة
         self.fake_banner = "Ubuntu 18.04.3 LTS\r\nlogin: "
         self.fake_responses = {
             "login_success": "Last login: Mon Jan 20 10:30:45 2025 from 192.168.1.100\r\n$ ",
-            "login_failed": "Login incorrect\r\nlogin: ",
-            "command_not_found": "bash: {}: command not found\r\n$ ",
-            "fake_ls": "bin  boot  dev  etc  home  lib  media  mnt  opt  proc  root  run  sbin  srv  sys  tmp  usr  var\r\n$ ",
-            "fake_whoami": "root\r\n$ ",
-            "fake_pwd": "/root\r\n$ "
+            "login_failed": "Login incorrect\r\nlogin: "
         }
+        self.encoded_banner = self.fake_banner.encode('utf-8')
+        self.encoded_responses = {key: value.encode('utf-8') for key, value in self.fake_responses.items()}
+        # ردود الأوامر ونظام الملفات الوهمي (انظر command_engine و fake_commands.json)
+        self.command_engine = CommandEngine.load(commands_file)
+        
+        # طبقة القبول (حدود المعدل والحد الأقصى للجلسات) ومصيدة الإبطاء للاتصالات الزائدة
+        self.admission = admission
+        self.tarpit = None
+        self._async_tarpitted = 0
+        if admission is not None:
+            if admission.on_report is None:
+                admission.on_report = self._log_admission_report
+            if admission.tarpit:
+                self.tarpit = Tarpit(self.encoded_banner)
         
         # إنشاء ملف السجل إذا لم يكن موجوداً
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 pass
     
+    @property
+    def connection_count(self) -> int:
+        if self.connection_counter is not None:
+            return self.connection_counter.value
+        return self._local_connection_count
+    
+    def console(self, message: str):
+        """
+        طباعة حدث على الطرفية حسب وضع --console
+        """
+        if self.console_mode == "all":
+            print(message)
+        elif self.console_mode == "sampled":
+            # عدّاد تقريبي بين الخيوط، يكفي لأخذ العينات
+            self._console_events += 1
+            if self._console_events % self.console_sample == 0:
+                print(f"{message} (1/{self.console_sample})")
+    
+    def _start_metrics(self):
+        if self.metrics_port is None or self._metrics_server is not None:
+            return
+        try:
+            self._metrics_server = MetricsServer(lambda: self.metrics.render(self), self.metrics_port)
+            self._metrics_server.start()
+        except OSError as e:
+            self._metrics_server = None
+            print(f"[WARNING] تعذر تشغيل خادم المقاييس على المنفذ {self.metrics_port}: {e}")
+    
+    def _stop_metrics(self):
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+            self._metrics_server = None
+    
+    def _count_connection(self):
+        self.metrics.observe_accept()
+        if self.connection_counter is not None:
+            with self.connection_counter.get_lock():
+                self.connection_counter.value += 1
+        else:
+            self._local_connection_count += 1
+    
     def log_interaction(self, client_ip: str, client_port: int, data: Dict[str, Any]):
         """
-        تسجيل التفاعل مع المهاجم في ملف السجل
+        تسجيل التفاعل مع المهاجم (يُمرَّر إلى كاتب السجلات في الخلفية)
         """
         log_entry = {
             "timestamp": datetime.datetime.now().isoformat(),
@@ -57,127 +283,155 @@ class TelnetHoneypot:
             "response_sent": data.get("response", "")
         }
         
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-            print(f"[LOG] {client_ip}:{client_port} - {data.get('type', 'unknown')}")
-        except Exception as e:
-            print(f"[ERROR] فشل في تسجيل السجل: {e}")
+        if self.publisher is not None:
+            self.publisher.publish(log_entry)
+        
+        if self.log_writer.submit(log_entry):
+            self.console(f"[LOG] {client_ip}:{client_port} - {data.get('type', 'unknown')}")
+    
+    def _log_admission_report(self, client_ip: str, decision: str, reason: str, count: int):
+        """
+        سجل واحد مُجمَّع لكل (IP، قرار، سبب) بدلاً من سجل لكل اتصال مرفوض
+        """
+        self.log_interaction(client_ip, 0, {
+            "session_id": None,
+            "type": "connection_tarpitted" if decision == TARPIT else "connection_rejected",
+            "content": f"count={count} reason={reason}"
+        })
+    
+    def _admit(self, client_ip: str) -> str:
+        if self.admission is None:
+            return ADMIT
+        return self.admission.admit(client_ip)
+    
+    def _release(self):
+        if self.admission is not None:
+            self.admission.release()
     
     def handle_client(self, client_socket: socket.socket, client_address: tuple):
         """
-        التعامل مع اتصال المهاجم
+        التعامل مع اتصال المهاجم (وضع الخيوط: خيط لكل اتصال)
         """
         client_ip, client_port = client_address
-        session_id = f"session_{int(time.time())}_{client_port}"
+        session = TelnetSession(self, client_ip, client_port)
+        parser = TelnetParser(self.max_line)
+        # الحاصد يغلق المقبس من خيط الخادم فيعود recv بـ b"" وتنتهي الحلقة
+        self.reaper.register(session, lambda: client_socket.shutdown(socket.SHUT_RDWR))
+        
+        if self.capture is not None:
+            session.capture_id = self.capture.open_session(session)
         
-        print(f"[NEW CONNECTION] {client_ip}:{client_port}")
+        self.console(f"[NEW CONNECTION] {client_ip}:{client_port}")
         
         # تسجيل الاتصال الجديد
-        self.log_interaction(client_ip, client_port, {
-            "session_id": session_id,
-            "type": "connection_established",
-            "content": "New connection established"
-        })
+        session.open()
         
         try:
             # إرسال شعار مزيف
-            client_socket.send(self.fake_banner.encode('utf-8'))
-            
-            username = None
-            login_attempts = 0
-            max_login_attempts = 3
-            logged_in = False
+            client_socket.send(self.encoded_banner)
             
             while True:
                 try:
-                    # استقبال البيانات
-                    data = client_socket.recv(1024).decode('utf-8', errors='ignore').strip()
+                    # استقبال البيانات (قد تحتوي عدة أسطر أو جزءاً من سطر)
+                    chunk = client_socket.recv(4096)
                     
-                    if not data:
+                    if self.capture is not None and chunk:
+                        self.capture.data(session, chunk)
+                    
+                    if not chunk:
+                        # السطر الأخير غير المنتهي قبل الإغلاق يُسجَّل دون رد
+                        session.handle_lines(parser.close())
                         break
                     
-                    print(f"[DATA] {client_ip}: {repr(data)}")
+                    started = time.monotonic()
+                    lines, reply = parser.feed(chunk)
+                    reason = self.reaper.touch(session, len(chunk), len(lines))
+                    if reason:
+                        self.reaper.close(session, reason)
+                        break
+                    response, close = session.handle_lines(lines)
+                    if reply or response:
+                        client_socket.sendall(reply + response)
+                    self.metrics.handler_latency.observe(time.monotonic() - started)
+                    if close:
+                        break
+                
+                except Exception as e:
+                    print(f"[ERROR] خطأ في التعامل مع البيانات: {e}")
+                    break
+        
+        except Exception as e:
+            print(f"[ERROR] خطأ في التعامل مع العميل: {e}")
+        
+        finally:
+            # تسجيل انتهاء الجلسة
+            self.reaper.unregister(session)
+            session.close()
+            if self.capture is not None:
+                self.capture.close_session(session)
+            
+            client_socket.close()
+            self._release()
+            self.console(f"[DISCONNECTED] {client_ip}:{client_port}")
+    
+    async def handle_client_async(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        التعامل مع اتصال المهاجم (وضع asyncio: coroutine لكل اتصال بدلاً من خيط)
+        """
+        client_ip, client_port = writer.get_extra_info('peername')[:2]
+        self._count_connection()
+        
+        decision = self._admit(client_ip)
+        if decision == TARPIT:
+            await self._tarpit_async(writer)
+            return
+        if decision == REJECT:
+            writer.close()
+            return
+        
+        session = TelnetSession(self, client_ip, client_port)
+        parser = TelnetParser(self.max_line)
+        # abort يُنهي read() المعلّق (الحاصد يعمل داخل حلقة الأحداث نفسها)
+        self.reaper.register(session, writer.transport.abort)
+        
+        if self.capture is not None:
+            session.capture_id = self.capture.open_session(session)
+        
+        self.console(f"[NEW CONNECTION] {client_ip}:{client_port}")
+        
+        # تسجيل الاتصال الجديد
+        session.open()
+        
+        try:
+            writer.write(self.encoded_banner)
+            await writer.drain()
+            
+            while True:
+                try:
+                    # لا timeout هنا: مهلات الخمول وتسجيل الدخول يفرضها SessionReaper
+                    chunk = await reader.read(4096)
+                    
+                    if self.capture is not None and chunk:
+                        self.capture.data(session, chunk)
                     
-                    # إذا لم يسجل الدخول بعد
-                    if not logged_in:
-                        if username is None:
-                            # أول إدخال هو اسم المستخدم
-                            username = data
-                            self.log_interaction(client_ip, client_port, {
-                                "session_id": session_id,
-                                "type": "username_attempt",
-                                "content": username
-                            })
-                            client_socket.send(b"Password: ")
-                        else:
-                            # ثاني إدخال هو كلمة المرور
-                            password = data
-                            login_attempts += 1
-                            
-                            self.log_interaction(client_ip, client_port, {
-                                "session_id": session_id,
-                                "type": "password_attempt",
-                                "content": f"{username}:{password}"
-                            })
-                            
-                            # محاكاة نجح الدخول أحياناً لجذب المهاجم
-                            if login_attempts <= max_login_attempts and (
-                                username.lower() in ['admin', 'root', 'user'] or 
-                                password.lower() in ['123456', 'password', 'admin']
-                            ):
-                                logged_in = True
-                                response = self.fake_responses["login_success"]
-                                client_socket.send(response.encode('utf-8'))
-                                
-                                self.log_interaction(client_ip, client_port, {
-                                    "session_id": session_id,
-                                    "type": "login_success",
-                                    "content": f"{username}:{password}",
-                                    "response": "Login successful"
-                                })
-                            else:
-                                if login_attempts >= max_login_attempts:
-                                    client_socket.send(b"Too many login attempts. Connection closed.\r\n")
-                                    break
-                                else:
-                                    response = self.fake_responses["login_failed"]
-                                    client_socket.send(response.encode('utf-8'))
-                                    username = None  # إعادة تعيين لمحاولة جديدة
+                    if not chunk:
+                        session.handle_lines(parser.close())
+                        break
                     
-                    else:
-                        # بعد تسجيل الدخول - محاكاة الأوامر
-                        command = data.lower().strip()
-                        
-                        self.log_interaction(client_ip, client_port, {
-                            "session_id": session_id,
-                            "type": "command_execution",
-                            "content": command
-                        })
-                        
-                        # الاستجابة للأوامر الشائعة
-                        if command == "ls" or command == "ls -la":
-                            response = self.fake_responses["fake_ls"]
-                        elif command == "whoami":
-                            response = self.fake_responses["fake_whoami"]
-                        elif command == "pwd":
-                            response = self.fake_responses["fake_pwd"]
-                        elif command in ["exit", "quit", "logout"]:
-                            client_socket.send(b"Goodbye!\r\n")
-                            break
-                        elif command.startswith("cat ") or command.startswith("vi ") or command.startswith("nano "):
-                            response = f"bash: {command.split()[0]}: Permission denied\r\n$ "
-                        elif command == "ps" or command == "ps aux":
-                            response = "  PID TTY          TIME CMD\r\n 1234 pts/0    00:00:01 bash\r\n$ "
-                        elif command.startswith("wget ") or command.startswith("curl "):
-                            response = f"bash: {command.split()[0]}: command not found\r\n$ "
-                        else:
-                            response = self.fake_responses["command_not_found"].format(command.split()[0] if command else "")
-                        
-                        client_socket.send(response.encode('utf-8'))
+                    started = time.monotonic()
+                    lines, reply = parser.feed(chunk)
+                    reason = self.reaper.touch(session, len(chunk), len(lines))
+                    if reason:
+                        self.reaper.close(session, reason)
+                        break
+                    response, close = session.handle_lines(lines)
+                    if reply or response:
+                        writer.write(reply + response)
+                        await writer.drain()
+                    self.metrics.handler_latency.observe(time.monotonic() - started)
+                    if close:
+                        break
                 
-                except socket.timeout:
-                    continue
                 except Exception as e:
                     print(f"[ERROR] خطأ في التعامل مع البيانات: {e}")
                     break
@@ -187,14 +441,35 @@ class TelnetHoneypot:
         
         finally:
             # تسجيل انتهاء الجلسة
-            self.log_interaction(client_ip, client_port, {
-                "session_id": session_id,
-                "type": "connection_closed",
-                "content": "Connection closed"
-            })
+            self.reaper.unregister(session)
+            session.close()
+            if self.capture is not None:
+                self.capture.close_session(session)
             
-            client_socket.close()
-            print(f"[DISCONNECTED] {client_ip}:{client_port}")
+            writer.close()
+            self._release()
+            self.console(f"[DISCONNECTED] {client_ip}:{client_port}")
+    
+    async def _tarpit_async(self, writer: asyncio.StreamWriter):
+        """
+        مصيدة الإبطاء في وضع asyncio: بايت واحد من الشعار كل فترة دون أي معالجة للمدخلات
+        """
+        if self._async_tarpitted >= self.tarpit.max_connections:
+            writer.close()
+            return
+        self._async_tarpitted += 1
+        banner = self.encoded_banner
+        try:
+            for position in range(int(self.tarpit.hold_time / self.tarpit.drip_interval)):
+                await asyncio.sleep(self.tarpit.drip_interval)
+                position %= len(banner)
+                writer.write(banner[position:position + 1])
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            self._async_tarpitted -= 1
+            writer.close()
     
     def start(self):
         """
@@ -203,9 +478,17 @@ class TelnetHoneypot:
         try:
             server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             server_socket.bind((self.host, self.port))
-            server_socket.listen(5)
+            server_socket.listen(self.backlog)
+            # مهلة قصيرة لـ accept حتى تُنفَّذ المهام الدورية (تقارير القبول) دون اتصالات جديدة
+            server_socket.settimeout(1.0)
             
+            self.log_writer.start()
+            if self.publisher is not None:
+                self.publisher.start()
+            self._start_metrics()
             self.is_running = True
             print(f"[HONEYPOT STARTED] يستمع على {self.host}:{self.port}")
             print(f"[LOG FILE] السجلات تُحفظ في: {self.log_file}")
@@ -213,8 +496,21 @@ class TelnetHoneypot:
             
             while self.is_running:
                 try:
+                    # مهلات الجلسات (يعمل فعلياً مرة كل ثانية على الأكثر)
+                    self.reaper.tick()
                     client_socket, client_address = server_socket.accept()
-                    client_socket.settimeout(300)  # 5 دقائق timeout
+                    self._count_connection()
+                    
+                    decision = self._admit(client_address[0])
+                    if decision == TARPIT:
+                        self.tarpit.add(client_socket)
+                        continue
+                    if decision == REJECT:
+                        client_socket.close()
+                        continue
+                    
+                    # بدون timeout على المقبس: الحاصد يغلق الجلسات الخاملة أو الطويلة
+                    client_socket.settimeout(None)
                     
                     # إنشاء thread منفصل لكل اتصال
                     client_thread = threading.Thread(
@@ -224,35 +520,234 @@ class TelnetHoneypot:
                     client_thread.daemon = True
                     client_thread.start()
                     
-                    self.connection_count += 1
-                    
+                except socket.timeout:
+                    if self.admission is not None:
+                        self.admission.maybe_report()
                 except KeyboardInterrupt:
                     break
                 except Exception as e:
                     print(f"[ERROR] خطأ في قبول الاتصال: {e}")
         
         except Exception as e:
+            self.start_error = e
             print(f"[ERROR] فشل في بدء تشغيل المصيدة: {e}")
         
         finally:
             self.is_running = False
             server_socket.close()
+            self._shutdown_admission()
+            self._stop_metrics()
+            if self.publisher is not None:
+                self.publisher.close()
+            self.log_writer.close()
+            if self.capture is not None:
+                self.capture.close()
             print("[HONEYPOT STOPPED] تم إيقاف مصيدة التسلل")
 
-def main():
+    def start_async(self):
+        """
+        بدء تشغيل مصيدة التسلل بوضع asyncio (حلقة أحداث واحدة لكل الجلسات)
+        """
+        raise_open_files_limit()
+        try:
+            asyncio.run(self._serve_async())
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            self.start_error = e
+            print(f"[ERROR] فشل في بدء تشغيل المصيدة: {e}")
+        finally:
+            self.is_running = False
+            self._shutdown_admission()
+            self._stop_metrics()
+            if self.publisher is not None:
+                self.publisher.close()
+            self.log_writer.close()
+            if self.capture is not None:
+                self.capture.close()
+            print("[HONEYPOT STOPPED] تم إيقاف مصيدة التسلل")
+    
+    def _shutdown_admission(self):
+        if self.tarpit is not None:
+            self.tarpit.stop()
+        if self.admission is not None:
+            self.admission.flush_report()
+    
+    async def _maintenance_async(self):
+        # المهام الدورية في وضع asyncio
+        while True:
+            await asyncio.sleep(1.0)
+            self.reaper.tick()
+            if self.admission is not None:
+                self.admission.maybe_report()
+    
+    async def _serve_async(self):
+        # limit صغير يحدّ من ذاكرة المخزن المؤقت لكل اتصال
+        server = await asyncio.start_server(
+            self.handle_client_async, self.host, self.port,
+            backlog=self.backlog, limit=4096, reuse_port=self.reuse_port or None
+        )
+        
+        self.log_writer.start()
+        if self.publisher is not None:
+            self.publisher.start()
+        self._start_metrics()
+        self.is_running = True
+        print(f"[HONEYPOT STARTED] يستمع على {self.host}:{self.port} (asyncio)")
+        print(f"[LOG FILE] السجلات تُحفظ في: {self.log_file}")
+        print("[INFO] للإيقاف اضغط Ctrl+C")
+        
+        maintenance = asyncio.create_task(self._maintenance_async())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            maintenance.cancel()
+
+def raise_open_files_limit():
+    """
+    رفع الحد الأدنى لعدد الملفات المفتوحة إلى الحد الأقصى المسموح
+    (كل جلسة تستهلك واصف ملف واحد)
+    """
+    if resource is None:
+        return
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = hard if hard != resource.RLIM_INFINITY else 1048576
+        if soft != resource.RLIM_INFINITY and soft < target:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    except (ValueError, OSError) as e:
+        print(f"[WARNING] تعذر رفع حد الملفات المفتوحة: {e}")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    قراءة خيارات سطر الأوامر
+    """
+    parser = argparse.ArgumentParser(description="Interactive Telnet Honeypot")
+    parser.add_argument("--mode", choices=["threaded", "asyncio"], default="threaded",
+                        help="وضع الخادم: خيط لكل اتصال أو حلقة أحداث asyncio")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--log-file", default=None,
+                        help="ملف السجل (الافتراضي honeypot_logs.json أو honeypot_logs.hpev للصيغة الثنائية)")
+    parser.add_argument("--log-format", choices=["jsonl", "binary"], default="jsonl",
+                        help="صيغة ملف السجل؛ للتحويل بين الصيغتين استخدم event_format.py")
+    parser.add_argument("--backlog", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="عدد العمليات العاملة على نفس المنفذ عبر SO_REUSEPORT (0 = عملية واحدة)")
+    admission = parser.add_argument_group("التحكم في القبول")
+    admission.add_argument("--admission", action="store_true",
+                           help="تفعيل حدود المعدل لكل IP ولكل /24 والحد الأقصى للجلسات")
+    admission.add_argument("--ip-rate", type=float, default=1.0, help="اتصالات/ثانية لكل IP")
+    admission.add_argument("--ip-burst", type=float, default=10.0)
+    admission.add_argument("--subnet-rate", type=float, default=5.0, help="اتصالات/ثانية لكل شبكة /24")
+    admission.add_argument("--subnet-burst", type=float, default=50.0)
+    admission.add_argument("--max-sessions", type=int, default=10000, help="الحد الأقصى للجلسات المتزامنة")
+    admission.add_argument("--tarpit", action="store_true",
+                           help="إبقاء الاتصالات الزائدة مفتوحة ببطء بدلاً من إغلاقها")
+    parser.add_argument("--console", choices=["all", "sampled", "off"], default="all",
+                        help="طباعة كل حدث، عينة منها، أو لا شيء (الأخطاء تُطبع دائماً)")
+    parser.add_argument("--console-sample", type=int, default=100,
+                        help="في وضع sampled: طباعة حدث واحد من كل N")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="تشغيل مقاييس Prometheus على http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--max-line", type=int, default=4096,
+                        help="الحد الأقصى لطول سطر المدخلات بالبايت (الأطول يُقتطع)")
+    parser.add_argument("--capture", default=None, metavar="FILE",
+                        help="التقاط البايتات الخام لكل جلسة مع توقيتها (لإعادة التشغيل عبر session_replay.py)")
+    parser.add_argument("--event-socket", default=None, metavar="PATH",
+                        help="بث السجلات لحظياً عبر UNIX socket (للمحلل في وضع البث المباشر)")
+    parser.add_argument("--commands-file", default=None,
+                        help="ملف JSON لجداول الأوامر ونظام الملفات الوهمي (الافتراضي fake_commands.json)")
+    sessions = parser.add_argument_group("حدود الجلسات")
+    sessions.add_argument("--idle-timeout", type=float, default=300.0,
+                          help="إغلاق الجلسة بعد هذا العدد من الثواني بدون مدخلات")
+    sessions.add_argument("--login-timeout", type=float, default=60.0,
+                          help="المهلة القصوى لإتمام تسجيل الدخول")
+    sessions.add_argument("--session-timeout", type=float, default=3600.0,
+                          help="المدة القصوى للجلسة مهما كان نشاطها")
+    sessions.add_argument("--max-session-bytes", type=int, default=1024 * 1024,
+                          help="الحد الأقصى للبايتات المستقبلة في جلسة واحدة")
+    sessions.add_argument("--max-commands", type=int, default=1000,
+                          help="الحد الأقصى لعدد الأسطر في جلسة واحدة")
+    parser.add_argument("--log-queue-size", type=int, default=100000,
+                        help="الحد الأقصى لطابور السجلات قبل إسقاط السجلات")
+    parser.add_argument("--durability", choices=DURABILITY_MODES, default="none",
+                        help="متى تُثبَّت السجلات على القرص: بدون fsync، دورياً، أو لكل دفعة")
+    parser.add_argument("--fsync-interval", type=float, default=1.0,
+                        help="الفترة بالثواني بين عمليات fsync في وضع interval")
+    parser.add_argument("--rotate-size", type=int, default=None, metavar="MB",
+                        help="تدوير ملف السجل عند تجاوز هذا الحجم بالميغابايت")
+    parser.add_argument("--rotate-hourly", action="store_true",
+                        help="تدوير ملف السجل كل ساعة")
+    parser.add_argument("--compression", choices=["auto", "gzip", "zstd", "none"], default="auto",
+                        help="ضغط المقاطع المغلقة (auto = zstd إن توفرت وإلا gzip)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     الدالة الرئيسية لتشغيل مصيدة التسلل
     """
+    args = parse_args(argv)
+    
     print("=" * 60)
     print("🍯 مصيدة التسلل التفاعلية - Interactive Honeypot")
     print("=" * 60)
     print()
     
     # إنشاء مصيدة التسلل على المنفذ 2323 (بدلاً من 23 لتجنب الحاجة لصلاحيات root)
-    honeypot = TelnetHoneypot(host="0.0.0.0", port=2323)
+    admission_kwargs = None
+    if args.admission:
+        admission_kwargs = {
+            "ip_rate": args.ip_rate,
+            "ip_burst": args.ip_burst,
+            "subnet_rate": args.subnet_rate,
+            "subnet_burst": args.subnet_burst,
+            "max_sessions": args.max_sessions,
+            "tarpit": args.tarpit
+        }
+    
+    reaper_kwargs = {
+        "idle_timeout": args.idle_timeout,
+        "login_timeout": args.login_timeout,
+        "session_timeout": args.session_timeout,
+        "max_bytes": args.max_session_bytes,
+        "max_commands": args.max_commands
+    }
+    
+    log_file = args.log_file or ("honeypot_logs.hpev" if args.log_format == "binary" else "honeypot_logs.json")
+    honeypot = TelnetHoneypot(host="0.0.0.0", port=args.port, log_file=log_file, backlog=args.backlog,
+                              log_queue_size=args.log_queue_size,
+                              durability=args.durability, fsync_interval=args.fsync_interval,
+                              rotate_bytes=args.rotate_size * 1024 * 1024 if args.rotate_size else None,
+                              rotate_interval=3600 if args.rotate_hourly else None,
+                              compression=args.compression, log_format=args.log_format,
+                              commands_file=args.commands_file, max_line=args.max_line,
+                              reaper=SessionReaper(**reaper_kwargs),
+                              console=args.console, console_sample=args.console_sample,
+                              metrics_port=args.metrics_port,
+                              # مع --workers تلتقط كل عملية عاملة في ملفها الخاص
+                              capture_file=args.capture if args.workers == 0 else None,
+                              event_socket=args.event_socket if args.workers == 0 else None,
+                              admission=AdmissionController(**admission_kwargs) if admission_kwargs else None)
     
     try:
-        honeypot.start()
+        if args.workers > 0:
+            from honeypot_workers import HoneypotSupervisor
+            supervisor = HoneypotSupervisor(args.workers, honeypot.log_writer, mode=args.mode,
+                                            host=honeypot.host, port=honeypot.port,
+                                            log_file=log_file, backlog=args.backlog,
+                                            commands_file=args.commands_file, max_line=args.max_line,
+                                            admission_kwargs=admission_kwargs,
+                                            reaper_kwargs=reaper_kwargs,
+                                            console=args.console, console_sample=args.console_sample,
+                                            metrics_port=args.metrics_port,
+                                            capture_file=args.capture,
+                                            event_socket=args.event_socket)
+            supervisor.start()
+        elif args.mode == "asyncio":
+            honeypot.start_async()
+        else:
+            honeypot.start()
     except KeyboardInterrupt:
         print("\n[INFO] تم إيقاف المصيدة بواسطة المستخدم")
     except Exception as e:
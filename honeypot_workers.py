@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+وضع العمليات المتعددة: N عملية عاملة تستمع على نفس المنفذ عبر SO_REUSEPORT
+ونواة النظام توزّع الاتصالات بينها، بينما تبقى الكتابة على القرص في عملية المشرف وحدها.
+"""
+
+import multiprocessing
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from admission import AdmissionController
+from event_stream import EventPublisher
+from honeypot_main import TelnetHoneypot, raise_open_files_limit
+from log_writer import LogWriter
+from metrics import HoneypotMetrics, MetricsServer
+from session_reaper import SessionReaper
+
+# علامة إيقاف خيط التوجيه
+_STOP = object()
+
+# حد إعادة تشغيل كل عملية عاملة: 5 مرات كحد أقصى في الدقيقة
+RESTART_LIMIT = 5
+RESTART_WINDOW = 60.0
+
+def _terminate(signum, frame):
+    # SIGTERM يُعامل كـ Ctrl+C ليتم الإيقاف المنظم وتفريغ السجلات المتبقية
+    raise KeyboardInterrupt
+
+class QueueLogForwarder:
+    """
+    بديل LogWriter داخل العمليات العاملة: يجمع السجلات في دفعات ويرسلها
+    إلى عملية المشرف عبر multiprocessing.Queue (واجهة start/submit/close/stats نفسها)
+    """
+
+    def __init__(self, events: multiprocessing.Queue, max_queue: int = 100000,
+                 batch_size: int = 512, flush_interval: float = 0.1):
+        self.events = events
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.forwarded = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_backpressure_report = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-forwarder", daemon=True)
+            self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                now = time.monotonic()
+                if now - self._last_backpressure_report < 5.0:
+                    return False
+                self._last_backpressure_report = now
+            print(f"[WARNING] طابور السجلات ممتلئ: العمق={self.queue_depth} "
+                  f"السجلات المُسقطة={self.dropped}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue': self.max_queue,
+            'dropped': self.dropped,
+            'forwarded': self.forwarded
+        }
+
+    def close(self):
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self.queue.put(_STOP)
+        thread.join()
+        with self._lock:
+            self._thread = None
+
+    def _run(self):
+        batch = []
+        deadline = 0.0
+        stopping = False
+        while not stopping:
+            timeout = self.flush_interval if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                # put قد ينتظر إذا كان المشرف متأخراً؛ الطابور المحلي يمتص ذلك ثم يُسقط
+                self.events.put(batch)
+                self.forwarded += len(batch)
+                batch = []
+
+def _worker_main(index: int, mode: str, honeypot_kwargs: Dict[str, Any],
+                 events: multiprocessing.Queue, connection_counter,
+                 admission_kwargs: Optional[Dict[str, Any]],
+                 reaper_kwargs: Optional[Dict[str, Any]] = None):
+    """
+    نقطة دخول العملية العاملة
+    """
+    # SIGTERM من المشرف
+    signal.signal(signal.SIGTERM, _terminate)
+
+    forwarder = QueueLogForwarder(events)
+    # حدود القبول لكل عملية على حدة (النواة توزع اتصالات نفس IP على عدة عمليات)
+    admission = AdmissionController(**admission_kwargs) if admission_kwargs else None
+    reaper = SessionReaper(**reaper_kwargs) if reaper_kwargs else None
+    honeypot_kwargs = dict(honeypot_kwargs)
+    # مقاييس الجلسات لكل عملية على منفذ مستقل: metrics_port + 1 + index
+    if honeypot_kwargs.get("metrics_port") is not None:
+        honeypot_kwargs["metrics_port"] += 1 + index
+    # ملف التقاط مستقل لكل عملية: capture.w0 و capture.w1 ...
+    if honeypot_kwargs.get("capture_file"):
+        honeypot_kwargs["capture_file"] += f".w{index}"
+    honeypot = TelnetHoneypot(reuse_port=True, log_writer=forwarder,
+                              connection_counter=connection_counter, admission=admission,
+                              reaper=reaper, **honeypot_kwargs)
+    print(f"[WORKER {index}] بدء العملية العاملة")
+    try:
+        if mode == "asyncio":
+            honeypot.start_async()
+        else:
+            honeypot.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        forwarder.close()
+    # المشرف يعيد تشغيل العمليات التي تخرج برمز غير صفري فقط
+    if honeypot.start_error is not None:
+        sys.exit(1)
+
+class HoneypotSupervisor:
+    """
+    مشرف العمليات العاملة: يشغّلها، يعيد تشغيل ما يتوقف منها بشكل مفاجئ (رمز خروج غير صفري)،
+    ويكتب سجلات جميع العمليات عبر LogWriter واحد
+    """
+
+    def __init__(self, workers: int, log_writer: LogWriter, mode: str = "threaded",
+                 host: str = "0.0.0.0", port: int = 2323, log_file: str = "honeypot_logs.json",
+                 backlog: int = 128, events_queue_size: int = 1024,
+                 commands_file: Optional[str] = None, max_line: int = 4096,
+                 admission_kwargs: Optional[Dict[str, Any]] = None,
+                 reaper_kwargs: Optional[Dict[str, Any]] = None,
+                 console: str = "all", console_sample: int = 100,
+                 metrics_port: Optional[int] = None, capture_file: Optional[str] = None,
+                 event_socket: Optional[str] = None):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("SO_REUSEPORT غير مدعوم على هذا النظام")
+
+        self.workers = workers
+        self.mode = mode
+        self.log_writer = log_writer
+        self.honeypot_kwargs = {
+            "host": host,
+            "port": port,
+            "log_file": log_file,
+            "backlog": backlog,
+            "commands_file": commands_file,
+            "max_line": max_line,
+            "console": console,
+            "console_sample": console_sample,
+            "metrics_port": metrics_port,
+            "capture_file": capture_file
+        }
+        self.admission_kwargs = admission_kwargs
+        self.reaper_kwargs = reaper_kwargs
+        self.host = host
+        self.port = port
+        self.log_file = log_file
+
+        self._context = multiprocessing.get_context()
+        self.events = self._context.Queue(maxsize=events_queue_size)
+        self.connection_counter = self._context.Value('Q', 0)
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * workers
+        self.restarts = 0
+        self.is_running = False
+        # أوقات إعادة التشغيل الأخيرة لكل عملية عاملة
+        self._restart_times: Dict[int, List[float]] = {}
+        self._drain_thread = None
+
+        # المشرف يعرض مقاييس كاتب السجلات وإجمالي الاتصالات على metrics_port نفسه
+        self.metrics = HoneypotMetrics()
+        self.metrics_port = metrics_port
+        self._metrics_server = None
+        self.log_writer.flush_histogram = self.metrics.flush_latency
+        # البث المباشر من المشرف: socket واحد لسجلات جميع العمليات
+        self.publisher = EventPublisher(event_socket) if event_socket else None
+
+    @property
+    def connection_count(self) -> int:
+        """
+        إجمالي الاتصالات عبر جميع العمليات العاملة
+        """
+        return self.connection_counter.value
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self.mode, self.honeypot_kwargs, self.events, self.connection_counter,
+                  self.admission_kwargs, self.reaper_kwargs),
+            name=f"honeypot-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self.processes[index] = process
+
+    def _drain(self):
+        # نقل دفعات السجلات من العمليات العاملة إلى كاتب السجلات الوحيد
+        while True:
+            batch = self.events.get()
+            if batch is None:
+                break
+            for record in batch:
+                if self.publisher is not None:
+                    self.publisher.publish(record)
+                self.log_writer.submit(record)
+
+    def _restart_allowed(self, index: int) -> bool:
+        # تجنب حلقة إعادة تشغيل سريعة لكل عملية على حدة؛ ما يتجاوز الحد يُؤجَّل لا يُترك
+        now = time.monotonic()
+        times = [t for t in self._restart_times.get(index, []) if now - t < RESTART_WINDOW]
+        self._restart_times[index] = times
+        if len(times) >= RESTART_LIMIT:
+            return False
+        times.append(now)
+        return True
+
+    def start(self):
+        """
+        تشغيل العمليات العاملة ومراقبتها حتى الإيقاف
+        """
+        raise_open_files_limit()
+        self.log_writer.start()
+        if self.publisher is not None:
+            self.publisher.start()
+        if self.metrics_port is not None:
+            self._metrics_server = MetricsServer(
+                lambda: self.metrics.render(log_writer=self.log_writer,
+                                            connections=lambda: self.connection_count,
+                                            publisher=self.publisher),
+                self.metrics_port)
+            self._metrics_server.start()
+        self._drain_thread = threading.Thread(target=self._drain, name="log-drain", daemon=True)
+        self._drain_thread.start()
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        self.is_running = True
+        print(f"[HONEYPOT STARTED] {self.workers} عمليات عاملة تستمع على {self.host}:{self.port} "
+              f"(SO_REUSEPORT, {self.mode})")
+        print(f"[LOG FILE] السجلات تُحفظ في: {self.log_file}")
+        print("[INFO] للإيقاف اضغط Ctrl+C")
+
+        # العمليات التي خرجت بشكل طبيعي (لا يُعاد تشغيلها)، والمؤجلة حتى يسمح حد إعادة التشغيل
+        finished = set()
+        deferred = set()
+        signal.signal(signal.SIGTERM, _terminate)
+        try:
+            while self.is_running:
+                time.sleep(1.0)
+                for index, process in enumerate(self.processes):
+                    if index in finished or (process is not None and process.is_alive()):
+                        continue
+                    exitcode = process.exitcode if process is not None else None
+                    if exitcode == 0:
+                        print(f"[WARNING] العملية العاملة {index} انتهت (exitcode=0)، لن يُعاد تشغيلها")
+                        finished.add(index)
+                    elif not self._restart_allowed(index):
+                        if index not in deferred:
+                            print(f"[ERROR] العملية العاملة {index} توقفت (exitcode={exitcode}) "
+                                  f"وتجاوزت حد إعادة التشغيل، تأجيل إعادة تشغيلها")
+                            deferred.add(index)
+                    else:
+                        print(f"[WARNING] العملية العاملة {index} توقفت (exitcode={exitcode})، إعادة تشغيل...")
+                        deferred.discard(index)
+                        self.restarts += 1
+                        self._spawn(index)
+                if len(finished) == self.workers:
+                    print("[ERROR] لا توجد عمليات عاملة قيد التشغيل، إيقاف المشرف")
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        إيقاف العمليات العاملة ثم تفريغ سجلاتها وإغلاق كاتب السجلات
+        """
+        self.is_running = False
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout=5)
+
+        if self._drain_thread is not None:
+            self.events.put(None)
+            self._drain_thread.join()
+            self._drain_thread = None
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+            self._metrics_server = None
+        if self.publisher is not None:
+            self.publisher.close()
+        self.log_writer.close()
+        print(f"[HONEYPOT STOPPED] إجمالي الاتصالات: {self.connection_count}")
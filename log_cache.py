@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+ذاكرة مؤقتة عمودية على القرص للسجلات المُحلَّلة: بعد تحليل ملف (أو مقطع) يُحفظ إطاره،
+وفي التحميل التالي يُقرأ عبر memory map بدلاً من إعادة تحليل JSONL
+
+المفتاح بصمة الملف المصدر: الحجم ووقت التعديل وهاش أول 64KB، فأي تعديل ينشئ مفتاحاً جديداً
+
+بنية الملفات بجانب ملف السجل honeypot_logs.json:
+    honeypot_logs.cache/<اسم المصدر>.<المفتاح>/
+        meta.json                      المصدر، البصمة، عدد الصفوف، الصيغة
+        frame.feather                  إن كانت pyarrow مثبتة (Feather دون ضغط)
+        <عمود>.npy و<عمود>.categories.json   وإلا: ملف numpy لكل عمود
+
+الاستخدام:
+    python log_cache.py stats [--log-file honeypot_logs.json]
+    python log_cache.py clear [--log-file honeypot_logs.json]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+CACHE_VERSION = 1
+HASH_BYTES = 64 * 1024
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+def cache_dir(log_file: str) -> str:
+    return f"{os.path.splitext(log_file)[0]}.cache"
+
+def fingerprint(source: str) -> Dict[str, Any]:
+    st = os.stat(source)
+    with open(source, 'rb') as f:
+        head = hashlib.sha1(f.read(HASH_BYTES)).hexdigest()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "head": head}
+
+def _entry_name(source: str, fp: Dict[str, Any]) -> str:
+    key = hashlib.sha1(f"{fp['size']}:{fp['mtime_ns']}:{fp['head']}".encode('ascii')).hexdigest()[:16]
+    return f"{os.path.basename(source)}.{key}"
+
+def _read_meta(entry: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(entry, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+def _entries(log_file: str) -> List[str]:
+    directory = cache_dir(log_file)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in os.listdir(directory)
+            if not name.startswith('.') and os.path.isdir(os.path.join(directory, name))]
+
+def _entry_bytes(entry: str) -> int:
+    return sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+
+def load(log_file: str, source: str, fp: Dict[str, Any] = None) -> Optional[pd.DataFrame]:
+    """
+    إطار المصدر من الذاكرة المؤقتة إن طابقت بصمته الحالية (أو fp)، وإلا None
+    """
+    entry = os.path.join(cache_dir(log_file), _entry_name(source, fp or fingerprint(source)))
+    meta = _read_meta(entry)
+    if meta is None:
+        return None
+    try:
+        if meta["format"] == "feather":
+            if feather is None:
+                return None
+            frame = feather.read_table(os.path.join(entry, "frame.feather"), memory_map=True).to_pandas()
+        else:
+            frame = _load_npy(entry, meta)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[WARNING] مدخل تالف في الذاكرة المؤقتة {entry}: {e}")
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    if len(frame) != meta["rows"]:
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    # وقت آخر استخدام: الإخلاء يبدأ بالأقدم استخداماً
+    os.utime(entry)
+    return frame
+
+def _load_npy(entry: str, meta: Dict[str, Any]) -> pd.DataFrame:
+    frame = {}
+    for column in meta["columns"]:
+        # mmap_mode: الصفحات تُقرأ من القرص عند الحاجة دون تحليل
+        values = np.load(os.path.join(entry, f"{column}.npy"), mmap_mode='r')
+        if column in meta["categorical"]:
+            with open(os.path.join(entry, f"{column}.categories.json"), 'r', encoding='utf-8') as f:
+                categories = json.load(f)
+            values = pd.Categorical.from_codes(values, categories=categories)
+        frame[column] = values
+    return pd.DataFrame(frame, copy=False)
+
+def store(log_file: str, source: str, frame: pd.DataFrame, fp: Dict[str, Any],
+          max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    حفظ إطار المصدر بالبصمة fp المأخوذة قبل تحليله؛ إن تغيّر الملف أثناء التحليل
+    لا يُحفظ شيء (الإطار لا يطابق أي بصمة بعينها)
+    """
+    if fingerprint(source) != fp:
+        return
+    directory = cache_dir(log_file)
+    name = _entry_name(source, fp)
+    entry = os.path.join(directory, name)
+    if os.path.isdir(entry):
+        return
+    tmp_entry = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        os.makedirs(tmp_entry, exist_ok=True)
+        meta = {
+            "version": CACHE_VERSION,
+            "source": os.path.basename(source),
+            "fingerprint": fp,
+            "rows": len(frame),
+            "created": datetime.datetime.now().isoformat(),
+            "columns": list(frame.columns),
+            "categorical": [c for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)]
+        }
+        if feather is not None:
+            meta["format"] = "feather"
+            # دون ضغط حتى يُقرأ عبر memory map
+            feather.write_feather(frame, os.path.join(tmp_entry, "frame.feather"), compression='uncompressed')
+        else:
+            meta["format"] = "npy"
+            for column in frame.columns:
+                values = frame[column]
+                if column in meta["categorical"]:
+                    with open(os.path.join(tmp_entry, f"{column}.categories.json"), 'w', encoding='utf-8') as f:
+                        json.dump(list(values.cat.categories), f, ensure_ascii=False)
+                    values = values.cat.codes
+                np.save(os.path.join(tmp_entry, f"{column}.npy"), values.to_numpy())
+        with open(os.path.join(tmp_entry, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        # مدخل أكبر من الحد وحده لا يُحفظ (ولا يُخلي بقية المدخلات من أجله)
+        if _entry_bytes(tmp_entry) > max_bytes:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        os.replace(tmp_entry, entry)
+    except OSError as e:
+        # مدخل كتبته عملية أخرى في نفس اللحظة، أو القرص ممتلئ
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        if not os.path.isdir(entry):
+            print(f"[WARNING] تعذر حفظ الذاكرة المؤقتة لـ {source}: {e}")
+        return
+
+    # النسخ الأقدم من نفس المصدر (الملف النشط بعد الإلحاق) لن تطابق بصمته مجدداً،
+    # ومصادر لم تعد موجودة (مقطع حُذف أو ضُغط فتغيّر اسمه) لن تُطلب أبداً
+    log_dir = os.path.dirname(log_file)
+    for other in _entries(log_file):
+        other_meta = _read_meta(other)
+        if other == entry or other_meta is None:
+            continue
+        if (other_meta["source"] == meta["source"]
+                or not os.path.exists(os.path.join(log_dir, other_meta["source"]))):
+            shutil.rmtree(other, ignore_errors=True)
+    evict(log_file, max_bytes)
+
+def evict(log_file: str, max_bytes: int) -> int:
+    """
+    حذف المدخلات الأقدم استخداماً حتى يصبح الحجم الكلي ضمن max_bytes
+    """
+    entries = sorted(_entries(log_file), key=os.path.getmtime)
+    sizes = {entry: _entry_bytes(entry) for entry in entries}
+    total = sum(sizes.values())
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
+        removed += 1
+    return removed
+
+def clear(log_file: str) -> int:
+    """
+    إبطال الذاكرة المؤقتة بالكامل، تُعيد عدد المدخلات المحذوفة
+    """
+    entries = _entries(log_file)
+    shutil.rmtree(cache_dir(log_file), ignore_errors=True)
+    return len(entries)
+
+def stats(log_file: str) -> Dict[str, Any]:
+    entries = []
+    for entry in _entries(log_file):
+        meta = _read_meta(entry) or {}
+        entries.append({
+            "entry": os.path.basename(entry),
+            "source": meta.get("source"),
+            "rows": meta.get("rows"),
+            "format": meta.get("format"),
+            "bytes": _entry_bytes(entry),
+            "last_used": datetime.datetime.fromtimestamp(os.path.getmtime(entry)).isoformat(timespec='seconds')
+        })
+    entries.sort(key=lambda e: e["last_used"])
+    return {"directory": cache_dir(log_file), "entries": entries,
+            "bytes": sum(e["bytes"] for e in entries)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="الذاكرة المؤقتة العمودية لسجلات المصيدة")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--log-file", default="honeypot_logs.json")
+    args = parser.parse_args(argv)
+
+    if args.command == "clear":
+        removed = clear(args.log_file)
+        print(f"[SUCCESS] تم حذف {removed} مدخل من {cache_dir(args.log_file)}")
+        return
+
+    info = stats(args.log_file)
+    print(f"{info['directory']}: {len(info['entries'])} مدخل، {info['bytes'] / 2**20:.1f} MB")
+    for entry in info["entries"]:
+        print(f"  {entry['source']:<40} {entry['rows']:>10} صف  {entry['bytes'] / 2**20:>8.1f} MB  "
+              f"{entry['format']:<8} {entry['last_used']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+مقاطع السجل المُدوَّرة: التسمية، الضغط، وملف الفهرس (manifest)
+
+بنية الملفات بجانب ملف السجل النشط honeypot_logs.json:
+    honeypot_logs.20250120T103000.json.gz   مقطع مغلق ومضغوط
+    honeypot_logs.manifest.json             فهرس المقاطع (المدى الزمني، عدد السجلات، الحجم)
+"""
+
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+import event_format
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MANIFEST_VERSION = 1
+
+# قفل على مستوى العملية لتحديث ملف الفهرس (الكتابة والضغط في خيوط مختلفة)
+_manifest_lock = threading.Lock()
+
+TimeBound = Optional[Union[str, datetime.datetime]]
+
+def available_codec(preferred: str = "auto") -> str:
+    """
+    اختيار خوارزمية الضغط: zstd إن كانت مكتبة zstandard مثبتة وإلا gzip
+    """
+    if preferred == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if preferred == "zstd" and zstandard is None:
+        print("[WARNING] مكتبة zstandard غير مثبتة، سيتم استخدام gzip")
+        return "gzip"
+    return preferred
+
+def _split_ext(log_file: str):
+    base, ext = os.path.splitext(log_file)
+    return base, ext or ".json"
+
+def manifest_path(log_file: str) -> str:
+    base, _ = _split_ext(log_file)
+    return f"{base}.manifest.json"
+
+def segment_path(log_file: str, opened_at: datetime.datetime) -> str:
+    """
+    اسم المقطع المغلق: الاسم الأساسي + وقت فتح المقطع
+    """
+    base, ext = _split_ext(log_file)
+    path = f"{base}.{opened_at.strftime('%Y%m%dT%H%M%S')}{ext}"
+    suffix = 1
+    while os.path.exists(path) or os.path.exists(path + ".gz") or os.path.exists(path + ".zst"):
+        path = f"{base}.{opened_at.strftime('%Y%m%dT%H%M%S')}-{suffix}{ext}"
+        suffix += 1
+    return path
+
+def load_manifest(log_file: str) -> Dict[str, Any]:
+    path = manifest_path(log_file)
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "segments": []}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] تعذر قراءة فهرس المقاطع {path}: {e}")
+        return {"version": MANIFEST_VERSION, "segments": []}
+
+def _save_manifest(log_file: str, manifest: Dict[str, Any]):
+    # كتابة ذرية: ملف مؤقت ثم استبدال
+    path = manifest_path(log_file)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def update_segment(log_file: str, entry: Dict[str, Any]):
+    """
+    إضافة مقطع إلى الفهرس أو تحديثه (المفتاح هو id)
+    """
+    with _manifest_lock:
+        manifest = load_manifest(log_file)
+        segments = [s for s in manifest["segments"] if s.get("id") != entry["id"]]
+        segments.append(entry)
+        segments.sort(key=lambda s: s.get("start") or "")
+        manifest["segments"] = segments
+        _save_manifest(log_file, manifest)
+
+def compress_segment(log_file: str, entry: Dict[str, Any], codec: str):
+    """
+    ضغط مقطع مغلق ثم تحديث الفهرس وحذف الملف غير المضغوط
+    """
+    directory = os.path.dirname(log_file)
+    raw_path = os.path.join(directory, entry["file"])
+    if codec == "none":
+        return
+
+    suffix = ".zst" if codec == "zstd" else ".gz"
+    compressed_path = raw_path + suffix
+    try:
+        with open(raw_path, 'rb') as src:
+            if codec == "zstd":
+                with open(compressed_path, 'wb') as dst:
+                    zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+            else:
+                with gzip.open(compressed_path, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+    except OSError as e:
+        print(f"[ERROR] فشل في ضغط المقطع {raw_path}: {e}")
+        return
+
+    entry = dict(entry)
+    entry["file"] = os.path.basename(compressed_path)
+    entry["codec"] = codec
+    entry["compressed_bytes"] = os.path.getsize(compressed_path)
+    update_segment(log_file, entry)
+    os.remove(raw_path)
+
+def open_segment(path: str, binary: bool = False) -> io.IOBase:
+    """
+    فتح مقطع (مضغوط أو لا) كملف نصي، أو كملف ثنائي إن كان binary=True
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rb' if binary else 'rt', encoding=None if binary else 'utf-8')
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("مكتبة zstandard مطلوبة لقراءة " + path)
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return stream if binary else io.TextIOWrapper(stream, encoding='utf-8')
+    if binary:
+        return open(path, 'rb')
+    return open(path, 'r', encoding='utf-8')
+
+def is_binary_segment(path: str) -> bool:
+    """
+    هل المقطع بالصيغة الثنائية؟ (يُفحص أول 4 بايتات بعد فك الضغط)
+    """
+    with open_segment(path, binary=True) as f:
+        return f.read(len(event_format.MAGIC)) == event_format.MAGIC
+
+def _as_iso(bound: TimeBound) -> Optional[str]:
+    if bound is None:
+        return None
+    if isinstance(bound, str):
+        bound = datetime.datetime.fromisoformat(bound)
+    return bound.isoformat()
+
+def log_sources(log_file: str, start: TimeBound = None, end: TimeBound = None) -> List[str]:
+    """
+    قائمة الملفات التي تحتوي سجلات ضمن النافذة الزمنية [start, end]
+
+    المقاطع خارج النافذة تُستبعد من الفهرس دون فتحها. الملف النشط يُضاف دائماً
+    لأن مداه الزمني غير معروف قبل إغلاقه.
+    """
+    start_iso = _as_iso(start)
+    end_iso = _as_iso(end)
+    directory = os.path.dirname(log_file)
+
+    sources = []
+    for segment in load_manifest(log_file)["segments"]:
+        # الطوابع الزمنية بصيغة ISO ثابتة، فالمقارنة النصية تكافئ المقارنة الزمنية
+        if start_iso and segment.get("end") and segment["end"] < start_iso:
+            continue
+        if end_iso and segment.get("start") and segment["start"] > end_iso:
+            continue
+        sources.append(os.path.join(directory, segment["file"]))
+
+    if os.path.exists(log_file):
+        sources.append(log_file)
+    return sources
+
+def scan_segment(path: str) -> Dict[str, Any]:
+    """
+    حساب المدى الزمني وعدد السجلات لملف غير مفهرس (عند الاستعادة بعد توقف مفاجئ)
+    """
+    if event_format.is_binary_log(path):
+        with open(path, 'rb') as f:
+            return event_format.scan(f.read())
+
+    records = 0
+    first = last = None
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            try:
+                timestamp = json.loads(line).get("timestamp")
+            except ValueError:
+                continue
+            records += 1
+            if timestamp:
+                if first is None or timestamp < first:
+                    first = timestamp
+                if last is None or timestamp > last:
+                    last = timestamp
+    return {"records": records, "start": first, "end": last}
+
+def iter_log_records(log_file: str, start: TimeBound = None, end: TimeBound = None) -> Iterator[Dict[str, Any]]:
+    """
+    كل سجلات الملف ومقاطعه كقواميس (JSONL أو الصيغة الثنائية)، بترتيب الكتابة
+    """
+    for source in log_sources(log_file, start, end):
+        if not os.path.exists(source):
+            # ضُغط المقطع بعد قراءة الفهرس
+            source = next((source + suffix for suffix in (".zst", ".gz")
+                           if os.path.exists(source + suffix)), source)
+        if is_binary_segment(source):
+            with open_segment(source, binary=True) as f:
+                yield from event_format.iter_records(f.read())
+            continue
+        with open_segment(source) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
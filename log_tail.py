@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+التحميل التزايدي لملف السجل النشط: نقطة استئناف (checkpoint) تحفظ هوية الملف وموضع
+القراءة وبقية السطر الناقص، فلا يُحلَّل في التحميل التالي إلا ما أُضيف بعدها
+
+بنية الملفات بجانب ملف السجل النشط honeypot_logs.json:
+    honeypot_logs.checkpoint.json   نقطة الاستئناف
+    honeypot_logs.snapshot.pkl      الإطار المُحمَّل حتى نقطة الاستئناف (لتشغيل المحلل التالي)
+"""
+
+import base64
+import hashlib
+import json
+import os
+from typing import Dict, Any, Iterator, List, Optional
+
+CHECKPOINT_VERSION = 1
+
+# بصمة بداية الملف: تكشف استبدال محتواه حتى لو عاد حجمه أكبر من موضع القراءة
+HEAD_BYTES = 4096
+
+def _base(log_file: str) -> str:
+    return os.path.splitext(log_file)[0]
+
+def checkpoint_path(log_file: str) -> str:
+    return f"{_base(log_file)}.checkpoint.json"
+
+def snapshot_path(log_file: str) -> str:
+    return f"{_base(log_file)}.snapshot.pkl"
+
+def segment_names(sources: List[str]) -> List[str]:
+    """
+    أسماء المقاطع المُدوَّرة دون لاحقة الضغط (ضغط مقطع بعد تدويره لا يغيّر محتواه)
+    """
+    names = []
+    for source in sources:
+        name = os.path.basename(source)
+        for suffix in ('.zst', '.gz'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        names.append(name)
+    return names
+
+def _head_digest(f, length: int) -> str:
+    f.seek(0)
+    return hashlib.sha1(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+def head_digest(path: str, length: int) -> str:
+    with open(path, 'rb') as f:
+        return _head_digest(f, length)
+
+def load_checkpoint(log_file: str) -> Optional[Dict[str, Any]]:
+    path = checkpoint_path(log_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] تعذر قراءة نقطة الاستئناف {path}: {e}")
+        return None
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+def save_checkpoint(log_file: str, checkpoint: Dict[str, Any]):
+    # كتابة ذرية: ملف مؤقت ثم استبدال
+    path = checkpoint_path(log_file)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def remove_checkpoint(log_file: str):
+    for path in (checkpoint_path(log_file), snapshot_path(log_file)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def check(checkpoint: Dict[str, Any], log_file: str, segments: List[str]) -> Optional[str]:
+    """
+    سبب عدم صلاحية نقطة الاستئناف (يلزم تحميل كامل)، أو None إن أمكن الاستئناف منها
+    """
+    try:
+        st = os.stat(log_file)
+    except OSError:
+        return "ملف السجل غير موجود"
+    if (st.st_dev, st.st_ino) != (checkpoint["device"], checkpoint["inode"]):
+        return "تم تدوير ملف السجل"
+    if segments != checkpoint["segments"]:
+        return "تغيّرت المقاطع المُدوَّرة"
+    if st.st_size < checkpoint["offset"]:
+        return "تم اقتطاع ملف السجل"
+    if head_digest(log_file, checkpoint["offset"]) != checkpoint["head"]:
+        return "تغيّر محتوى ملف السجل"
+    return None
+
+class TailReader:
+    """
+    قراءة الأسطر الكاملة من موضع معيّن حتى نهاية الملف الحالية
+
+    السطر الأخير دون '\\n' (ما زال قيد الكتابة) لا يُعاد، ويُحفظ في remainder
+    ليُكمَّل في القراءة التالية. offset بعد انتهاء lines() هو موضع القراءة التالية
+    """
+
+    def __init__(self, path: str, offset: int = 0, remainder: bytes = b""):
+        self.path = path
+        self.start = offset
+        self.offset = offset
+        self.remainder = remainder
+        self._identity = None
+        self._head = None
+
+    @classmethod
+    def from_checkpoint(cls, path: str, checkpoint: Dict[str, Any]) -> "TailReader":
+        return cls(path, checkpoint["offset"], base64.b64decode(checkpoint["remainder"]))
+
+    def lines(self) -> Iterator[bytes]:
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            pending = self.remainder
+            for line in f:
+                self.offset += len(line)
+                if not line.endswith(b"\n"):
+                    pending += line
+                    break
+                if pending:
+                    line = pending + line
+                    pending = b""
+                yield line
+            self.remainder = pending
+            # الهوية والبصمة من نفس الملف المفتوح، حتى لو دُوِّر أثناء القراءة
+            st = os.fstat(f.fileno())
+            self._identity = (st.st_dev, st.st_ino)
+            self._head = _head_digest(f, self.offset)
+
+    def checkpoint(self, segments: List[str], rows: int) -> Dict[str, Any]:
+        """
+        نقطة الاستئناف بعد هذه القراءة (أو عند offset إن لم تُستدعَ lines())
+        """
+        if self._identity is None:
+            with open(self.path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                self._identity = (st.st_dev, st.st_ino)
+                self._head = _head_digest(f, self.offset)
+        return {
+            "version": CHECKPOINT_VERSION,
+            "device": self._identity[0],
+            "inode": self._identity[1],
+            "offset": self.offset,
+            "remainder": base64.b64encode(self.remainder).decode('ascii'),
+            "head": self._head,
+            "segments": segments,
+            "rows": rows
+        }
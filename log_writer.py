@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+كاتب السجلات في الخلفية: طابور محدود + خيط كتابة واحد يجمّع السجلات في دفعات
+"""
+
+import collections
+import datetime
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import log_segments
+from event_format import make_encoder
+
+# علامة إيقاف خيط الكتابة
+_STOP = object()
+
+# أوضاع المتانة: بدون fsync، fsync دوري، fsync لكل دفعة (group commit)
+DURABILITY_MODES = ('none', 'interval', 'batch')
+
+class LogWriter:
+    """
+    مرحلة كتابة مستقلة للسجلات
+
+    معالجات الاتصالات تضع السجلات في طابور محدود فقط (بدون أي وصول لنظام الملفات)،
+    وخيط واحد يحوّلها إلى JSON (أو الصيغة الثنائية، log_format='binary') ويكتبها
+    في دفعات كبيرة عند امتلاء الحجم أو انقضاء المهلة.
+
+    durability:
+        none     - الكتابة إلى ذاكرة نظام التشغيل فقط (الأسرع، قد تضيع ثوانٍ عند انقطاع الطاقة)
+        interval - fsync كل fsync_interval ثانية
+        batch    - كتابة و fsync فور تفريغ الطابور؛ كل ما تراكم أثناء fsync السابق
+                   يُثبَّت معاً بـ fsync واحد (group commit)
+
+    التدوير: عند تجاوز rotate_bytes أو عبور حد rotate_interval (بالثواني، 3600 = كل ساعة)
+    يُغلق الملف النشط ويُنقل إلى مقطع مستقل يُضغط في الخلفية ويُسجَّل في الفهرس
+    (انظر log_segments).
+    """
+
+    def __init__(self, log_file: str, max_queue: int = 100000,
+                 flush_bytes: int = 256 * 1024, flush_interval: float = 1.0,
+                 durability: str = 'none', fsync_interval: float = 1.0,
+                 latency_samples: int = 10000, rotate_bytes: Optional[int] = None,
+                 rotate_interval: Optional[int] = None, compression: str = 'auto',
+                 log_format: str = 'jsonl'):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"وضع متانة غير معروف: {durability}")
+
+        self.log_file = log_file
+        self.max_queue = max_queue
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_interval = rotate_interval
+        self.compression = log_segments.available_codec(compression)
+        self.log_format = log_format
+        self.encoder = make_encoder(log_format)
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.errors = 0
+        # زمن التثبيت لكل سجل (من الإضافة للطابور حتى مستوى الضمان الخاص بالوضع)
+        self.latencies = collections.deque(maxlen=latency_samples)
+        # مدرج اختياري لمدة كل دفعة (انظر metrics.HoneypotMetrics)
+        self.flush_histogram = None
+
+        self._unsynced = []
+        self._last_sync = time.monotonic()
+        self._compressors = []
+        self._reset_segment()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_backpressure_report = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self):
+        """
+        تشغيل خيط الكتابة (لا يفعل شيئاً إن كان يعمل)
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        إضافة سجل إلى الطابور دون انتظار
+        تُعيد False إذا كان الطابور ممتلئاً وتم إسقاط السجل
+        """
+        if self._thread is None:
+            self.start()
+
+        try:
+            self.queue.put_nowait((time.monotonic(), record))
+            return True
+        except queue.Full:
+            self._report_backpressure()
+            return False
+
+    def _report_backpressure(self):
+        with self._lock:
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_backpressure_report < 5.0:
+                return
+            self._last_backpressure_report = now
+        print(f"[WARNING] طابور السجلات ممتلئ: العمق={self.queue_depth} "
+              f"السجلات المُسقطة={self.dropped}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        إحصائيات مرحلة الكتابة
+        """
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue': self.max_queue,
+            'dropped': self.dropped,
+            'written': self.written,
+            'bytes_written': self.bytes_written,
+            'flushes': self.flushes,
+            'fsyncs': self.fsyncs,
+            'rotations': self.rotations,
+            'errors': self.errors
+        }
+
+    def close(self):
+        """
+        تفريغ الطابور وكتابة ما تبقى ثم إيقاف الخيط
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self.queue.put(_STOP)
+        thread.join()
+        for compressor in self._compressors:
+            compressor.join()
+        self._compressors = []
+        with self._lock:
+            self._thread = None
+
+    def _next_timeout(self, buffer, deadline: float) -> float:
+        now = time.monotonic()
+        timeout = self.flush_interval if not buffer else max(0.0, deadline - now)
+        if self._unsynced:
+            timeout = min(timeout, max(0.0, self._last_sync + self.fsync_interval - now))
+        return timeout
+
+    @property
+    def _rotation_enabled(self) -> bool:
+        return bool(self.rotate_bytes or self.rotate_interval)
+
+    def _reset_segment(self, first_timestamp: Optional[str] = None):
+        self._seg_records = 0
+        self._seg_bytes = 0
+        self._seg_start = None
+        self._seg_end = None
+        self._seg_deadline = None
+        # حدود المقطع كما كانت بعد آخر دفعة مكتوبة (تُستعاد عند إسقاط دفعة)
+        self._seg_flushed = (0, None, None)
+        if self.rotate_interval:
+            # حدود التدوير الزمني مُحاذاة لمضاعفات الفترة (بداية كل ساعة مثلاً)
+            opened = time.time()
+            if first_timestamp:
+                opened = datetime.datetime.fromisoformat(first_timestamp).timestamp()
+            self._seg_deadline = (opened // self.rotate_interval + 1) * self.rotate_interval
+
+    def _open(self):
+        try:
+            f = open(self.log_file, 'ab')
+            # ملف جديد يبدأ بالترويسة، وملف موجود يُتابَع بقواميس جديدة (الصيغة الثنائية)
+            if f.tell() == 0:
+                self.encoder.reset(fresh=True)
+                f.write(self.encoder.header())
+                f.flush()
+            else:
+                self.encoder.reset(fresh=False)
+            return f
+        except OSError as e:
+            print(f"[ERROR] فشل في فتح ملف السجل: {e}")
+            self.errors += 1
+            return None
+
+    def _recover(self):
+        """
+        متابعة المقطع النشط بعد إعادة التشغيل، وإكمال ضغط المقاطع التي لم يكتمل ضغطها
+        """
+        if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > 0:
+            scanned = log_segments.scan_segment(self.log_file)
+            self._reset_segment(scanned["start"])
+            self._seg_records = scanned["records"]
+            self._seg_start = scanned["start"]
+            self._seg_end = scanned["end"]
+            self._seg_flushed = (self._seg_records, self._seg_start, self._seg_end)
+            self._seg_bytes = os.path.getsize(self.log_file)
+
+        directory = os.path.dirname(self.log_file)
+        for entry in log_segments.load_manifest(self.log_file)["segments"]:
+            if entry.get("codec") == "none" and self.compression != "none" and \
+                    os.path.exists(os.path.join(directory, entry["file"])):
+                self._compress_in_background(entry)
+
+    def _compress_in_background(self, entry: Dict[str, Any]):
+        compressor = threading.Thread(
+            target=log_segments.compress_segment,
+            args=(self.log_file, entry, self.compression),
+            name="log-compressor"
+        )
+        compressor.start()
+        self._compressors = [c for c in self._compressors if c.is_alive()] + [compressor]
+
+    def _should_rotate(self) -> bool:
+        if not self._seg_records:
+            return False
+        if self.rotate_bytes and self._seg_bytes >= self.rotate_bytes:
+            return True
+        return bool(self._seg_deadline and time.time() >= self._seg_deadline)
+
+    def _rotate(self, f):
+        """
+        إغلاق المقطع النشط، تسجيله في الفهرس، وبدء ضغطه في الخلفية
+        """
+        if self._unsynced:
+            self._sync(f)
+        f.close()
+
+        opened_at = datetime.datetime.fromisoformat(self._seg_start) if self._seg_start \
+            else datetime.datetime.now()
+        raw_path = log_segments.segment_path(self.log_file, opened_at)
+        try:
+            os.rename(self.log_file, raw_path)
+        except OSError as e:
+            self.errors += 1
+            print(f"[ERROR] فشل في تدوير ملف السجل: {e}")
+            return self._open()
+
+        entry = {
+            "id": os.path.basename(raw_path),
+            "file": os.path.basename(raw_path),
+            "codec": "none",
+            "start": self._seg_start,
+            "end": self._seg_end,
+            "records": self._seg_records,
+            "bytes": self._seg_bytes,
+            "compressed_bytes": self._seg_bytes
+        }
+        log_segments.update_segment(self.log_file, entry)
+        self._compress_in_background(entry)
+
+        self.rotations += 1
+        self._reset_segment()
+        return self._open()
+
+    def _run(self):
+        if self._rotation_enabled:
+            self._recover()
+        f = self._open()
+
+        buffer = []
+        times = []
+        buffered_bytes = 0
+        deadline = 0.0
+        stopping = False
+
+        while not stopping:
+            try:
+                item = self.queue.get(timeout=self._next_timeout(buffer, deadline))
+            except queue.Empty:
+                item = None
+
+            # سحب كل ما هو جاهز في الطابور دون انتظار حتى يكتمل حجم الدفعة
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                enqueued_at, record = item
+                if not buffer:
+                    deadline = time.monotonic() + self.flush_interval
+                    # إعادة فتح الملف بعد فشل سابق قبل ترميز الدفعة (فتحه يبدأ قواميس جديدة)
+                    if f is None:
+                        f = self._open()
+                line = self.encoder.encode(record)
+                buffer.append(line)
+                times.append(enqueued_at)
+                buffered_bytes += len(line)
+
+                timestamp = record.get("timestamp")
+                if timestamp:
+                    if self._seg_start is None or timestamp < self._seg_start:
+                        self._seg_start = timestamp
+                    if self._seg_end is None or timestamp > self._seg_end:
+                        self._seg_end = timestamp
+                self._seg_records += 1
+
+                if buffered_bytes >= self.flush_bytes:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            # في وضع batch تُكتب الدفعة فور فراغ الطابور (group commit)
+            if buffer and (stopping or self.durability == 'batch'
+                           or buffered_bytes >= self.flush_bytes
+                           or time.monotonic() >= deadline):
+                f, written = self._flush(f, buffer, times)
+                self._seg_bytes += written
+                buffer = []
+                times = []
+                buffered_bytes = 0
+
+            if self._unsynced and (stopping or
+                                   time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync(f)
+
+            if f is not None and not buffer and self._rotation_enabled and self._should_rotate():
+                f = self._rotate(f)
+
+        if f is not None:
+            f.close()
+
+    def _flush(self, f, buffer, times):
+        """
+        كتابة الدفعة؛ تُعيد (الملف، عدد البايتات المكتوبة)
+        """
+        if f is None:
+            self.errors += 1
+            self._restore_segment()
+            return f, 0
+        started = time.monotonic()
+        offset = None
+        try:
+            offset = f.tell()
+            data = self.encoder.frame(buffer)
+            f.write(data)
+            f.flush()
+            self.written += len(buffer)
+            self.bytes_written += len(data)
+            self.flushes += 1
+            self._seg_flushed = (self._seg_records, self._seg_start, self._seg_end)
+        except OSError as e:
+            self.errors += 1
+            print(f"[ERROR] فشل في تسجيل السجل: {e}")
+            # frame() نقل تعريفات النصوص الجديدة من المُرمِّز رغم أنها لم تُكتب:
+            # الدفعة التالية تبدأ بكتلة RESET وتعرّف نصوصها من جديد
+            self.encoder.reset(fresh=False)
+            return self._discard_partial(f, offset), 0
+
+        if self.durability == 'none':
+            self._record_latencies(times)
+        else:
+            self._unsynced.extend(times)
+            if self.durability == 'batch':
+                self._sync(f)
+        if self.flush_histogram is not None:
+            self.flush_histogram.observe(time.monotonic() - started)
+        return f, len(data)
+
+    def _discard_partial(self, f, offset: Optional[int]):
+        """
+        حذف ما كُتب جزئياً من الدفعة الفاشلة وإعادة فتح الملف من آخر موضع سليم
+        """
+        self._restore_segment()
+        try:
+            f.close()
+        except OSError:
+            pass
+        try:
+            if offset is not None:
+                os.truncate(self.log_file, offset)
+        except OSError as e:
+            self.errors += 1
+            print(f"[ERROR] فشل في حذف الكتابة الجزئية من ملف السجل: {e}")
+        return self._open()
+
+    def _restore_segment(self):
+        # سجلات الدفعة المُسقطة لا تُحسب في عدد المقطع ولا في مداه الزمني
+        self._seg_records, self._seg_start, self._seg_end = self._seg_flushed
+
+    def _sync(self, f):
+        try:
+            os.fsync(f.fileno())
+            self.fsyncs += 1
+        except OSError as e:
+            self.errors += 1
+            print(f"[ERROR] فشل في تثبيت السجل على القرص: {e}")
+        self._last_sync = time.monotonic()
+        self._record_latencies(self._unsynced)
+        self._unsynced = []
+
+    def _record_latencies(self, times):
+        now = time.monotonic()
+        self.latencies.extend(now - t for t in times)
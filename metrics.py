@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+مقاييس المصيدة أثناء التشغيل بصيغة Prometheus النصية، تُقدَّم عبر HTTP على
+عنوان loopback فقط (GET /metrics)
+"""
+
+import bisect
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+# حدود الأزمنة بالثواني (من نصف ميلي ثانية حتى 2.5 ثانية)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Histogram:
+    """
+    مدرج تكراري بحدود ثابتة (تُعرض تراكمياً كما يتوقع Prometheus)
+    """
+
+    __slots__ = ("buckets", "counts", "total", "count", "_lock")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def render(self, name: str, help_text: str) -> List[str]:
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.total, self.count
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{name}_sum {total:.6f}")
+        lines.append(f"{name}_count {count}")
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str, value, labels: str = ""):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.append(f"{name}{labels} {value}")
+
+class HoneypotMetrics:
+    """
+    عدّادات ومدرجات تُحدَّث من مسار معالجة الجلسات، والقيم اللحظية (الجلسات النشطة،
+    عمق طابور السجلات...) تُقرأ من كائنات المصيدة عند كل طلب /metrics
+    """
+
+    # عدد الأوامر المختلفة كحد أقصى كـ labels؛ ما زاد يُجمع تحت "other"
+    max_command_labels = 200
+    # نافذة حساب الاتصالات/ثانية
+    rate_window = 10
+
+    def __init__(self):
+        self.accepts = 0
+        self.logins: Dict[str, int] = {"success": 0, "failure": 0}
+        self.commands: Dict[str, int] = collections.Counter()
+        self.handler_latency = Histogram()
+        self.flush_latency = Histogram()
+        self._accept_counts = [0] * self.rate_window
+        self._accept_seconds = [0] * self.rate_window
+        self._lock = threading.Lock()
+
+    def observe_accept(self):
+        second = int(time.monotonic())
+        index = second % self.rate_window
+        with self._lock:
+            self.accepts += 1
+            if self._accept_seconds[index] != second:
+                self._accept_seconds[index] = second
+                self._accept_counts[index] = 0
+            self._accept_counts[index] += 1
+
+    def observe_login(self, success: bool):
+        with self._lock:
+            self.logins["success" if success else "failure"] += 1
+
+    def observe_command(self, command: str):
+        name = command.split(None, 1)[0] if command else ""
+        with self._lock:
+            if name not in self.commands and len(self.commands) >= self.max_command_labels:
+                name = "other"
+            self.commands[name] += 1
+
+    def accepts_per_second(self) -> float:
+        # الثواني المكتملة فقط داخل النافذة
+        now = int(time.monotonic())
+        with self._lock:
+            total = sum(count for second, count in zip(self._accept_seconds, self._accept_counts)
+                        if now - self.rate_window < second < now)
+        return total / (self.rate_window - 1)
+
+    def render(self, honeypot=None, log_writer=None,
+               connections: Optional[Callable[[], int]] = None, publisher=None) -> str:
+        lines: List[str] = []
+        if honeypot is not None:
+            log_writer = log_writer or honeypot.log_writer
+            publisher = publisher or honeypot.publisher
+            connections = connections or (lambda: honeypot.connection_count)
+
+        if connections is not None:
+            _metric(lines, "honeypot_connections_total", "counter",
+                    "Connections accepted (connection_count)", connections())
+
+        if honeypot is not None:
+            _metric(lines, "honeypot_accepts_per_second", "gauge",
+                    f"Accepted connections per second over the last {self.rate_window - 1} s",
+                    f"{self.accepts_per_second():.3f}")
+            _metric(lines, "honeypot_active_sessions", "gauge", "Live sessions", honeypot.reaper.live)
+            lines.append("# HELP honeypot_sessions_reaped_total Sessions closed by a limit")
+            lines.append("# TYPE honeypot_sessions_reaped_total counter")
+            for reason, count in sorted(honeypot.reaper.reaped.items()):
+                lines.append(f'honeypot_sessions_reaped_total{{reason="{reason}"}} {count}')
+
+            lines.append("# HELP honeypot_logins_total Login attempts by result")
+            lines.append("# TYPE honeypot_logins_total counter")
+            with self._lock:
+                logins = dict(self.logins)
+                commands = dict(self.commands)
+            for result, count in logins.items():
+                lines.append(f'honeypot_logins_total{{result="{result}"}} {count}')
+
+            lines.append("# HELP honeypot_commands_total Commands executed by first word")
+            lines.append("# TYPE honeypot_commands_total counter")
+            for command, count in sorted(commands.items()):
+                lines.append(f'honeypot_commands_total{{command="{_escape(command)}"}} {count}')
+
+            if honeypot.admission is not None:
+                for key, value in honeypot.admission.stats().items():
+                    _metric(lines, f"honeypot_admission_{key}", "gauge",
+                            f"Admission controller {key}", value)
+
+            lines.extend(self.handler_latency.render(
+                "honeypot_handler_latency_seconds", "Time to process one read and send the reply"))
+
+        if log_writer is not None:
+            stats = log_writer.stats()
+            _metric(lines, "honeypot_log_queue_depth", "gauge", "Records waiting in the log queue",
+                    stats["queue_depth"])
+            _metric(lines, "honeypot_log_records_dropped_total", "counter",
+                    "Records dropped because the log queue was full", stats["dropped"])
+            if "written" in stats:
+                _metric(lines, "honeypot_log_records_written_total", "counter",
+                        "Records written to the log file", stats["written"])
+                lines.extend(self.flush_latency.render(
+                    "honeypot_log_flush_seconds", "Duration of one log writer flush (including fsync)"))
+
+        if publisher is not None:
+            stats = publisher.stats()
+            _metric(lines, "honeypot_event_stream_subscribers", "gauge", "Connected event stream subscribers",
+                    stats["subscribers"])
+            _metric(lines, "honeypot_event_stream_dropped_total", "counter",
+                    "Frames dropped for slow event stream subscribers", stats["dropped"])
+
+        return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """
+    خادم HTTP صغير في خيط خلفي يعرض render() على /metrics
+    """
+
+    def __init__(self, render: Callable[[], str], port: int = 9108, host: str = "127.0.0.1"):
+        self.render = render
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        render = self.render
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # بدون طباعة لكل طلب
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        print(f"[METRICS] http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
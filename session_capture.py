@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+ملف التقاط الجلسات: البايتات الخام التي يرسلها كل مهاجم مع توقيتها، لإعادة
+تشغيلها لاحقاً على مصيدة محلية (انظر session_replay.py)
+
+البنية:
+    الترويسة  b'HPCAP' + رقم الإصدار (بايت واحد)
+    كل سجل    '<BIII' (النوع، رقم الجلسة، الزمن منذ فتح الجلسة بالميلي ثانية، طول الحمولة) + الحمولة
+    OPEN      الحمولة: client_ip \\t client_port \\t session_id \\t وقت الفتح ISO
+    DATA      الحمولة: ما وصل من recv/read كما هو (قبل تحليل Telnet)
+    CLOSE     بدون حمولة
+"""
+
+import datetime
+import struct
+import threading
+import time
+from typing import Dict, Any, Iterator, List
+
+MAGIC = b"HPCAP"
+VERSION = 1
+HEADER = MAGIC + bytes((VERSION,))
+
+RECORD = struct.Struct('<BIII')
+
+OPEN = 1
+DATA = 2
+CLOSE = 3
+
+class CaptureWriter:
+    """
+    كتابة ملف الالتقاط من عدة خيوط (أو من حلقة asyncio)
+    الكتابة عبر مخزن الملف المؤقت فقط: الالتقاط أداة تشخيص وليس سجلاً دائماً
+    """
+
+    def __init__(self, path: str, buffer_size: int = 256 * 1024):
+        self.path = path
+        self.sessions = 0
+        self.bytes_captured = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab', buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(HEADER)
+
+    def _write(self, kind: int, session_index: int, opened_at: float, payload: bytes = b""):
+        delta_ms = int((time.monotonic() - opened_at) * 1000)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(RECORD.pack(kind, session_index, delta_ms, len(payload)))
+            if payload:
+                self._file.write(payload)
+
+    def open_session(self, session) -> int:
+        with self._lock:
+            self.sessions += 1
+            session_index = self.sessions
+        meta = "\t".join((session.client_ip, str(session.client_port), session.session_id,
+                          datetime.datetime.now().isoformat()))
+        self._write(OPEN, session_index, session.opened_at, meta.encode('utf-8'))
+        return session_index
+
+    def data(self, session, chunk: bytes):
+        self.bytes_captured += len(chunk)
+        self._write(DATA, session.capture_id, session.opened_at, chunk)
+
+    def close_session(self, session):
+        self._write(CLOSE, session.capture_id, session.opened_at)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def iter_capture(path: str) -> Iterator[tuple]:
+    """
+    (النوع، رقم الجلسة، الزمن بالميلي ثانية، الحمولة) لكل سجل؛ السجل الأخير
+    الناقص (توقف مفاجئ أثناء الكتابة) يُتجاهل
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"ليس ملف التقاط: {path}")
+    view = memoryview(data)
+    offset = len(HEADER)
+    end = len(data)
+    while offset + RECORD.size <= end:
+        kind, session_index, delta_ms, length = RECORD.unpack_from(view, offset)
+        offset += RECORD.size
+        if offset + length > end:
+            break
+        yield kind, session_index, delta_ms, bytes(view[offset:offset + length])
+        offset += length
+
+def load_sessions(path: str) -> List[Dict[str, Any]]:
+    """
+    تجميع سجلات الالتقاط في جلسات مرتبة حسب وقت الفتح
+    """
+    # الملف يُفتح بوضع الإلحاق، فأرقام الجلسات تتكرر بين تشغيلات المصيدة:
+    # OPEN جديد بنفس الرقم يبدأ جلسة جديدة
+    sessions: List[Dict[str, Any]] = []
+    current: Dict[int, Dict[str, Any]] = {}
+    for kind, session_index, delta_ms, payload in iter_capture(path):
+        if kind == OPEN:
+            client_ip, client_port, session_id, opened = payload.decode('utf-8').split("\t")
+            current[session_index] = {
+                "client_ip": client_ip,
+                "client_port": int(client_port),
+                "session_id": session_id,
+                "opened": opened,
+                "events": [],
+                "closed_ms": None
+            }
+            sessions.append(current[session_index])
+            continue
+        session = current.get(session_index)
+        if session is None:
+            continue
+        if kind == DATA:
+            session["events"].append((delta_ms, payload))
+        elif kind == CLOSE:
+            session["closed_ms"] = delta_ms
+    return sorted(sessions, key=lambda s: s["opened"])
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+إدارة دورة حياة الجلسات: سجل الجلسات الحية، مهلات الخمول وتسجيل الدخول
+ومدة الجلسة الكلية عبر عجلة مؤقتات هرمية، وحدود البايتات والأوامر لكل جلسة
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class TimerWheel:
+    """
+    عجلة مؤقتات هرمية: levels مستويات من slots خانة، دقة المستوى الأول tick ثانية
+    (64 × 64 × 64 ثانية ≈ 3 أيام بالإعدادات الافتراضية)
+
+    الإضافة O(1)، والتقدم O(1) لكل tick مع نقل خانة من مستوى أعلى عند اكتمال دورة
+    المستوى الذي تحته. لا يوجد إلغاء: المستدعي يتحقق من صلاحية العنصر عند انتهائه.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 3,
+                 now: Optional[float] = None):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.wheels: List[List[list]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.current = int((time.monotonic() if now is None else now) / tick)
+
+    def schedule(self, item: Any, deadline: float):
+        target = max(int(-(-deadline // self.tick)), self.current + 1)
+        self._insert(target, item)
+
+    def _insert(self, target: int, item: Any):
+        delta = target - self.current
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots or level == self.levels - 1:
+                # أبعد من مدى العجلة: يوضع في آخر خانة ويُعاد حسابه عند نقله
+                slot = (min(target, self.current + span * self.slots - 1) // span) % self.slots
+                self.wheels[level][slot].append((target, item))
+                return
+            span *= self.slots
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """
+        التقدم حتى الوقت now وإعادة العناصر التي انتهت مهلتها
+        """
+        target = int((time.monotonic() if now is None else now) / self.tick)
+        expired = []
+        while self.current < target:
+            self.current += 1
+            span = self.slots
+            for level in range(1, self.levels):
+                if self.current % span:
+                    break
+                slot = (self.current // span) % self.slots
+                entries = self.wheels[level][slot]
+                self.wheels[level][slot] = []
+                for entry_target, item in entries:
+                    self._insert(entry_target, item)
+                span *= self.slots
+
+            slot = self.current % self.slots
+            entries = self.wheels[0][slot]
+            if not entries:
+                continue
+            self.wheels[0][slot] = []
+            for entry_target, item in entries:
+                if entry_target <= self.current:
+                    expired.append(item)
+                else:
+                    self._insert(entry_target, item)
+        return expired
+
+class SessionReaper:
+    """
+    سجل الجلسات الحية وحاصدها
+
+    لكل جلسة مؤقت واحد في العجلة على أقرب مهلة. النشاط يحدّث last_activity فقط
+    (بدون إعادة جدولة)، وعند انتهاء المؤقت يُعاد حساب المهلة الفعلية: إما إعادة
+    الجدولة أو إغلاق الجلسة عبر closer وتسجيل السبب في close_reason.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, login_timeout: float = 60.0,
+                 session_timeout: float = 3600.0, max_bytes: int = 1024 * 1024,
+                 max_commands: int = 1000, tick: float = 1.0):
+        self.idle_timeout = idle_timeout
+        self.login_timeout = login_timeout
+        self.session_timeout = session_timeout
+        self.max_bytes = max_bytes
+        self.max_commands = max_commands
+        self.wheel = TimerWheel(tick=tick)
+        # الجلسة -> دالة إغلاق الاتصال
+        self.sessions: Dict[Any, Callable[[], None]] = {}
+        self.reaped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._next_tick = 0.0
+
+    @property
+    def live(self) -> int:
+        return len(self.sessions)
+
+    def _deadlines(self, session) -> list:
+        deadlines = [(session.last_activity + self.idle_timeout, "idle_timeout"),
+                     (session.opened_at + self.session_timeout, "session_timeout")]
+        if not session.logged_in:
+            deadlines.append((session.opened_at + self.login_timeout, "login_timeout"))
+        return deadlines
+
+    def deadline(self, session) -> float:
+        return min(self._deadlines(session))[0]
+
+    def _expiry_reason(self, session) -> str:
+        # أسبق مهلة انقضت هي السبب
+        return min(self._deadlines(session))[1]
+
+    def register(self, session, closer: Callable[[], None]):
+        now = time.monotonic()
+        session.opened_at = now
+        session.last_activity = now
+        with self._lock:
+            self.sessions[session] = closer
+            self.wheel.schedule(session, self.deadline(session))
+
+    def unregister(self, session):
+        with self._lock:
+            self.sessions.pop(session, None)
+
+    def touch(self, session, received: int, lines: int) -> Optional[str]:
+        """
+        تسجيل نشاط الجلسة؛ تُعيد سبب الإغلاق إن تجاوزت حد البايتات أو الأوامر
+        """
+        session.last_activity = time.monotonic()
+        session.bytes_in += received
+        session.commands += lines
+        if session.bytes_in > self.max_bytes:
+            return "byte_budget"
+        if session.commands > self.max_commands:
+            return "command_budget"
+        return None
+
+    def _count(self, reason: str):
+        self.reaped[reason] = self.reaped.get(reason, 0) + 1
+
+    def close(self, session, reason: str):
+        """
+        إغلاق جلسة من خارج معالجها (مثلاً عند تجاوز الحد)
+        """
+        with self._lock:
+            closer = self.sessions.pop(session, None)
+            if closer is None:
+                return
+            session.close_reason = reason
+            self._count(reason)
+        try:
+            closer()
+        except OSError:
+            pass
+
+    def tick(self, now: Optional[float] = None):
+        """
+        استدعاء دوري من حلقة الخادم (مرة كل tick ثانية على الأكثر يقوم بعمل فعلي)
+        """
+        now = time.monotonic() if now is None else now
+        if now < self._next_tick:
+            return
+        self._next_tick = now + self.wheel.tick
+
+        to_close = []
+        with self._lock:
+            for session in self.wheel.advance(now):
+                closer = self.sessions.get(session)
+                if closer is None:
+                    continue  # أُغلقت الجلسة قبل انتهاء مؤقتها
+                deadline = self.deadline(session)
+                if deadline > now:
+                    self.wheel.schedule(session, deadline)
+                    continue
+                del self.sessions[session]
+                session.close_reason = self._expiry_reason(session)
+                self._count(session.close_reason)
+                to_close.append(closer)
+
+        for closer in to_close:
+            try:
+                closer()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'live_sessions': self.live,
+            'reaped': dict(self.reaped)
+        }
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+إعادة تشغيل الجلسات الملتقطة (--capture) على مصيدة محلية ومقارنة السجلات الناتجة
+بالسجلات الأصلية: للتحقق من أن تعديلاً على المصيدة لا يغير سلوكها مع هجمات حقيقية
+
+الاستخدام:
+    python session_replay.py capture.hpcap --log-file honeypot_logs.json
+    python session_replay.py capture.hpcap --speed 10 --parallel 200 --mode asyncio
+    python session_replay.py capture.hpcap.w0 capture.hpcap.w1 --speed 0 --json -
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from log_segments import iter_log_records
+from session_capture import load_sessions
+
+# الحقول المقارنة لكل سجل (الطابع الزمني والمنفذ يختلفان بطبيعة الحال)
+COMPARED_FIELDS = ("interaction_type", "content", "response_sent")
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _opened_seconds(session: Dict[str, Any]) -> float:
+    return datetime.datetime.fromisoformat(session["opened"]).timestamp()
+
+def _record_key(record: Dict[str, Any]) -> Tuple:
+    return tuple(record.get(field) or "" for field in COMPARED_FIELDS)
+
+def start_server(port: int, log_file: str, mode: str, commands_file: Optional[str] = None,
+                 server_args: Optional[List[str]] = None, timeout: float = 10.0) -> Tuple[subprocess.Popen, int]:
+    """
+    تشغيل مصيدة محلية في عملية مستقلة (تُوقف بـ SIGINT فتفرّغ سجلاتها كما مع Ctrl+C)
+    تُعيد العملية والمنفذ المحلي لاتصال الفحص (يظهر في السجل كجلسة فارغة)
+    """
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "honeypot_main.py"),
+               "--mode", mode, "--port", str(port), "--log-file", log_file, "--console", "off"]
+    if commands_file:
+        command += ["--commands-file", commands_file]
+    command += server_args or []
+    # SIGINT قد يكون مُتجاهَلاً إن شُغّلت الأداة في الخلفية، فيُعاد لوضعه الافتراضي في العملية الفرعية
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL,
+                               preexec_fn=lambda: signal.signal(signal.SIGINT, signal.SIG_DFL))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("توقفت المصيدة المحلية قبل أن تبدأ")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as probe:
+                return process, probe.getsockname()[1]
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"المصيدة المحلية لم تستمع على المنفذ {port}")
+
+def stop_server(process: subprocess.Popen, timeout: float = 10.0):
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def wait_for_sessions(log_file: str, timeout: float = 5.0):
+    """
+    الجلسات التي يغلقها الحاصد تصل EOF للعميل قبل تسجيل connection_closed،
+    فيُنتظر حتى يُسجَّل إغلاق كل اتصال قبل إيقاف المصيدة
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        opened = closed = 0
+        for record in iter_log_records(log_file):
+            interaction_type = record.get("interaction_type")
+            if interaction_type == "connection_established":
+                opened += 1
+            elif interaction_type == "connection_closed":
+                closed += 1
+        if opened == closed:
+            return
+        time.sleep(0.1)
+
+async def replay_session(port: int, session: Dict[str, Any], speed: float, timeout: float) -> int:
+    """
+    إرسال أحداث جلسة واحدة بتوقيتها الأصلي مقسوماً على speed (0 = بلا انتظار)
+    تُعيد المنفذ المحلي للاتصال لربطه بسجلات المصيدة
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    local_port = writer.get_extra_info('sockname')[1]
+
+    async def drain_responses():
+        # الردود تُقرأ باستمرار حتى لا يتوقف الخادم عند امتلاء المخزن
+        while await reader.read(65536):
+            pass
+
+    responses = asyncio.ensure_future(drain_responses())
+    try:
+        started = time.monotonic()
+        for delta_ms, payload in session["events"]:
+            if speed:
+                delay = started + delta_ms / 1000 / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if responses.done():
+                break  # أغلقت المصيدة الاتصال (exit أو محاولات فاشلة)
+            writer.write(payload)
+            await writer.drain()
+        # الانتظار حتى وقت الإغلاق الأصلي يعيد إنتاج مهلات الخمول بسرعة 1x
+        if speed and session["closed_ms"] is not None and not responses.done():
+            delay = started + session["closed_ms"] / 1000 / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.wait([responses], timeout=delay)
+        if not responses.done() and writer.can_write_eof():
+            writer.write_eof()
+        await asyncio.wait_for(responses, timeout)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        responses.cancel()
+        writer.close()
+    return local_port
+
+async def replay_all(port: int, sessions: List[Dict[str, Any]], speed: float, parallel: int,
+                     timeout: float) -> Dict[int, List[int]]:
+    """
+    تشغيل كل الجلسات (parallel منها كحد أقصى في نفس الوقت)، مع الحفاظ على الفروق
+    الزمنية بين بداياتها مقسومة على speed
+    تُعيد: المنفذ المحلي -> أرقام الجلسات التي استخدمته بالترتيب
+    """
+    semaphore = asyncio.Semaphore(parallel)
+    by_port: Dict[int, List[int]] = collections.defaultdict(list)
+    first_opened = min(_opened_seconds(s) for s in sessions) if sessions else 0.0
+    started = time.monotonic()
+
+    async def run(index: int, session: Dict[str, Any]):
+        if speed:
+            delay = started + (_opened_seconds(session) - first_opened) / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with semaphore:
+            try:
+                local_port = await replay_session(port, session, speed, timeout)
+            except (asyncio.TimeoutError, OSError) as e:
+                print(f"[WARNING] فشل إعادة تشغيل الجلسة {session['session_id']}: {e}")
+                return
+            # المنفذ المحلي قد يُعاد استخدامه لاحقاً، فالترتيب يميّز الاتصالات
+            by_port[local_port].append(index)
+
+    await asyncio.gather(*(run(index, session) for index, session in enumerate(sessions)))
+    return by_port
+
+def group_replayed(log_file: str, by_port: Dict[int, List[int]],
+                   probe_port: Optional[int] = None) -> Dict[int, List[Tuple]]:
+    """
+    سجلات المصيدة المحلية لكل جلسة ملتقطة: الاتصال k على منفذ محلي ما هو الجلسة
+    k في by_port[المنفذ] (المنفذ لا يُعاد استخدامه قبل إغلاق الاتصال السابق)
+    """
+    grouped: Dict[int, List[Tuple]] = collections.defaultdict(list)
+    seen = collections.Counter()
+    current: Dict[int, Optional[int]] = {}
+    if probe_port is not None:
+        # اتصال الفحص سبق كل الجلسات على منفذه
+        seen[probe_port] = -1
+    for record in iter_log_records(log_file):
+        port = record.get("client_port")
+        if port not in by_port:
+            continue
+        if record.get("interaction_type") == "connection_established":
+            ordinal = seen[port]
+            seen[port] += 1
+            current[port] = by_port[port][ordinal] if 0 <= ordinal < len(by_port[port]) else None
+        index = current.get(port)
+        if index is not None:
+            grouped[index].append(_record_key(record))
+    return grouped
+
+def group_original(log_file: str, sessions: List[Dict[str, Any]]) -> Dict[int, List[Tuple]]:
+    keys = {(s["session_id"], s["client_ip"], s["client_port"]): index for index, s in enumerate(sessions)}
+    grouped: Dict[int, List[Tuple]] = collections.defaultdict(list)
+    for record in iter_log_records(log_file):
+        index = keys.get((record.get("session_id"), record.get("client_ip"), record.get("client_port")))
+        if index is not None:
+            grouped[index].append(_record_key(record))
+    return grouped
+
+def diff_sessions(sessions: List[Dict[str, Any]], original: Dict[int, List[Tuple]],
+                  replayed: Dict[int, List[Tuple]], max_diffs: int = 10) -> Dict[str, Any]:
+    """
+    مقارنة تسلسل السجلات لكل جلسة؛ الجلسات بدون سجلات أصلية لا تُقارن
+    """
+    matched = 0
+    mismatched = []
+    skipped = 0
+    for index, session in enumerate(sessions):
+        expected = original.get(index)
+        if not expected:
+            skipped += 1
+            continue
+        actual = replayed.get(index, [])
+        if actual == expected:
+            matched += 1
+            continue
+        position = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                        min(len(expected), len(actual)))
+        mismatched.append({
+            "session_id": session["session_id"],
+            "client_ip": session["client_ip"],
+            "position": position,
+            "expected": list(expected[position]) if position < len(expected) else None,
+            "actual": list(actual[position]) if position < len(actual) else None
+        })
+    return {
+        "compared": matched + len(mismatched),
+        "matched": matched,
+        "mismatched": len(mismatched),
+        "skipped": skipped,
+        "diffs": mismatched[:max_diffs]
+    }
+
+def replay(captures: List[str], log_file: Optional[str] = None, speed: float = 1.0,
+           parallel: int = 100, mode: str = "threaded", commands_file: Optional[str] = None,
+           timeout: float = 30.0, server_args: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    تشغيل الالتقاطات على مصيدة محلية جديدة وإعادة ملخص المقارنة
+    """
+    sessions = []
+    for capture in captures:
+        sessions.extend(load_sessions(capture))
+    sessions.sort(key=lambda s: s["opened"])
+
+    with tempfile.TemporaryDirectory(prefix="honeypot_replay_") as directory:
+        replay_log = os.path.join(directory, "replay_logs.json")
+        port = _free_port()
+        server, probe_port = start_server(port, replay_log, mode, commands_file, server_args)
+        started = time.perf_counter()
+        try:
+            by_port = asyncio.run(replay_all(port, sessions, speed, parallel, timeout))
+            elapsed = time.perf_counter() - started
+            wait_for_sessions(replay_log)
+        finally:
+            stop_server(server)
+        replayed = group_replayed(replay_log, by_port, probe_port)
+
+    summary = {
+        "captures": captures,
+        "sessions": len(sessions),
+        "speed": speed,
+        "parallel": parallel,
+        "mode": mode,
+        "elapsed_sec": elapsed,
+        "replayed_records": sum(len(records) for records in replayed.values())
+    }
+    if log_file:
+        summary.update(diff_sessions(sessions, group_original(log_file, sessions), replayed))
+    return summary
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"sessions:  {summary['sessions']:,} replayed in {summary['elapsed_sec']:.2f} s "
+          f"(speed {summary['speed'] or 'max'}, parallel {summary['parallel']}, {summary['mode']})")
+    print(f"records:   {summary['replayed_records']:,}")
+    if "compared" not in summary:
+        return
+    print(f"compared:  {summary['compared']:,} matched {summary['matched']:,} "
+          f"mismatched {summary['mismatched']:,} (no original records: {summary['skipped']:,})")
+    for diff in summary["diffs"]:
+        print(f"  {diff['session_id']} ({diff['client_ip']}) record #{diff['position']}:")
+        print(f"    original: {diff['expected']}")
+        print(f"    replay:   {diff['actual']}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay captured honeypot sessions")
+    parser.add_argument("captures", nargs="+", help="ملفات الالتقاط (--capture)")
+    parser.add_argument("--log-file", default=None,
+                        help="السجل الأصلي للمقارنة (بدونه تُعاد الجلسات فقط)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="معامل تسريع التوقيت: 1 أصلي، 10 أسرع بعشر مرات، 0 بلا انتظار")
+    parser.add_argument("--parallel", type=int, default=100, help="الحد الأقصى للجلسات المتزامنة")
+    parser.add_argument("--mode", choices=["threaded", "asyncio"], default="threaded",
+                        help="وضع المصيدة المحلية")
+    parser.add_argument("--commands-file", default=None)
+    parser.add_argument("--honeypot-args", default="",
+                        help="خيارات إضافية للمصيدة المحلية، مثل \"--idle-timeout 60 --max-line 1024\"")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="مهلة انتظار إغلاق كل جلسة بعد آخر حدث")
+    parser.add_argument("--json", default=None, metavar="PATH", help="حفظ النتائج بصيغة JSON ('-' للطباعة)")
+    args = parser.parse_args(argv)
+
+    summary = replay(args.captures, args.log_file, args.speed, max(1, args.parallel),
+                     args.mode, args.commands_file, args.timeout, shlex.split(args.honeypot_args))
+
+    if args.json == "-":
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print_summary(summary)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+            print(f"[SUCCESS] تم حفظ النتائج في: {args.json}")
+    return 1 if summary.get("mismatched") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+عناوين IP كأعداد صحيحة: كل عنوان فريد (فئة في client_ip) يُحلَّل مرة واحدة إلى
+    version  4 أو 6 (0 = غير صالح)
+    v4       uint32 لعناوين IPv4
+    hi, lo   uint64: العنوان كعدد 128 بت، وIPv4 بصيغة ::ffff:a.b.c.d فيقارن الجميع في فضاء واحد
+ثم التجميع حسب الشبكات (/8، /16، /24...) وفلاتر CIDR عمليات مصفوفات على هذه الأعمدة
+"""
+
+import ipaddress
+from typing import Dict, Any, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from geoip import ipv4_to_uint32
+
+IPV4_MAPPED = 0xFFFF << 32
+MASK_64 = (1 << 64) - 1
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def encode(ips) -> pd.DataFrame:
+    """
+    جدول لكل عنوان (نفس الترتيب): ip، version، v4، hi، lo
+    """
+    ips = np.asarray(ips, dtype=object)
+    v4, valid = ipv4_to_uint32(ips)
+    version = np.where(valid, 4, 0).astype(np.int8)
+    hi = np.zeros(len(ips), dtype=np.uint64)
+    lo = np.where(valid, v4.astype(np.uint64) | np.uint64(IPV4_MAPPED), np.uint64(0))
+
+    # IPv6 نادر في سجلات المصيدة: ipaddress لكل عنوان يحتوي ':' فقط
+    for i in np.flatnonzero(~valid):
+        value = ips[i]
+        if not isinstance(value, str) or ':' not in value:
+            continue
+        try:
+            address = ipaddress.IPv6Address(value.split('%', 1)[0])
+        except ValueError:
+            continue
+        if address.ipv4_mapped is not None:
+            v4[i] = int(address.ipv4_mapped)
+            version[i] = 4
+        else:
+            version[i] = 6
+        hi[i] = int(address) >> 64
+        lo[i] = int(address) & MASK_64
+    return pd.DataFrame({'ip': ips, 'version': version, 'v4': v4, 'hi': hi, 'lo': lo})
+
+def parse_network(cidr: str) -> Network:
+    try:
+        return ipaddress.ip_network(cidr.strip(), strict=False)
+    except ValueError as e:
+        raise ValueError(f"شبكة غير صالحة: {cidr}") from e
+
+def in_network(addresses: pd.DataFrame, cidr: str) -> np.ndarray:
+    """
+    قناع العناوين الواقعة في الشبكة cidr (IPv4 أو IPv6، وشبكات ::ffff:0:0/96 تطابق IPv4)
+    """
+    network = parse_network(cidr)
+    if network.version == 4:
+        shift = 32 - network.prefixlen
+        keys = addresses['v4'].to_numpy().astype(np.int64) >> shift
+        return (addresses['version'].to_numpy() == 4) & (keys == int(network.network_address) >> shift)
+    base = int(network.network_address)
+    mask = ((1 << 128) - 1) ^ ((1 << (128 - network.prefixlen)) - 1)
+    hi = addresses['hi'].to_numpy() & np.uint64(mask >> 64)
+    lo = addresses['lo'].to_numpy() & np.uint64(mask & MASK_64)
+    return ((addresses['version'].to_numpy() > 0)
+            & (hi == np.uint64(base >> 64)) & (lo == np.uint64(base & MASK_64)))
+
+def _subnet_keys(addresses: pd.DataFrame, members: np.ndarray, prefix: int, version: int) -> np.ndarray:
+    if version == 4:
+        return addresses['v4'].to_numpy()[members].astype(np.int64) >> (32 - prefix)
+    hi = addresses['hi'].to_numpy()[members]
+    if prefix == 0:
+        return np.zeros((len(members), 2), dtype=np.uint64)
+    if prefix <= 64:
+        return np.column_stack([hi >> np.uint64(64 - prefix), np.zeros(len(members), dtype=np.uint64)])
+    lo = addresses['lo'].to_numpy()[members]
+    return np.column_stack([hi, lo >> np.uint64(128 - prefix)])
+
+def _network_name(key, prefix: int, version: int) -> str:
+    if version == 4:
+        return str(ipaddress.IPv4Network((int(key) << (32 - prefix), prefix)))
+    hi, lo = int(key[0]), int(key[1])
+    value = hi << (128 - prefix) if prefix <= 64 else (hi << 64) | (lo << (128 - prefix))
+    return str(ipaddress.IPv6Network((value, prefix)))
+
+def subnet_counts(addresses: pd.DataFrame, attacks: np.ndarray, prefix: int = 24, version: int = 4,
+                  n: int = 10) -> List[Tuple[str, int, int]]:
+    """
+    أكثر n شبكة /prefix هجوماً: (الشبكة، التفاعلات، عدد العناوين)
+    attacks: عدد التفاعلات لكل صف في addresses (bincount على أكواد client_ip)
+    """
+    limit = 32 if version == 4 else 128
+    if not 0 <= prefix <= limit:
+        raise ValueError(f"طول البادئة /{prefix} غير صالح لـ IPv{version}")
+    members = np.flatnonzero((attacks > 0) & (addresses['version'].to_numpy() == version))
+    if not len(members):
+        return []
+    keys = _subnet_keys(addresses, members, prefix, version)
+    values, inverse = np.unique(keys, axis=0 if keys.ndim > 1 else None, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    ips = np.bincount(inverse, minlength=len(values))
+    totals = np.bincount(inverse, weights=attacks[members], minlength=len(values)).astype(np.int64)
+    return [(_network_name(values[i], prefix, version), int(totals[i]), int(ips[i]))
+            for i in np.argsort(-totals, kind='stable')[:n]]
+
+def summarize(addresses: pd.DataFrame, attacks: np.ndarray, n: int = 10) -> Dict[str, Any]:
+    """
+    أكثر الشبكات هجوماً على مستويات /8 و/16 و/24 (و/48 و/64 لعناوين IPv6 إن وُجدت)
+    """
+    present = attacks > 0
+    version = addresses['version'].to_numpy()
+    result = {f"/{prefix}": subnet_counts(addresses, attacks, prefix, 4, n) for prefix in (8, 16, 24)}
+    if (present & (version == 6)).any():
+        for prefix in (48, 64):
+            result[f"v6 /{prefix}"] = subnet_counts(addresses, attacks, prefix, 6, n)
+    result['ipv4_ips'] = int(np.count_nonzero(present & (version == 4)))
+    result['ipv6_ips'] = int(np.count_nonzero(present & (version == 6)))
+    result['invalid_ips'] = int(np.count_nonzero(present & (version == 0)))
+    return result
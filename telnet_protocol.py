@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+محلل تدفق Telnet تزايدي: إزالة أوامر IAC (والرد على طلبات التفاوض بالرفض)
+وتقسيم المدخلات إلى أسطر منتهية بـ CR أو LF أو NUL
+
+المحلل لا يعرف شيئاً عن المقابس، لذلك يعمل مع وضع الخيوط ووضع asyncio:
+يُمرَّر إليه ما يصل من recv/read كما هو، ويعيد الأسطر الكاملة وبايتات الرد.
+"""
+
+import re
+from typing import List, Tuple
+
+IAC = 0xFF
+DONT = 0xFE
+DO = 0xFD
+WONT = 0xFC
+WILL = 0xFB
+SB = 0xFA
+SE = 0xF0
+
+_IAC_BYTE = b"\xff"
+_IAC_SE = b"\xff\xf0"
+
+# CR LF و CR NUL نهاية سطر واحدة؛ CR أو LF أو NUL منفردة أيضاً
+_LINE_END = re.compile(rb"\r\n|\r\x00|[\r\n\x00]")
+
+class TelnetParser:
+    """
+    حالة محلل اتصال واحد
+
+    feed(data) تُعيد (الأسطر الكاملة كنصوص بعد strip، بايتات الرد على التفاوض)
+    الأسطر الفارغة تُتجاهل، والسطر الأطول من max_line يُقتطع.
+    """
+
+    __slots__ = ("max_line", "truncated_lines", "_buffer", "_pending", "_overflow")
+
+    def __init__(self, max_line: int = 4096):
+        self.max_line = max_line
+        self.truncated_lines = 0
+        # مخزن السطر الحالي، يُعاد استخدامه طوال الاتصال
+        self._buffer = bytearray()
+        # بقايا أمر IAC غير مكتمل في نهاية الدفعة السابقة
+        self._pending = b""
+        self._overflow = False
+
+    def feed(self, data: bytes) -> Tuple[List[str], bytes]:
+        reply = b""
+        if self._pending:
+            data = self._pending + data
+            self._pending = b""
+
+        # المسار السريع: لا أوامر IAC في الدفعة (الحالة الغالبة بعد التفاوض)
+        if data.find(_IAC_BYTE) == -1:
+            self._buffer += data
+        else:
+            reply = self._strip_iac(data)
+
+        return self._split_lines(), reply
+
+    def close(self) -> List[str]:
+        """
+        نهاية الاتصال: السطر الأخير غير المنتهي (إن وُجد) يُعامل كسطر كامل
+        """
+        self._pending = b""
+        line = self._decode(self._buffer)
+        self._buffer.clear()
+        return [line] if line else []
+
+    def _strip_iac(self, data: bytes) -> bytes:
+        replies = []
+        position = 0
+        length = len(data)
+        while True:
+            index = data.find(_IAC_BYTE, position)
+            if index == -1:
+                self._buffer += data[position:]
+                break
+            self._buffer += data[position:index]
+
+            if index + 1 >= length:
+                self._pending = data[index:]
+                break
+            command = data[index + 1]
+
+            if command == IAC:
+                # IAC IAC = البايت 0xFF نفسه
+                self._buffer.append(IAC)
+                position = index + 2
+            elif command in (WILL, WONT, DO, DONT):
+                if index + 2 >= length:
+                    self._pending = data[index:]
+                    break
+                option = data[index + 2]
+                # رفض كل الخيارات؛ لا رد على WONT/DONT لتجنب حلقات التفاوض
+                if command == DO:
+                    replies.append(bytes((IAC, WONT, option)))
+                elif command == WILL:
+                    replies.append(bytes((IAC, DONT, option)))
+                position = index + 3
+            elif command == SB:
+                end = data.find(_IAC_SE, index + 2)
+                if end == -1:
+                    self._pending = data[index:]
+                    break
+                position = end + 2
+            else:
+                # أوامر من بايتين (NOP، AYT، GA...) تُتجاهل
+                position = index + 2
+
+        if len(self._pending) > self.max_line:
+            # تفاوض فرعي لا ينتهي: لا نحتفظ به بلا حد
+            self._pending = b""
+        return b"".join(replies)
+
+    def _split_lines(self) -> List[str]:
+        lines = []
+        consumed = 0
+        buffer = self._buffer
+        for match in _LINE_END.finditer(buffer):
+            line = self._decode(buffer[consumed:match.start()])
+            consumed = match.end()
+            if line:
+                lines.append(line)
+        if consumed:
+            del buffer[:consumed]
+
+        if len(buffer) > self.max_line:
+            del buffer[self.max_line:]
+            if not self._overflow:
+                self._overflow = True
+                self.truncated_lines += 1
+        return lines
+
+    def _decode(self, raw: bytearray) -> str:
+        if len(raw) > self.max_line:
+            raw = raw[:self.max_line]
+            if not self._overflow:
+                self.truncated_lines += 1
+        self._overflow = False
+        return raw.decode('utf-8', errors='ignore').strip()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+اختبارات geo_remote مقابل خادم محلي بديل لخدمة ip-api (POST /batch مع X-Rl/X-Ttl و429)
+
+الاستخدام:
+    python -m unittest test_geo_remote
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from geo_remote import BATCH_SIZE, GeoCache, RemoteGeolocator
+
+class StubService:
+    """
+    بديل ip-api: 10.x.x.x "private range"، وبقية العناوين دولة ثابتة
+    plan: ردود مجدولة للطلبات الأولى (status, X-Rl, X-Ttl)، وبعدها 200 بحصة كبيرة
+    """
+
+    def __init__(self, plan=None):
+        self.plan = list(plan or [])
+        self.batches = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                ips = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    status, remaining, ttl = stub.plan.pop(0) if stub.plan else (200, 45, 60)
+                    stub.batches.append((self.path.split('?')[0], len(ips), status))
+                body = b'' if status != 200 else json.dumps([stub.result(ip) for ip in ips]).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-Rl', str(remaining))
+                self.send_header('X-Ttl', str(ttl))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def result(ip: str):
+        if ip.startswith('10.'):
+            return {'status': 'fail', 'message': 'private range', 'query': ip}
+        return {'status': 'success', 'country': 'Testland', 'city': 'Stub City',
+                'regionName': 'Region', 'isp': 'Stub ISP', 'query': ip}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def public_ips(n: int):
+    return [f"198.51.{i // 256}.{i % 256}" for i in range(n)]
+
+class RemoteGeolocatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "geo_cache.sqlite")
+        self.locators = []
+
+    def tearDown(self):
+        for locator in self.locators:
+            locator.close()
+        self.tmp.cleanup()
+
+    def start(self, plan=None) -> StubService:
+        stub = StubService(plan)
+        self.addCleanup(stub.close)
+        return stub
+
+    def locator(self, url: str, **kwargs) -> RemoteGeolocator:
+        locator = RemoteGeolocator(url, GeoCache(self.cache_path), **kwargs)
+        self.locators.append(locator)
+        return locator
+
+    def test_misses_sent_in_batches_of_100(self):
+        stub = self.start()
+        locations = self.locator(stub.url).locate(public_ips(250))
+        self.assertEqual(len(locations), 250)
+        self.assertTrue(all(location['country'] == 'Testland' for location in locations.values()))
+        self.assertEqual(sorted(size for _, size, _ in stub.batches), [50, BATCH_SIZE, BATCH_SIZE])
+        self.assertTrue(all(path == '/batch' for path, _, _ in stub.batches))
+
+    def test_warm_run_sends_no_requests(self):
+        stub = self.start()
+        ips = public_ips(150) + ['10.0.0.1', '10.0.0.2']
+        cold = self.locator(stub.url)
+        first = cold.locate(ips)
+        self.assertEqual(cold.limiter.sent, 2)
+
+        warm = self.locator(stub.url)
+        self.assertEqual(warm.locate(ips), first)
+        self.assertEqual(warm.limiter.sent, 0)
+        self.assertEqual(len(stub.batches), 2)
+
+    def test_private_range_results_are_cached(self):
+        stub = self.start()
+        locations = self.locator(stub.url).locate(['10.0.0.1'])
+        self.assertEqual(locations['10.0.0.1']['country'], 'Unknown')
+        cache = GeoCache(self.cache_path)
+        self.addCleanup(cache.close)
+        self.assertIn('10.0.0.1', cache.get_many(['10.0.0.1']))
+
+    def test_transport_failures_are_not_cached(self):
+        # منفذ مغلق: كل طلب يفشل في الاتصال
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            url = f"http://127.0.0.1:{s.getsockname()[1]}"
+        locator = self.locator(url, retries=0, timeout=1)
+        locations = locator.locate(['198.51.100.1'])
+        self.assertEqual(locations['198.51.100.1']['country'], 'Unknown')
+        self.assertEqual(len(locator.cache), 0)
+
+    def test_limiter_pauses_when_quota_exhausted(self):
+        stub = self.start(plan=[(200, 0, 0.5)])
+        locator = self.locator(stub.url, workers=1)
+        started = time.monotonic()
+        locator.locate(public_ips(200))
+        self.assertEqual(locator.limiter.sent, 2)
+        self.assertGreater(locator.limiter.waited, 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_limiter_pauses_after_429(self):
+        stub = self.start(plan=[(429, 0, 0.5)])
+        locator = self.locator(stub.url, workers=1)
+        started = time.monotonic()
+        locations = locator.locate(public_ips(10))
+        self.assertTrue(all(location['country'] == 'Testland' for location in locations.values()))
+        self.assertEqual([status for _, _, status in stub.batches], [429, 200])
+        self.assertEqual(locator.limiter.sent, 2)
+        self.assertGreater(locator.limiter.waited, 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+class GeoCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = GeoCache(os.path.join(self.tmp.name, "geo_cache.sqlite"), ttl=3600, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    @staticmethod
+    def location(country: str):
+        return {'country': country, 'city': 'City', 'region': 'Region', 'isp': 'ISP'}
+
+    def test_evict_expired_entries(self):
+        self.cache.put_many({'1.1.1.1': self.location('A'), '2.2.2.2': self.location('B')})
+        self.cache.conn.execute("UPDATE locations SET fetched = ? WHERE ip = '1.1.1.1'", (time.time() - 7200,))
+        self.assertEqual(self.cache.get_many(['1.1.1.1', '2.2.2.2']), {'2.2.2.2': self.location('B')})
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evict_least_recently_used(self):
+        self.cache.put_many({ip: self.location(ip) for ip in ('1.1.1.1', '2.2.2.2', '3.3.3.3')})
+        for age, ip in enumerate(('3.3.3.3', '2.2.2.2', '1.1.1.1')):
+            self.cache.conn.execute("UPDATE locations SET used = ? WHERE ip = ?", (time.time() - 100 + age, ip))
+        # 2.2.2.2 هو الأقدم استخداماً بعد قراءة 3.3.3.3
+        self.cache.get_many(['3.3.3.3'])
+        self.cache.put_many({'4.4.4.4': self.location('D')})
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(set(self.cache.get_many(['1.1.1.1', '2.2.2.2', '3.3.3.3', '4.4.4.4'])),
+                         {'1.1.1.1', '3.3.3.3', '4.4.4.4'})
+
+if __name__ == "__main__":
+    unittest.main()
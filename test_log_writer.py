@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interactive Honeypot Data Analyzer
+مشروع محلل بيانات مصيدة التسلل التفاعلي
+
+اختبارات كاتب السجلات: فشل الكتابة أثناء دفعة (امتلاء القرص مثلاً) لا يفسد بقية الملف
+
+الاستخدام:
+    python -m unittest test_log_writer
+"""
+
+import errno
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import event_format
+from log_writer import LogWriter
+
+class FailingFile:
+    """
+    ملف يكتب نصف البيانات ثم يرفع ENOSPC (كتلة ناقصة على القرص)
+    """
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        self.f.write(data[:len(data) // 2])
+        self.f.flush()
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+class ToggleFile:
+    """
+    ملف حقيقي تفشل كتابته طالما state['fail'] مفعّل
+    """
+
+    def __init__(self, f, state):
+        self.f = f
+        self.state = state
+
+    def write(self, data):
+        if self.state['fail']:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return self.f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("انتهت المهلة")
+        time.sleep(0.01)
+
+def make_record(i: int, ip: str, content: str):
+    return {
+        "timestamp": f"2026-01-01T00:00:{i:02d}",
+        "client_ip": ip,
+        "client_port": 40000 + i,
+        "session_id": f"session-{ip}",
+        "interaction_type": "command",
+        "content": content,
+        "response_sent": "ok"
+    }
+
+class FailedWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_batches(self, log_format: str, path: str):
+        """
+        ثلاث دفعات والثانية تفشل؛ الثالثة تعيد استخدام نصوص من الدفعتين السابقتين
+        """
+        writer = LogWriter(path, log_format=log_format)
+        first = [make_record(0, "10.0.0.1", "ls"), make_record(1, "10.0.0.1", "whoami")]
+        dropped = [make_record(2, "10.0.0.2", "uname -a"), make_record(3, "10.0.0.1", "ls")]
+        third = [make_record(4, "10.0.0.2", "uname -a"), make_record(5, "10.0.0.1", "ls"),
+                 make_record(6, "10.0.0.3", "id")]
+
+        f = writer._open()
+        f, written = writer._flush(f, [writer.encoder.encode(r) for r in first], [0.0] * len(first))
+        self.assertGreater(written, 0)
+        size = os.path.getsize(path)
+
+        f, written = writer._flush(FailingFile(f), [writer.encoder.encode(r) for r in dropped],
+                                   [0.0] * len(dropped))
+        self.assertEqual(written, 0)
+        self.assertEqual(writer.errors, 1)
+        # الكتابة الجزئية حُذفت
+        self.assertEqual(os.path.getsize(path), size)
+
+        f, written = writer._flush(f, [writer.encoder.encode(r) for r in third], [0.0] * len(third))
+        self.assertGreater(written, 0)
+        f.close()
+        self.assertEqual(writer.written, len(first) + len(third))
+        return first + third
+
+    def test_binary_log_decodes_after_failed_write(self):
+        path = os.path.join(self.tmp.name, "honeypot_logs.hpev")
+        expected = self.write_batches("binary", path)
+        with open(path, 'rb') as f:
+            records = list(event_format.iter_records(f.read()))
+        self.assertEqual([(r["client_ip"], r["content"], r["session_id"]) for r in records],
+                         [(r["client_ip"], r["content"], r["session_id"]) for r in expected])
+
+    def test_jsonl_log_has_no_partial_line(self):
+        path = os.path.join(self.tmp.name, "honeypot_logs.json")
+        expected = self.write_batches("jsonl", path)
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, expected)
+
+class WriterThreadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "honeypot_logs.hpev")
+        self.real_open = open
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_failed_batch_not_counted_in_segment(self):
+        state = {'fail': False}
+        with mock.patch('log_writer.open', create=True,
+                        side_effect=lambda *a, **k: ToggleFile(self.real_open(*a, **k), state)):
+            writer = LogWriter(self.path, log_format="binary", durability="batch")
+            for i in range(2):
+                writer.submit(make_record(10 + i, "10.0.0.1", "ls"))
+            wait_for(lambda: writer.written == 2)
+
+            state['fail'] = True
+            writer.submit(make_record(59, "10.0.0.2", "uname -a"))
+            wait_for(lambda: writer.errors == 1)
+
+            state['fail'] = False
+            writer.submit(make_record(20, "10.0.0.2", "uname -a"))
+            writer.close()
+
+        self.assertEqual(writer.written, 3)
+        self.assertEqual(writer._seg_records, 3)
+        self.assertEqual(writer._seg_start, "2026-01-01T00:00:10")
+        self.assertEqual(writer._seg_end, "2026-01-01T00:00:20")
+        with self.real_open(self.path, 'rb') as f:
+            records = list(event_format.iter_records(f.read()))
+        self.assertEqual([r["content"] for r in records], ["ls", "ls", "uname -a"])
+
+    def test_reopen_after_failed_open(self):
+        calls = []
+
+        def flaky_open(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OSError(errno.EACCES, "Permission denied")
+            return self.real_open(*args, **kwargs)
+
+        with mock.patch('log_writer.open', create=True, side_effect=flaky_open):
+            writer = LogWriter(self.path, log_format="binary")
+            writer.submit(make_record(0, "10.0.0.1", "ls"))
+            writer.close()
+
+        self.assertEqual(writer.written, 1)
+        self.assertEqual(writer.errors, 1)
+        with self.real_open(self.path, 'rb') as f:
+            self.assertEqual(len(list(event_format.iter_records(f.read()))), 1)
+
+if __name__ == "__main__":
+    unittest.main()